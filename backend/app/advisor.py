@@ -0,0 +1,146 @@
+"""Index advisor: explain the statements behind each route and flag slow plans.
+
+Every read route's statements are built with representative parameters,
+run through ``EXPLAIN QUERY PLAN`` (SQLite) or ``EXPLAIN`` (PostgreSQL) and
+reported with any full table scans or sorts the planner chose. Run it with
+``python -m backend.app db advise``.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from sqlalchemy import Executable, select
+from sqlalchemy.engine import Connection
+
+from .api.queries import (
+    account_fingerprint,
+    accounts_fingerprint,
+    accounts_query,
+    dashboard_fingerprint,
+    dashboard_query,
+    evaluation_query,
+    insights_fingerprint,
+    metrics_fingerprint,
+    recent_insights_query,
+    timeline_query,
+)
+from .models import Account, Insight, PendingAnalysis
+from .services.retrieval import stamp_query, terms_query
+
+SAMPLE_ID = 1
+SAMPLE_LIMIT = 50
+SAMPLE_TREND_DAYS = 7
+
+# SQLite: "SCAN insights" without an index, or a temporary sort; PostgreSQL: Seq Scan / Sort nodes.
+# A bare "SEARCH insights" is SQLite's min/max shortcut falling back to a scan when no index has the column.
+SQLITE_FULL_SCAN = re.compile(r"^(?:SCAN|SEARCH) (?!CONSTANT ROW)(\w+)$|^SCAN (?!CONSTANT ROW)(\w+) (?!USING)")
+# "SCAN insights USING [COVERING] INDEX ix" walks the whole index: there is no "(col=?)" constraint to seek on
+SQLITE_INDEX_SCAN = re.compile(r"^SCAN (\w+) USING (COVERING )?INDEX (\w+)(?!.*\()")
+# The planner sorts only the trailing ORDER BY terms when an index supplies the leading ones
+SQLITE_SORT = re.compile(r"USE TEMP B-TREE FOR (?:RIGHT PART OF )?(ORDER BY|GROUP BY|DISTINCT)")
+POSTGRES_FULL_SCAN = re.compile(r"Seq Scan on (\w+)")
+POSTGRES_SORT = re.compile(r"^\s*(->\s*)?Sort\b")
+
+
+def route_statements() -> Dict[str, List[Tuple[str, Executable]]]:
+    """The statements each read route issues, keyed by route."""
+
+    return {
+        "GET /accounts": [
+            ("page", accounts_query(SAMPLE_LIMIT)),
+            ("fingerprint", accounts_fingerprint()),
+        ],
+        "GET /accounts/{account_id}": [
+            ("account", select(Account).where(Account.id == SAMPLE_ID)),
+            ("timeline", timeline_query(SAMPLE_ID, SAMPLE_LIMIT)),
+            ("fingerprint", account_fingerprint(SAMPLE_ID)),
+        ],
+        "GET /accounts/{account_id}/rag": [
+            ("index stamp", stamp_query(SAMPLE_ID)),
+            ("index build", terms_query(SAMPLE_ID)),
+            ("fingerprint", account_fingerprint(SAMPLE_ID)),
+        ],
+        "GET /dashboard/csm": [
+            ("page", dashboard_query(SAMPLE_LIMIT)),
+            ("fingerprint", dashboard_fingerprint()),
+        ],
+        "GET /interactions/{interaction_id}/insight": [
+            ("insight", select(Insight).where(Insight.interaction_id == SAMPLE_ID)),
+            ("pending", select(PendingAnalysis).where(PendingAnalysis.interaction_id == SAMPLE_ID)),
+        ],
+        "GET /insights/recent": [
+            ("page", recent_insights_query(10)),
+            ("fingerprint", insights_fingerprint()),
+        ],
+        "GET /evaluations/metrics": [
+            ("metrics", evaluation_query(date.today(), SAMPLE_TREND_DAYS)),
+            ("fingerprint", metrics_fingerprint()),
+        ],
+    }
+
+
+@dataclass
+class Report:
+    route: str
+    label: str
+    plan: List[str]
+    findings: List[str] = field(default_factory=list)
+
+
+def explain(connection: Connection, statement: Executable) -> List[str]:
+    """Return the planner's output for ``statement``, one line per plan node."""
+
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+    if connection.dialect.name == "sqlite":
+        return [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+    return [row[0] for row in connection.exec_driver_sql(f"EXPLAIN {sql}")]
+
+
+def findings(plan: Sequence[str], dialect: str, limited: bool = False) -> List[str]:
+    """Full scans and sorts in ``plan``.
+
+    An index walk without a search constraint reads the whole index, unless
+    the statement is ``limited`` and nothing is sorted afterwards: then the
+    index supplies the order and the walk stops after LIMIT rows.
+    """
+
+    full_scan, sort = (SQLITE_FULL_SCAN, SQLITE_SORT) if dialect == "sqlite" else (POSTGRES_FULL_SCAN, POSTGRES_SORT)
+    sorted_after = any(sort.search(line) for line in plan)
+    found = []
+    for line in plan:
+        scan = full_scan.search(line.strip())
+        index_scan = SQLITE_INDEX_SCAN.search(line.strip()) if dialect == "sqlite" else None
+        if scan:
+            found.append(f"full scan of {next(group for group in scan.groups() if group)}")
+        elif index_scan and (sorted_after or not limited):
+            table, covering, index = index_scan.groups()
+            found.append(f"full scan of {table} ({'covering ' if covering else ''}index {index})")
+        elif sort.search(line):
+            found.append(f"sort: {line.strip()}")
+    return found
+
+
+def advise(connection: Connection, statements: Callable[[], Dict] = route_statements) -> List[Report]:
+    reports = []
+    for route, labelled in statements().items():
+        for label, statement in labelled:
+            plan = explain(connection, statement)
+            limited = getattr(statement, "_limit_clause", None) is not None
+            reports.append(Report(route, label, plan, findings(plan, connection.dialect.name, limited)))
+    return reports
+
+
+def format_reports(reports: Sequence[Report], verbose: bool = False) -> str:
+    lines = []
+    for report in reports:
+        status = "; ".join(report.findings) if report.findings else "ok"
+        lines.append(f"{report.route} [{report.label}]: {status}")
+        if verbose or report.findings:
+            lines.extend(f"    {line}" for line in report.plan)
+    flagged = sum(1 for report in reports if report.findings)
+    lines.append(f"{flagged} of {len(reports)} statements need attention")
+    return "\n".join(lines)
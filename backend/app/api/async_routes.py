@@ -0,0 +1,156 @@
+"""Async versions of the read-heavy routes, served from the AsyncEngine.
+
+Registered ahead of :mod:`.routes` when ``async_database`` is enabled, so
+these handlers answer the same paths on the event loop instead of holding a
+threadpool worker and a sync session for the whole request.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Literal, Optional, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .. import schemas
+from ..core.config import get_settings
+from ..models import Account, Insight
+from .cache import account_scope, response_cache
+from .conditional import conditional
+from .deps import get_async_db_session, require_token
+from .pagination import DEFAULT_PAGE_SIZE, clamp_limit, paginate
+from .queries import (
+    account_fingerprint,
+    accounts_fingerprint,
+    accounts_query,
+    dashboard_accounts,
+    dashboard_fingerprint,
+    dashboard_query,
+    insights_fingerprint,
+    project,
+    project_timeline,
+    recent_insight_rows_query,
+    recent_insights_query,
+    timeline_query,
+    timeline_rows_query,
+)
+from .responses import fast_json
+
+router = APIRouter()
+settings = get_settings()
+
+
+@router.get("/accounts", response_model=List[schemas.Account])
+@conditional(lambda request: accounts_fingerprint())
+@response_cache.cached(List[schemas.Account])
+async def list_accounts_async(
+    request: Request,
+    response: Response,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    industry: Optional[str] = None,
+    account_status: Optional[str] = Query(default=None, alias="status"),
+    db: AsyncSession = Depends(get_async_db_session),
+    _: str = Depends(require_token),
+) -> List[Account]:
+    """Return accounts sorted by name, one keyset page at a time."""
+
+    limit = clamp_limit(limit)
+    accounts = (await db.scalars(accounts_query(limit, cursor, industry, account_status))).all()
+    return paginate(accounts, limit, response, key=lambda account: (account.name, account.id))
+
+
+@router.get(
+    "/accounts/{account_id}",
+    response_model=Union[schemas.AccountWithInsights, schemas.AccountWithInteractionSummaries],
+)
+@conditional(lambda request: account_fingerprint(int(request.path_params["account_id"])))
+@response_cache.cached(
+    Union[schemas.AccountWithInsights, schemas.AccountWithInteractionSummaries],
+    scopes=lambda request: (account_scope(request.path_params["account_id"]),),
+)
+async def get_account_details_async(
+    account_id: int,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    channel: Optional[str] = None,
+    fields: Literal["full", "summary"] = "full",
+    db: AsyncSession = Depends(get_async_db_session),
+    _: str = Depends(require_token),
+) -> schemas.AccountWithInsights | schemas.AccountWithInteractionSummaries:
+    """Retrieve account detail with a page of its newest interactions and insights."""
+
+    account = await db.get(Account, account_id)
+
+    if not account:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found")
+
+    limit = clamp_limit(limit or settings.timeline_page_size)
+    if settings.fast_json_responses:
+        rows = paginate(
+            (await db.execute(timeline_rows_query(account_id, limit, cursor, start, end, channel, fields))).all(),
+            limit,
+            response,
+            key=lambda row: (row.timestamp, row.id),
+        )
+        return fast_json({**project(account, schemas.Account), "interactions": project_timeline(rows, fields)}, response)
+
+    interactions = paginate(
+        (await db.scalars(timeline_query(account_id, limit, cursor, start, end, channel, fields))).all(),
+        limit,
+        response,
+        key=lambda interaction: (interaction.timestamp, interaction.id),
+    )
+
+    set_committed_value(account, "interactions", list(interactions))
+    if fields == "summary":
+        return schemas.AccountWithInteractionSummaries.model_validate(account)
+    return schemas.AccountWithInsights.model_validate(account)
+
+
+@router.get("/dashboard/csm", response_model=List[schemas.DashboardAccount])
+@conditional(lambda request: dashboard_fingerprint())
+@response_cache.cached(List[schemas.DashboardAccount])
+async def get_csm_dashboard_async(
+    request: Request,
+    response: Response,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    min_risk: Optional[float] = None,
+    db: AsyncSession = Depends(get_async_db_session),
+    _: str = Depends(require_token),
+) -> List[schemas.DashboardAccount]:
+    """Aggregate risk insights for customer success managers, riskiest first."""
+
+    limit = clamp_limit(limit)
+    rows = paginate(
+        (await db.execute(dashboard_query(limit, cursor, min_risk))).all(),
+        limit,
+        response,
+        key=lambda row: (row.risk_score, row.id),
+    )
+    return dashboard_accounts(rows)
+
+
+@router.get("/insights/recent", response_model=List[schemas.Insight])
+@conditional(lambda request: insights_fingerprint())
+async def recent_insights_async(
+    request: Request,
+    response: Response,
+    limit: int = 10,
+    db: AsyncSession = Depends(get_async_db_session),
+    _: str = Depends(require_token),
+) -> List[Insight]:
+    """Return the most recent insights for quick access panels."""
+
+    limit = max(1, min(limit, 50))
+    if settings.fast_json_responses:
+        rows = (await db.execute(recent_insight_rows_query(limit))).all()
+        return fast_json([project(row, schemas.Insight) for row in rows], response)
+    return (await db.scalars(recent_insights_query(limit))).all()
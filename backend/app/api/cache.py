@@ -0,0 +1,225 @@
+"""Response cache for read endpoints with write-through invalidation.
+
+Cached bodies are keyed on the request URL plus the generation counters of
+the data they depend on: one counter per account and a global one. Writes
+bump the counters of the accounts they touch (and the global counter), so
+stale entries are never served again and simply age out of the LRU. A TTL
+bounds staleness for writes made outside this process, e.g. by the rescore
+job.
+
+The in-process backend is a bounded LRU. Multi-worker deployments can point
+``response_cache_backend`` at any ``module:factory`` returning an object with
+the :class:`CacheBackend` methods (for example one backed by Redis).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Optional, Protocol, Tuple
+
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+
+from ..core.config import Settings, get_settings
+
+GLOBAL_SCOPE = "global"
+# Browsers keep the body but revalidate with If-None-Match on every poll
+CACHE_CONTROL = "private, no-cache"
+# Response headers replayed from the cache along with the body
+CACHED_HEADERS = ("x-next-cursor",)
+
+
+def account_scope(account_id: Any) -> str:
+    return f"account:{account_id}"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[CachedResponse]: ...
+
+    def set(self, key: str, value: CachedResponse, ttl: float) -> None: ...
+
+    def generation(self, scope: str) -> int: ...
+
+    def bump(self, scopes: Iterable[str]) -> None: ...
+
+
+class MemoryCacheBackend:
+    """Bounded, thread-safe LRU of responses plus in-process generation counters."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Tuple[float, CachedResponse]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: CachedResponse, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def generation(self, scope: str) -> int:
+        with self._lock:
+            return self._generations.get(scope, 0)
+
+    def bump(self, scopes: Iterable[str]) -> None:
+        with self._lock:
+            for scope in scopes:
+                self._generations[scope] = self._generations.get(scope, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against ``etag``."""
+
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def not_modified(etag: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL, **(headers or {})},
+    )
+
+
+class ResponseCache:
+    """Caches serialized JSON responses of read endpoints."""
+
+    def __init__(self, backend: CacheBackend, ttl: float = 30.0, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ResponseCache":
+        if settings.response_cache_backend:
+            module_name, _, attribute = settings.response_cache_backend.partition(":")
+            backend = getattr(importlib.import_module(module_name), attribute)()
+        else:
+            backend = MemoryCacheBackend(settings.response_cache_max_entries)
+        return cls(backend, ttl=settings.response_cache_ttl, enabled=settings.response_cache_enabled)
+
+    def invalidate_account(self, account_id: int) -> None:
+        """Record a write to ``account_id``; also invalidates cross-account views."""
+
+        self.backend.bump((account_scope(account_id), GLOBAL_SCOPE))
+
+    def invalidate_accounts(self, account_ids: Iterable[int]) -> None:
+        self.backend.bump([*(account_scope(account_id) for account_id in set(account_ids)), GLOBAL_SCOPE])
+
+    def cached(
+        self,
+        response_model: Any,
+        scopes: Callable[[Request], Iterable[str]] = lambda request: (GLOBAL_SCOPE,),
+    ):
+        """Decorate a GET endpoint so its JSON body is served from the cache.
+
+        The endpoint must accept ``request: Request`` and ``response: Response``.
+        Serialization matches FastAPI's own rendering of ``response_model``.
+        """
+
+        adapter = TypeAdapter(response_model)
+
+        def decorator(endpoint):
+            def respond(request: Request, response: Response, key: str, result: Any) -> Response:
+                if isinstance(result, Response):
+                    # Pre-rendered bodies (the fast JSON path) are cached as they are
+                    if result.status_code != status.HTTP_200_OK or result.media_type != "application/json":
+                        return result
+                    body, response = bytes(result.body), result
+                else:
+                    body = json.dumps(
+                        adapter.dump_python(result, mode="json"),
+                        ensure_ascii=False,
+                        allow_nan=False,
+                        separators=(",", ":"),
+                    ).encode("utf-8")
+                headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+                # Prefer the validator from the database fingerprint (see .conditional) over a body hash
+                etag = getattr(request.state, "etag", None) or f'W/"{hashlib.sha1(body).hexdigest()[:20]}"'
+                entry = CachedResponse(body=body, etag=etag, headers=headers)
+                self.backend.set(key, entry, self.ttl)
+                return self._render(request, entry)
+
+            if inspect.iscoroutinefunction(endpoint):
+
+                @wraps(endpoint)
+                async def async_wrapper(*args, **kwargs):
+                    if not self.enabled:
+                        return await endpoint(*args, **kwargs)
+                    request, response = kwargs["request"], kwargs["response"]
+                    key, hit = self._lookup(request, scopes(request))
+                    if hit is not None:
+                        return self._render(request, hit)
+                    return respond(request, response, key, await endpoint(*args, **kwargs))
+
+                return async_wrapper
+
+            @wraps(endpoint)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return endpoint(*args, **kwargs)
+                request, response = kwargs["request"], kwargs["response"]
+                key, hit = self._lookup(request, scopes(request))
+                if hit is not None:
+                    return self._render(request, hit)
+                return respond(request, response, key, endpoint(*args, **kwargs))
+
+            return wrapper
+
+        return decorator
+
+    def _lookup(self, request: Request, scopes: Iterable[str]) -> Tuple[str, Optional[CachedResponse]]:
+        generations = ",".join(f"{scope}={self.backend.generation(scope)}" for scope in sorted(scopes))
+        query = "&".join(f"{name}={value}" for name, value in sorted(request.query_params.multi_items()))
+        key = f"{request.url.path}?{query}#{generations}#{getattr(request.state, 'etag', '')}"
+        return key, self.backend.get(key)
+
+    @staticmethod
+    def _render(request: Request, entry: CachedResponse) -> Response:
+        if etag_matches(request.headers.get("if-none-match"), entry.etag):
+            return not_modified(entry.etag, entry.headers)
+        return Response(
+            content=entry.body,
+            media_type="application/json",
+            headers={"ETag": entry.etag, "Cache-Control": CACHE_CONTROL, **entry.headers},
+        )
+
+
+response_cache = ResponseCache.from_settings(get_settings())
@@ -0,0 +1,121 @@
+"""Conditional GET support driven by cheap database fingerprints.
+
+Each read endpoint names a *fingerprint*: one aggregate query returning the
+row counts and newest ``updated_at`` of the tables behind the response. The
+weak ETag hashes that row together with the request URL, and
+``Last-Modified`` is the newest timestamp, so ``If-None-Match`` and
+``If-Modified-Since`` are answered with a 304 before any row is loaded.
+
+``Last-Modified`` only has second precision, so it is withheld while the
+newest timestamp is still in the current second: a write later in that
+second would carry the same truncated value, and a client revalidating with
+it would wrongly be told nothing changed. The ETag covers that window.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import wraps
+from typing import Any, Callable, Optional, Sequence
+
+from fastapi import Request, Response
+from sqlalchemy import Select
+
+from .cache import etag_matches, not_modified
+
+
+def fingerprint_etag(request: Request, stamp: Sequence[Any]) -> str:
+    query = "&".join(f"{name}={value}" for name, value in sorted(request.query_params.multi_items()))
+    source = f"{request.url.path}?{query}|" + "|".join(str(value) for value in stamp)
+    return f'W/"{hashlib.sha1(source.encode("utf-8")).hexdigest()[:20]}"'
+
+
+def current_time() -> datetime:
+    return datetime.now(UTC)
+
+
+def last_modified(stamp: Sequence[Any], now: datetime) -> Optional[datetime]:
+    """Newest timestamp in the fingerprint, truncated to HTTP-date precision.
+
+    ``None`` while that second has not finished at ``now``.
+    """
+
+    moments = [value for value in stamp if isinstance(value, datetime)]
+    if not moments:
+        return None
+    newest = max(moment if moment.tzinfo else moment.replace(tzinfo=UTC) for moment in moments).replace(microsecond=0)
+    return newest if newest < now.replace(microsecond=0) else None
+
+
+def is_not_modified(request: Request, etag: str, modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-Modified-Since is ignored when If-None-Match is present (RFC 9110)
+        return etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    return modified <= since
+
+
+def conditional(fingerprint: Callable[[Request], Select]):
+    """Decorate a GET endpoint with ETag/Last-Modified validation.
+
+    The endpoint must accept ``request``, ``response`` and a ``db`` session
+    (sync or async). The computed ETag is left on ``request.state.etag`` so
+    the response cache stores bodies under the same validator, and the
+    fingerprint row on ``request.state.fingerprint`` for endpoints that can
+    reuse it.
+    """
+
+    def decorator(endpoint):
+        def check(request: Request, stamp: Sequence[Any]) -> tuple[str, Optional[datetime], Optional[Response]]:
+            etag, modified = fingerprint_etag(request, stamp), last_modified(stamp, current_time())
+            request.state.etag = etag
+            request.state.fingerprint = tuple(stamp)
+            headers = {"Last-Modified": format_datetime(modified, usegmt=True)} if modified else {}
+            if is_not_modified(request, etag, modified):
+                return etag, modified, not_modified(etag, headers)
+            return etag, modified, None
+
+        def finish(response: Response, result: Any, etag: str, modified: Optional[datetime]) -> Any:
+            target = result if isinstance(result, Response) else response
+            target.headers["ETag"] = etag
+            if modified is not None:
+                target.headers["Last-Modified"] = format_datetime(modified, usegmt=True)
+            return result
+
+        if inspect.iscoroutinefunction(endpoint):
+
+            @wraps(endpoint)
+            async def async_wrapper(*args, **kwargs):
+                request = kwargs["request"]
+                stamp = (await kwargs["db"].execute(fingerprint(request))).one()
+                etag, modified, early = check(request, stamp)
+                if early is not None:
+                    return early
+                return finish(kwargs["response"], await endpoint(*args, **kwargs), etag, modified)
+
+            return async_wrapper
+
+        @wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            request = kwargs["request"]
+            stamp = kwargs["db"].execute(fingerprint(request)).one()
+            etag, modified, early = check(request, stamp)
+            if early is not None:
+                return early
+            return finish(kwargs["response"], endpoint(*args, **kwargs), etag, modified)
+
+        return wrapper
+
+    return decorator
@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from fastapi import Depends, HTTPException, Security, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
 from ..core.config import get_settings
-from ..database import get_db
+from ..database import get_async_db, get_db, get_read_db
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 settings = get_settings()
 security_scheme = HTTPBearer(auto_error=False)
@@ -30,3 +35,16 @@ def get_db_session() -> Session:
     """Provide a SQLAlchemy session dependency."""
 
     yield from get_db()
+
+
+def get_read_db_session() -> Session:
+    """Provide a read-only SQLAlchemy session dependency for GET routes."""
+
+    yield from get_read_db()
+
+
+async def get_async_db_session() -> AsyncSession:
+    """Provide an async SQLAlchemy session dependency."""
+
+    async for db in get_async_db():
+        yield db
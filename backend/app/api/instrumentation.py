@@ -0,0 +1,104 @@
+"""Request timing middleware and the Prometheus ``/metrics`` endpoint."""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from ..core.metrics import RequestStats, end_request, registry, start_request
+from .deps import require_token
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics(_: str = Depends(require_token)) -> PlainTextResponse:
+    """Request, SQL and InsightEngine histograms in Prometheus text format.
+
+    Route names and timings describe the deployment, so scrapers send the
+    same bearer token as every other client.
+    """
+
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def server_timing(stats: RequestStats, elapsed: float) -> str:
+    """Format a request's timings as a ``Server-Timing`` header value (milliseconds)."""
+
+    entries = [
+        f"app;dur={elapsed * 1000:.2f}",
+        f'db;dur={stats.sql_seconds * 1000:.2f};desc="{stats.sql_statements} queries"',
+    ]
+    entries += [f"insight-{method};dur={seconds * 1000:.2f}" for method, seconds in sorted(stats.engine_seconds.items())]
+    return ", ".join(entries)
+
+
+class InstrumentationMiddleware:
+    """Time every HTTP request and attribute SQL and InsightEngine work to it.
+
+    A plain ASGI middleware rather than ``BaseHTTPMiddleware``, so streaming
+    responses are passed through untouched. ``Server-Timing`` is computed when
+    the response headers are sent; for streamed bodies it covers the work done
+    up to that point, while the histograms cover the whole request.
+
+    With ``repeat_threshold`` set (debug mode, see ``trace_statements``) a
+    warning is logged for every statement a request runs at least that many
+    times, which is how N+1 loops show up. With ``record_metrics`` off only
+    that tracing is done: no histograms and no ``Server-Timing`` header.
+    """
+
+    def __init__(self, app: Any, repeat_threshold: Optional[int] = None, record_metrics: bool = True):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+        self.record_metrics = record_metrics
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = start_request()
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start" and self.record_metrics:
+                status_code = message["status"]
+                headers: List = list(message.get("headers", []))
+                value = server_timing(stats, time.perf_counter() - started)
+                headers.append((b"server-timing", value.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - started
+            end_request(token)
+            # The matched route's template keeps label cardinality bounded
+            route = getattr(scope.get("route"), "path", "unmatched")
+            if self.record_metrics:
+                registry.request_seconds.observe(elapsed, method=scope["method"], route=route, status=str(status_code))
+                registry.request_sql_statements.observe(stats.sql_statements, route=route)
+                registry.request_sql_seconds.observe(stats.sql_seconds, route=route)
+            if self.repeat_threshold is not None:
+                self._warn_repeats(scope["method"], route, stats)
+
+    def _warn_repeats(self, method: str, route: str, stats: RequestStats) -> None:
+        for statement, count in stats.queries.repeated(self.repeat_threshold).items():
+            logger.warning(
+                "%s %s ran the same statement %d times (possible N+1): %s",
+                method,
+                route,
+                count,
+                " ".join(statement.split()),
+            )
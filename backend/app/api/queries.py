@@ -0,0 +1,351 @@
+"""Statements behind the read endpoints, shared by the sync and async routes."""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Literal, Optional
+
+from pydantic import BaseModel
+
+from sqlalchemy import DateTime, Select, and_, case, func, literal, or_, select, true, tuple_
+from sqlalchemy.orm import defer, joinedload
+
+from .. import schemas
+from ..models import (
+    EVALUATION_ROLLUP_ID,
+    Account,
+    AccountRiskRollup,
+    EvaluationRollup,
+    Feedback,
+    FeedbackDailyCount,
+    Insight,
+    Interaction,
+)
+from ..services.analysis import NEXT_ACTIONS
+from .pagination import decode_cursor, parse_cursor_datetime
+
+
+def accounts_query(
+    limit: int,
+    cursor: Optional[str] = None,
+    industry: Optional[str] = None,
+    account_status: Optional[str] = None,
+) -> Select:
+    """Accounts sorted by name, one keyset page (plus one probe row) at a time."""
+
+    query = select(Account)
+    if industry is not None:
+        query = query.where(Account.industry == industry)
+    if account_status is not None:
+        query = query.where(Account.status == account_status)
+
+    after = decode_cursor(cursor, 2)
+    if after is not None:
+        query = query.where(tuple_(Account.name, Account.id) > tuple_(*after))
+
+    return query.order_by(Account.name.asc(), Account.id.asc()).limit(limit + 1)
+
+
+def timeline_query(
+    account_id: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    channel: Optional[str] = None,
+    fields: Literal["full", "summary"] = "full",
+) -> Select:
+    """Newest-first interactions of one account with their insights eagerly loaded."""
+
+    query = select(Interaction).options(joinedload(Interaction.insight))
+    if fields == "summary":
+        query = query.options(defer(Interaction.content, raiseload=True))
+    return _timeline_page(query, account_id, limit, cursor, start, end, channel)
+
+
+def timeline_rows_query(
+    account_id: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    channel: Optional[str] = None,
+    fields: Literal["full", "summary"] = "full",
+) -> Select:
+    """Same page as :func:`timeline_query`, as plain columns for :func:`project_timeline`."""
+
+    model = schemas.InteractionSummary if fields == "summary" else schemas.Interaction
+    query = select(
+        *(getattr(Interaction, name).label(name) for name in _columns(model)),
+        *(getattr(Insight, name).label(f"insight_{name}") for name in _columns(schemas.Insight)),
+    ).outerjoin(Insight, Insight.interaction_id == Interaction.id)
+    return _timeline_page(query, account_id, limit, cursor, start, end, channel)
+
+
+def _timeline_page(
+    query: Select,
+    account_id: int,
+    limit: int,
+    cursor: Optional[str],
+    start: Optional[datetime],
+    end: Optional[datetime],
+    channel: Optional[str],
+) -> Select:
+    # Served by the (account_id, timestamp) index
+    query = query.where(Interaction.account_id == account_id)
+    if start is not None:
+        query = query.where(Interaction.timestamp >= start)
+    if end is not None:
+        query = query.where(Interaction.timestamp < end)
+    if channel is not None:
+        query = query.where(Interaction.channel == channel)
+
+    after = decode_cursor(cursor, 2)
+    if after is not None:
+        last_timestamp = parse_cursor_datetime(after[0])
+        query = query.where(tuple_(Interaction.timestamp, Interaction.id) < tuple_(last_timestamp, after[1]))
+
+    return query.order_by(Interaction.timestamp.desc(), Interaction.id.desc()).limit(limit + 1)
+
+
+def _columns(model: type[BaseModel]) -> List[str]:
+    """Scalar fields of a response schema, in serialization order."""
+
+    return [name for name in model.model_fields if name not in ("insight", "interactions")]
+
+
+def project(row: Any, model: type[BaseModel], prefix: str = "") -> Dict[str, Any]:
+    """Build the JSON-ready dict of ``model`` straight from a result row, without validation."""
+
+    if hasattr(row, "_mapping"):
+        return {name: row._mapping[prefix + name] for name in _columns(model)}
+    return {name: getattr(row, prefix + name) for name in _columns(model)}
+
+
+def project_timeline(rows: Iterable, fields: Literal["full", "summary"] = "full") -> List[Dict[str, Any]]:
+    model = schemas.InteractionSummary if fields == "summary" else schemas.Interaction
+    interactions = []
+    for row in rows:
+        interaction = project(row, model)
+        interaction["insight"] = project(row, schemas.Insight, "insight_") if row.insight_id is not None else None
+        interactions.append(interaction)
+    return interactions
+
+
+def dashboard_query(limit: int, cursor: Optional[str] = None, min_risk: Optional[float] = None) -> Select:
+    """Per-account risk rollups, riskiest first."""
+
+    query = (
+        select(
+            Account.id,
+            Account.name,
+            AccountRiskRollup.risk_score,
+            AccountRiskRollup.interaction_count,
+            AccountRiskRollup.last_interaction,
+            AccountRiskRollup.dominant_intent,
+        )
+        .join(AccountRiskRollup, AccountRiskRollup.account_id == Account.id)
+        .where(AccountRiskRollup.insight_count > 0)
+    )
+    if min_risk is not None:
+        query = query.where(AccountRiskRollup.risk_score >= min_risk)
+
+    after = decode_cursor(cursor, 2)
+    if after is not None:
+        last_risk, last_account_id = after
+        query = query.where(
+            or_(
+                AccountRiskRollup.risk_score < last_risk,
+                and_(AccountRiskRollup.risk_score == last_risk, AccountRiskRollup.account_id > last_account_id),
+            )
+        )
+
+    return query.order_by(AccountRiskRollup.risk_score.desc(), AccountRiskRollup.account_id.asc()).limit(limit + 1)
+
+
+def dashboard_accounts(rows: Iterable) -> List[schemas.DashboardAccount]:
+    return [
+        schemas.DashboardAccount(
+            account_id=account_id,
+            account_name=account_name,
+            risk_score=round(risk_score, 2),
+            recent_interactions=interaction_count,
+            last_interaction=last_interaction,
+            next_action=NEXT_ACTIONS.get(dominant_intent, "Follow up with the customer"),
+        )
+        for account_id, account_name, risk_score, interaction_count, last_interaction, dominant_intent in rows
+    ]
+
+
+def recent_insight_rows_query(limit: int) -> Select:
+    """Newest insights as plain columns for :func:`project`."""
+
+    columns = [getattr(Insight, name).label(name) for name in _columns(schemas.Insight)]
+    return select(*columns).order_by(Insight.created_at.desc()).limit(limit)
+
+
+def recent_insights_query(limit: int) -> Select:
+    # Insight responses never include the interaction, so it is not loaded
+    return select(Insight).order_by(Insight.created_at.desc()).limit(limit)
+
+
+# The useful rate must move by this many points between windows to count as a trend,
+# and each window needs this much feedback before it is compared at all
+TREND_THRESHOLD = 5.0
+TREND_MIN_FEEDBACK = 5
+
+
+def _trend_windows(today: date, window_days: int) -> tuple[date, date]:
+    """First day of the current window (ending today) and of the window before it."""
+
+    recent_start = today - timedelta(days=window_days - 1)
+    return recent_start, recent_start - timedelta(days=window_days)
+
+
+def evaluation_query(today: date, window_days: int) -> Select:
+    """The evaluation totals and both trend windows' feedback counts, read from the rollups in one row.
+
+    Returns no row while the totals have not been built; see :func:`evaluation_fallback_query`.
+    """
+
+    recent_start, previous_start = _trend_windows(today, window_days)
+
+    def window_sum(column, start: date, end: date):
+        # At most window_days rows of the primary key index
+        days = FeedbackDailyCount.day.between(start, end)
+        return select(func.coalesce(func.sum(column), 0)).where(days).scalar_subquery()
+
+    before_recent = recent_start - timedelta(days=1)
+    return select(
+        EvaluationRollup.interaction_count,
+        EvaluationRollup.insight_count,
+        EvaluationRollup.confidence_sum,
+        EvaluationRollup.feedback_count,
+        EvaluationRollup.positive_feedback_count,
+        window_sum(FeedbackDailyCount.feedback_count, recent_start, today).label("recent_feedback"),
+        window_sum(FeedbackDailyCount.positive_count, recent_start, today).label("recent_positive"),
+        window_sum(FeedbackDailyCount.feedback_count, previous_start, before_recent).label("previous_feedback"),
+        window_sum(FeedbackDailyCount.positive_count, previous_start, before_recent).label("previous_positive"),
+    ).where(EvaluationRollup.id == EVALUATION_ROLLUP_ID)
+
+
+def evaluation_fallback_query(today: date, window_days: int) -> Select:
+    """The same row as :func:`evaluation_query`, aggregated from the raw tables in one statement.
+
+    Feedback is read in a single pass, with the totals and both windows as
+    conditional aggregates.
+    """
+
+    recent_start, previous_start = (
+        datetime.combine(day, time.min, tzinfo=UTC) for day in _trend_windows(today, window_days)
+    )
+    positive = Feedback.rating.is_(True)
+    recent = Feedback.created_at >= recent_start
+    previous = and_(Feedback.created_at >= previous_start, Feedback.created_at < recent_start)
+
+    def count_where(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+    insights = select(
+        func.count(Insight.id).label("insight_count"),
+        func.coalesce(func.sum(Insight.confidence), 0.0).label("confidence_sum"),
+    ).subquery()
+    feedback = select(
+        func.count(Feedback.id).label("feedback_count"),
+        count_where(positive).label("positive_feedback_count"),
+        count_where(recent).label("recent_feedback"),
+        count_where(and_(recent, positive)).label("recent_positive"),
+        count_where(previous).label("previous_feedback"),
+        count_where(and_(previous, positive)).label("previous_positive"),
+    ).subquery()
+    return select(
+        select(func.count(Interaction.id)).scalar_subquery().label("interaction_count"),
+        insights.c.insight_count,
+        insights.c.confidence_sum,
+        *feedback.c,
+    ).join_from(insights, feedback, true())
+
+
+def performance_trend(recent_feedback: int, recent_positive: int, previous_feedback: int, previous_positive: int) -> str:
+    """Compare the useful rate of the current feedback window with the one before."""
+
+    if min(recent_feedback, previous_feedback) < TREND_MIN_FEEDBACK:
+        return "insufficient_data"
+    change = (recent_positive / recent_feedback - previous_positive / previous_feedback) * 100
+    if change >= TREND_THRESHOLD:
+        return "improving"
+    if change <= -TREND_THRESHOLD:
+        return "declining"
+    return "stable"
+
+
+def evaluation_summary(row: Any) -> schemas.EvaluationMetrics:
+    coverage = row.insight_count / row.interaction_count * 100 if row.interaction_count else 0.0
+    feedback_rate = row.feedback_count / row.insight_count * 100 if row.insight_count else 0.0
+    useful_rate = row.positive_feedback_count / row.feedback_count * 100 if row.feedback_count else 0.0
+    avg_confidence = row.confidence_sum / row.insight_count if row.insight_count else 0.0
+    return schemas.EvaluationMetrics(
+        ai_coverage=round(min(coverage, 100.0), 1),
+        feedback_rate=round(feedback_rate, 1),
+        useful_rate=round(useful_rate, 1),
+        total_insights=row.insight_count,
+        avg_confidence=round(avg_confidence, 2),
+        performance_trend=performance_trend(
+            row.recent_feedback, row.recent_positive, row.previous_feedback, row.previous_positive
+        ),
+    )
+
+
+def table_stamp(model, *criteria, join=None) -> list:
+    """Newest ``id`` and newest ``updated_at`` of ``model``, as scalar subqueries.
+
+    Both are answered from the end of an index, unlike a row count. Inserts
+    raise the id and updates raise ``updated_at``; the app never deletes these
+    rows, and rollup rebuilds re-insert theirs with fresh timestamps, which is
+    why tables without a surrogate ``id`` are stamped by ``updated_at`` alone.
+    """
+
+    columns = [func.max(model.id)] if hasattr(model, "id") else []
+    stamps = []
+    for column in (*columns, func.max(model.updated_at)):
+        query = select(column).select_from(model)
+        if join is not None:
+            query = query.join(join)
+        stamps.append(query.where(*criteria).scalar_subquery())
+    return stamps
+
+
+def accounts_fingerprint() -> Select:
+    return select(*table_stamp(Account))
+
+
+def account_fingerprint(account_id: int) -> Select:
+    return select(
+        *table_stamp(Account, Account.id == account_id),
+        *table_stamp(Interaction, Interaction.account_id == account_id),
+        *table_stamp(Insight, Interaction.account_id == account_id, join=Interaction),
+    )
+
+
+def dashboard_fingerprint() -> Select:
+    return select(*table_stamp(AccountRiskRollup), *table_stamp(Account))
+
+
+def insights_fingerprint() -> Select:
+    return select(*table_stamp(Insight))
+
+
+def metrics_fingerprint() -> Select:
+    rollup = (
+        select(EvaluationRollup.updated_at).where(EvaluationRollup.id == EVALUATION_ROLLUP_ID).scalar_subquery()
+    )
+    # Only databases whose totals were never built pay for the raw tables' stamps; interactions
+    # are only ever added, so their newest id is enough to see coverage change
+    newest_interaction = select(func.max(Interaction.id)).scalar_subquery()
+    fallback = [
+        case((rollup.is_(None), stamp))
+        for stamp in (newest_interaction, *table_stamp(Insight), *table_stamp(Feedback))
+    ]
+    # The trend windows move at midnight even when nothing is written
+    today = datetime.combine(datetime.now(UTC).date(), time.min, tzinfo=UTC)
+    return select(rollup, *fallback, literal(today, DateTime(timezone=True)))
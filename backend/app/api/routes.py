@@ -2,21 +2,77 @@
 
 from __future__ import annotations
 
+import io
+import json
+import tempfile
 from datetime import UTC, datetime
-from typing import List
+from typing import IO, Iterator, List, Literal, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+import anyio
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from .. import schemas
 from ..core.config import get_settings
-from ..models import Account, Feedback, Insight, Interaction
-from ..services.analysis import InsightEngine, NEXT_ACTIONS
-from .deps import get_db_session, require_token
+from ..database import SessionLocal
+from ..models import Account, Feedback, Insight, Interaction, PendingAnalysis
+from ..services.analysis import InsightEngine, insight_columns
+from ..services.analysis_queue import MAX_ATTEMPTS as MAX_ANALYSIS_ATTEMPTS, AnalysisQueue
+from ..services.ingest import (
+    CSV_MEDIA_TYPES,
+    NDJSON_MEDIA_TYPES,
+    IterStream,
+    ingest_records,
+    iter_csv_records,
+    iter_ndjson_records,
+)
+from ..services.retrieval import InsightIndex
+from ..services.rollups import RollupDelta
+from .cache import account_scope, response_cache
+from .conditional import conditional
+from .deps import get_db_session, get_read_db_session, require_token
+from .pagination import DEFAULT_PAGE_SIZE, clamp_limit, paginate
+from .queries import (
+    account_fingerprint,
+    accounts_fingerprint,
+    accounts_query,
+    dashboard_accounts,
+    dashboard_fingerprint,
+    dashboard_query,
+    evaluation_fallback_query,
+    evaluation_query,
+    evaluation_summary,
+    insights_fingerprint,
+    metrics_fingerprint,
+    project,
+    project_timeline,
+    recent_insight_rows_query,
+    recent_insights_query,
+    timeline_query,
+    timeline_rows_query,
+)
+from .responses import fast_json
 
 router = APIRouter()
 settings = get_settings()
 analysis_engine = InsightEngine()
+insight_index = InsightIndex()
+analysis_queue = AnalysisQueue(
+    SessionLocal,
+    analysis_engine,
+    workers=settings.analysis_queue_workers,
+    max_queued=settings.analysis_queue_max_size,
+    on_complete=response_cache.invalidate_account,
+)
+
+MAX_BULK_CHUNK_SIZE = 10_000
+BULK_RESULT_SPOOL_SIZE = 4 * 1024 * 1024
+MAX_INSIGHT_WAIT = 30.0
+INSIGHT_POLL_INTERVAL = 0.25
 
 
 @router.get("/health")
@@ -27,82 +83,123 @@ def health_check() -> dict[str, str | datetime]:
 
 
 @router.get("/accounts", response_model=List[schemas.Account])
+@conditional(lambda request: accounts_fingerprint())
+@response_cache.cached(List[schemas.Account])
 def list_accounts(
-    db: Session = Depends(get_db_session),
+    request: Request,
+    response: Response,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    industry: Optional[str] = None,
+    account_status: Optional[str] = Query(default=None, alias="status"),
+    db: Session = Depends(get_read_db_session),
     _: str = Depends(require_token),
 ) -> List[Account]:
-    """Return all accounts sorted by name."""
-
-    return db.query(Account).order_by(Account.name.asc()).all()
-
-
-@router.get("/accounts/{account_id}", response_model=schemas.AccountWithInsights)
+    """Return accounts sorted by name, one keyset page at a time."""
+
+    limit = clamp_limit(limit)
+    accounts = db.scalars(accounts_query(limit, cursor, industry, account_status)).all()
+    return paginate(accounts, limit, response, key=lambda account: (account.name, account.id))
+
+
+@router.get(
+    "/accounts/{account_id}",
+    response_model=Union[schemas.AccountWithInsights, schemas.AccountWithInteractionSummaries],
+)
+@conditional(lambda request: account_fingerprint(int(request.path_params["account_id"])))
+@response_cache.cached(
+    Union[schemas.AccountWithInsights, schemas.AccountWithInteractionSummaries],
+    scopes=lambda request: (account_scope(request.path_params["account_id"]),),
+)
 def get_account_details(
     account_id: int,
-    db: Session = Depends(get_db_session),
+    request: Request,
+    response: Response,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    channel: Optional[str] = None,
+    fields: Literal["full", "summary"] = "full",
+    db: Session = Depends(get_read_db_session),
     _: str = Depends(require_token),
-):
-    """Retrieve account detail including interactions and insights."""
-
-    account = (
-        db.query(Account)
-        .options(joinedload(Account.interactions).joinedload(Interaction.insight))
-        .filter(Account.id == account_id)
-        .first()
-    )
+) -> schemas.AccountWithInsights | schemas.AccountWithInteractionSummaries:
+    """Retrieve account detail with a page of its newest interactions and insights.
+
+    ``fields=summary`` leaves the full interaction ``content`` out of both the
+    query and the response.
+    """
+
+    account = db.get(Account, account_id)
 
     if not account:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found")
 
-    # Sort interactions by timestamp descending for timeline display
-    account.interactions.sort(key=lambda interaction: interaction.timestamp, reverse=True)
-    return account
+    limit = clamp_limit(limit or settings.timeline_page_size)
+    if settings.fast_json_responses:
+        rows = paginate(
+            (db.execute(timeline_rows_query(account_id, limit, cursor, start, end, channel, fields))).all(),
+            limit,
+            response,
+            key=lambda row: (row.timestamp, row.id),
+        )
+        return fast_json({**project(account, schemas.Account), "interactions": project_timeline(rows, fields)}, response)
+
+    interactions = paginate(
+        db.scalars(timeline_query(account_id, limit, cursor, start, end, channel, fields)).all(),
+        limit,
+        response,
+        key=lambda interaction: (interaction.timestamp, interaction.id),
+    )
+
+    set_committed_value(account, "interactions", list(interactions))
+    if fields == "summary":
+        return schemas.AccountWithInteractionSummaries.model_validate(account)
+    return schemas.AccountWithInsights.model_validate(account)
 
 
 @router.get("/dashboard/csm", response_model=List[schemas.DashboardAccount])
+@conditional(lambda request: dashboard_fingerprint())
+@response_cache.cached(List[schemas.DashboardAccount])
 def get_csm_dashboard(
-    db: Session = Depends(get_db_session),
+    request: Request,
+    response: Response,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    min_risk: Optional[float] = None,
+    db: Session = Depends(get_read_db_session),
     _: str = Depends(require_token),
 ) -> List[schemas.DashboardAccount]:
-    """Aggregate risk insights for customer success managers."""
-
-    dashboard_rows: list[schemas.DashboardAccount] = []
-
-    accounts = db.query(Account).options(joinedload(Account.interactions).joinedload(Interaction.insight)).all()
-    for account in accounts:
-        insights = [interaction.insight for interaction in account.interactions if interaction.insight]
-        if not insights:
-            continue
-
-        risk_scores = [insight.risk_score for insight in insights]
-        avg_risk = sum(risk_scores) / len(risk_scores)
-        last_interaction = max((interaction.timestamp for interaction in account.interactions), default=None)
-        dominant_intent = max(
-            (insight.intent for insight in insights),
-            key=lambda intent: len([i for i in insights if i.intent == intent]),
-        )
-        dashboard_rows.append(
-            schemas.DashboardAccount(
-                account_id=account.id,
-                account_name=account.name,
-                risk_score=round(avg_risk, 2),
-                recent_interactions=len(account.interactions),
-                last_interaction=last_interaction,
-                next_action=NEXT_ACTIONS.get(dominant_intent, "Follow up with the customer"),
-            )
-        )
-
-    dashboard_rows.sort(key=lambda row: row.risk_score, reverse=True)
-    return dashboard_rows
+    """Aggregate risk insights for customer success managers, riskiest first."""
+
+    limit = clamp_limit(limit)
+    rows = paginate(
+        db.execute(dashboard_query(limit, cursor, min_risk)).all(),
+        limit,
+        response,
+        key=lambda row: (row.risk_score, row.id),
+    )
+    return dashboard_accounts(rows)
 
 
-@router.post("/interactions", response_model=schemas.Insight, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/interactions",
+    response_model=schemas.Insight,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": schemas.AnalysisAccepted}},
+)
 def create_interaction(
     payload: schemas.InteractionCreate,
+    prefer: Optional[str] = Header(default=None),
     db: Session = Depends(get_db_session),
     _: str = Depends(require_token),
-) -> Insight:
-    """Create a new interaction, run analysis, and persist insight."""
+) -> Insight | JSONResponse:
+    """Create a new interaction, run analysis, and persist insight.
+
+    With ``async_analysis`` enabled, or a ``Prefer: respond-async`` header,
+    the interaction is stored and queued for analysis and the endpoint answers
+    202; the insight is then available from ``/interactions/{id}/insight``.
+    """
 
     account = db.query(Account).filter(Account.id == payload.account_id).first()
     if not account:
@@ -118,45 +215,156 @@ def create_interaction(
     db.add(interaction)
     db.flush()
 
+    rollup = RollupDelta()
+    rollup.add_interaction(interaction.account_id, interaction.timestamp)
+
+    if settings.async_analysis or "respond-async" in (prefer or "").lower():
+        db.add(PendingAnalysis(interaction_id=interaction.id))
+        rollup.apply(db)
+        db.commit()
+        response_cache.invalidate_account(account.id)
+        analysis_queue.submit(interaction.id)
+        accepted = schemas.AnalysisAccepted(interaction_id=interaction.id, status="pending")
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=accepted.model_dump())
+
     analysis = analysis_engine.analyze(interaction.id, interaction.content)
-    insight = Insight(
-        interaction_id=interaction.id,
-        intent=analysis["intent"],
-        sentiment=analysis["sentiment"],
-        risk_score=float(analysis["risk_score"]),
-        confidence=float(analysis.get("confidence", 0.65)),
-        summary=analysis["summary"],
-        keywords=analysis.get("keywords"),
-    )
+    insight = Insight(interaction_id=interaction.id, **insight_columns(analysis))
     interaction.summary = insight.summary
     db.add(insight)
+
+    rollup.add_insight(interaction.account_id, interaction.id, insight.intent, insight.risk_score, insight.confidence)
+    rollup.apply(db)
     db.commit()
     db.refresh(insight)
+    insight_index.add(account.id, insight)
+    response_cache.invalidate_account(account.id)
 
     return insight
 
 
+@router.get(
+    "/interactions/{interaction_id}/insight",
+    response_model=schemas.Insight,
+    responses={status.HTTP_202_ACCEPTED: {"model": schemas.AnalysisAccepted}},
+)
+async def get_interaction_insight(
+    interaction_id: int,
+    wait: float = 0.0,
+    db: Session = Depends(get_read_db_session),
+    _: str = Depends(require_token),
+) -> Insight | JSONResponse:
+    """Return the insight for an interaction, long-polling up to ``wait`` seconds while it is queued."""
+
+    def lookup() -> tuple[bool, Optional[Insight], Optional[PendingAnalysis]]:
+        # End the previous read so each poll sees rows committed by the workers
+        db.rollback()
+        if db.get(Interaction, interaction_id) is None:
+            return False, None, None
+        insight = db.scalars(select(Insight).where(Insight.interaction_id == interaction_id)).first()
+        pending = db.scalars(select(PendingAnalysis).where(PendingAnalysis.interaction_id == interaction_id)).first()
+        return True, insight, pending
+
+    deadline = anyio.current_time() + max(0.0, min(wait, MAX_INSIGHT_WAIT))
+    while True:
+        exists, insight, pending = await run_in_threadpool(lookup)
+        if not exists:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Interaction not found")
+        if insight is not None:
+            return insight
+        if pending is None or anyio.current_time() >= deadline:
+            break
+        await anyio.sleep(INSIGHT_POLL_INTERVAL)
+
+    if pending is not None and pending.attempts >= MAX_ANALYSIS_ATTEMPTS:
+        accepted = schemas.AnalysisAccepted(interaction_id=interaction_id, status="failed")
+    elif pending is not None:
+        accepted = schemas.AnalysisAccepted(interaction_id=interaction_id, status="pending")
+    else:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Insight not found")
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=accepted.model_dump())
+
+
+@router.get("/analysis/queue")
+def analysis_queue_metrics(_: str = Depends(require_token)) -> dict[str, float | int | bool]:
+    """Report depth, concurrency and backpressure counters of the analysis queue."""
+
+    return analysis_queue.metrics()
+
+
+@router.post("/interactions/bulk", response_class=StreamingResponse)
+async def bulk_create_interactions(
+    request: Request,
+    chunk_size: Optional[int] = None,
+    db: Session = Depends(get_db_session),
+    _: str = Depends(require_token),
+) -> StreamingResponse:
+    """Ingest an NDJSON or CSV stream of interactions and stream back per-row results.
+
+    The body is parsed as it arrives and written in ``chunk_size`` batches,
+    each in its own transaction. The response carries one NDJSON result per
+    input row, in input order.
+    """
+
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type in NDJSON_MEDIA_TYPES:
+        parse_records = iter_ndjson_records
+    elif media_type in CSV_MEDIA_TYPES:
+        parse_records = iter_csv_records
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send application/x-ndjson or text/csv",
+        )
+
+    chunk_size = max(1, min(chunk_size or settings.bulk_ingest_chunk_size, MAX_BULK_CHUNK_SIZE))
+    body = request.stream()
+
+    def read_body() -> Iterator[bytes]:
+        # Runs in the worker thread and pulls each body chunk from the event loop
+        while True:
+            try:
+                yield anyio.from_thread.run(body.__anext__)
+            except StopAsyncIteration:
+                return
+
+    def run_ingest() -> IO[bytes]:
+        # Results are spooled (spilling to disk when large) until the body is consumed
+        output = tempfile.SpooledTemporaryFile(max_size=BULK_RESULT_SPOOL_SIZE)
+        rows = parse_records(io.BufferedReader(IterStream(read_body())))
+        for result in ingest_records(db, rows, analysis_engine, chunk_size, on_commit=response_cache.invalidate_accounts):
+            output.write(json.dumps(result).encode("utf-8") + b"\n")
+        output.seek(0)
+        return output
+
+    output = await run_in_threadpool(run_ingest)
+
+    def stream_results() -> Iterator[bytes]:
+        with output:
+            yield from output
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
 @router.get("/accounts/{account_id}/rag", response_model=schemas.RagResponse)
+@conditional(lambda request: account_fingerprint(int(request.path_params["account_id"])))
 def rag_query(
     account_id: int,
     query: str,
-    db: Session = Depends(get_db_session),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db_session),
     _: str = Depends(require_token),
 ) -> schemas.RagResponse:
     """Return a retrieval augmented answer using account insights."""
 
-    account = (
-        db.query(Account)
-        .options(joinedload(Account.interactions).joinedload(Interaction.insight))
-        .filter(Account.id == account_id)
-        .first()
-    )
-
-    if not account:
+    if db.get(Account, account_id) is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found")
 
-    insights = [interaction.insight for interaction in account.interactions if interaction.insight]
-    answer, supporting_insights = analysis_engine.rag_answer(query, insights)
+    # account_fingerprint ends with the account's newest insight id and update: the index's own stamp
+    stamp = request.state.fingerprint[-2:]
+    answer, supporting_insights = analysis_engine.compose_answer(
+        insight_index.search(db, account_id, query, stamp=stamp)
+    )
 
     return schemas.RagResponse(
         account_id=account_id,
@@ -179,57 +387,63 @@ def submit_feedback(
     if not insight:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid insight_id")
 
+    now = datetime.now(UTC)
     feedback = Feedback(
         insight_id=payload.insight_id,
         user_id="demo-user",
         rating=payload.rating,
         reason_code=payload.reason_code,
         comments=payload.comments,
+        created_at=now,
     )
+    # Read before the commit expires the insight, which would cost another query
+    account_id = insight.interaction.account_id
     db.add(feedback)
+    rollup = RollupDelta()
+    rollup.add_feedback(payload.rating, now.date())
+    rollup.apply(db)
     db.commit()
     db.refresh(feedback)
+    response_cache.invalidate_account(account_id)
 
     return feedback
 
 
 @router.get("/evaluations/metrics", response_model=schemas.EvaluationMetrics)
+@conditional(lambda request: metrics_fingerprint())
+@response_cache.cached(schemas.EvaluationMetrics)
 def evaluation_metrics(
-    db: Session = Depends(get_db_session),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db_session),
     _: str = Depends(require_token),
 ) -> schemas.EvaluationMetrics:
-    """Provide basic analytics about AI coverage and feedback."""
-
-    total_insights = db.query(Insight).count()
-    total_feedback = db.query(Feedback).count()
-    positive_feedback = db.query(Feedback).filter(Feedback.rating.is_(True)).count()
-
-    feedback_rate = (total_feedback / total_insights) * 100 if total_insights else 0.0
-    useful_rate = (positive_feedback / total_feedback) * 100 if total_feedback else 0.0
-
-    return schemas.EvaluationMetrics(
-        ai_coverage=85.0,
-        feedback_rate=round(feedback_rate, 1),
-        useful_rate=round(useful_rate, 1),
-        total_insights=total_insights,
-        avg_confidence=0.78,
-        performance_trend="improving",
-    )
+    """Provide AI coverage, confidence and feedback analytics, with the feedback trend.
+
+    Reads the incrementally maintained evaluation rollups in one query; a
+    database whose rollups were not built yet is aggregated directly.
+    """
+
+    today = datetime.now(UTC).date()
+    row = db.execute(evaluation_query(today, settings.evaluation_trend_days)).first()
+    if row is None:
+        row = db.execute(evaluation_fallback_query(today, settings.evaluation_trend_days)).one()
+    return evaluation_summary(row)
 
 
 @router.get("/insights/recent", response_model=List[schemas.Insight])
+@conditional(lambda request: insights_fingerprint())
 def recent_insights(
+    request: Request,
+    response: Response,
     limit: int = 10,
-    db: Session = Depends(get_db_session),
+    db: Session = Depends(get_read_db_session),
     _: str = Depends(require_token),
 ) -> List[Insight]:
     """Return the most recent insights for quick access panels."""
 
     limit = max(1, min(limit, 50))
-    return (
-        db.query(Insight)
-        .options(joinedload(Insight.interaction))
-        .order_by(Insight.created_at.desc())
-        .limit(limit)
-        .all()
-    )
+    if settings.fast_json_responses:
+        rows = (db.execute(recent_insight_rows_query(limit))).all()
+        return fast_json([project(row, schemas.Insight) for row in rows], response)
+    return db.scalars(recent_insights_query(limit)).all()
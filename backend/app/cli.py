@@ -0,0 +1,140 @@
+"""Command line entry point: ``python -m backend.app <group> <command>``.
+
+Commands::
+
+    python -m backend.app init [--skip-seed] [--chunk-size N]
+    python -m backend.app startup profile [--top N] [--skip-lifespan]
+    python -m backend.app db migrate [--batch-size N] [--throttle SECONDS] [--status]
+    python -m backend.app db advise [--verbose] [--strict]
+
+Handlers import what they need themselves, so running one command never
+loads the others' dependencies.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import sys
+from typing import Optional, Sequence
+
+
+def _print_progress(name: str, rows: int) -> None:
+    print(f"{name}: {rows} rows", flush=True)
+
+
+def _init(args: argparse.Namespace) -> int:
+    from .core.config import get_settings
+    from .database import SessionLocal, db_engine
+    from .migrations import upgrade
+    from .services.seed import DEFAULT_CHUNK_SIZE, load_demo_data
+
+    settings = get_settings()
+    applied = upgrade(
+        db_engine,
+        batch_size=settings.migration_batch_size,
+        throttle=settings.migration_throttle,
+        progress=_print_progress,
+    )
+    print(f"Applied migrations: {', '.join(map(str, applied))}" if applied else "Database is up to date")
+    if args.skip_seed:
+        return 0
+    with SessionLocal() as session:
+        loaded = load_demo_data(
+            session, settings, chunk_size=max(1, args.chunk_size or DEFAULT_CHUNK_SIZE), progress=_print_progress
+        )
+    print(", ".join(f"{table}={count}" for table, count in loaded.items()) if loaded else "Demo data already loaded")
+    return 0
+
+
+def _startup_profile(args: argparse.Namespace) -> int:
+    from .core.startup import format_timings, phase, profile_imports, summarize_imports, timings
+
+    print(summarize_imports(profile_imports("backend.app.main"), top=args.top))
+    # Timed in this process as well, so the phases below add up to a real worker boot
+    with phase("import app"):
+        main_module = importlib.import_module(".main", __package__)
+    if not args.skip_lifespan:
+        asyncio.run(_run_lifespan(main_module.app))
+    print(format_timings(timings))
+    return 0
+
+
+async def _run_lifespan(app) -> None:
+    async with app.router.lifespan_context(app):
+        pass
+
+
+def _db_migrate(args: argparse.Namespace) -> int:
+    from .core.config import get_settings
+    from .database import db_engine
+    from .migrations import pending_migrations, upgrade
+
+    if args.status:
+        pending = pending_migrations(db_engine)
+        for migration in pending:
+            print(f"pending {migration.version}: {migration.description}")
+        print(f"{len(pending)} pending migration(s)")
+        return 0
+
+    settings = get_settings()
+    applied = upgrade(
+        db_engine,
+        batch_size=max(1, args.batch_size or settings.migration_batch_size),
+        throttle=settings.migration_throttle if args.throttle is None else args.throttle,
+        progress=_print_progress,
+    )
+    print(f"Applied migrations: {', '.join(map(str, applied))}" if applied else "Database is up to date")
+    return 0
+
+
+def _db_advise(args: argparse.Namespace) -> int:
+    from .advisor import advise, format_reports
+    from .database import db_engine
+
+    with db_engine.connect() as connection:
+        reports = advise(connection)
+    print(format_reports(reports, verbose=args.verbose))
+    return 1 if args.strict and any(report.findings for report in reports) else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m backend.app", description="JourneyLens administration commands.")
+    groups = parser.add_subparsers(dest="group", required=True)
+
+    init = groups.add_parser("init", help="One-time setup: create tables, migrate and load the demo data")
+    init.add_argument("--skip-seed", action="store_true", help="Only create tables and migrate")
+    init.add_argument("--chunk-size", type=int, default=None, help="Rows per seed transaction")
+    init.set_defaults(handler=_init)
+
+    startup = groups.add_parser("startup", help="Application startup diagnostics").add_subparsers(
+        dest="command", required=True
+    )
+    profile = startup.add_parser("profile", help="Report import costs and timed startup phases of the API")
+    profile.add_argument("--top", type=int, default=15, help="Packages and modules to list")
+    profile.add_argument("--skip-lifespan", action="store_true", help="Only time the import, not the lifespan")
+    profile.set_defaults(handler=_startup_profile)
+
+    db = groups.add_parser("db", help="Database maintenance").add_subparsers(dest="command", required=True)
+    migrate = db.add_parser("migrate", help="Create missing tables and apply pending migrations")
+    migrate.add_argument("--batch-size", type=int, default=None, help="Rows per backfill transaction")
+    migrate.add_argument("--throttle", type=float, default=None, help="Seconds to pause between backfill batches")
+    migrate.add_argument("--status", action="store_true", help="List pending migrations without applying them")
+    migrate.set_defaults(handler=_db_migrate)
+
+    advise = db.add_parser("advise", help="EXPLAIN each route's queries and report full scans and sorts")
+    advise.add_argument("--verbose", action="store_true", help="Print every plan, not only flagged ones")
+    advise.add_argument("--strict", action="store_true", help="Exit with status 1 when anything is flagged")
+    advise.set_defaults(handler=_db_advise)
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
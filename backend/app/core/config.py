@@ -2,6 +2,8 @@
 
 from functools import lru_cache
 from pathlib import Path
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,10 +14,52 @@ class Settings(BaseSettings):
     api_version: str = "1.0.0"
     auth_token: str = "demo-token"
     database_url: str = "sqlite:///./backend_data/journeylens.db"
+    # Optional replica for GET routes; defaults to database_url opened read-only
+    read_database_url: Optional[str] = None
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    sqlite_wal: bool = True
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    # Negative values are KiB, as in PRAGMA cache_size
+    sqlite_cache_size: int = -64 * 1024
+    sqlite_busy_timeout: int = 5000
     demo_data_accounts: Path = Path("demo_accounts.csv")
     demo_data_contacts: Path = Path("demo_contacts.csv")
     demo_data_interactions: Path = Path("demo_interactions.csv")
     demo_data_expected: Path = Path("demo_expected_insights.csv")
+    timeline_page_size: int = 50
+    bulk_ingest_chunk_size: int = 1000
+    # Score new interactions on the background queue and answer 202 instead of 201
+    async_analysis: bool = False
+    analysis_queue_workers: int = 2
+    analysis_queue_max_size: int = 1000
+    # Serve read routes from an AsyncEngine (aiosqlite / asyncpg) instead of the threadpool
+    async_database: bool = False
+    async_database_url: Optional[str] = None
+    response_cache_enabled: bool = True
+    response_cache_ttl: float = 30.0
+    response_cache_max_entries: int = 1024
+    # "module:factory" returning a shared cache backend for multi-worker deployments
+    response_cache_backend: Optional[str] = None
+    # Render with orjson and serve timelines/recent insights from column projections
+    fast_json_responses: bool = False
+    # Request/SQL/InsightEngine timings at /metrics and in the Server-Timing header
+    metrics_enabled: bool = True
+    # Debug mode: trace SQL per request and warn about statements repeated this often (N+1)
+    sql_debug: bool = False
+    sql_repeat_threshold: int = 3
+    # Create tables and apply pending migrations at startup instead of in `python -m backend.app init`
+    auto_migrate: bool = False
+    migration_batch_size: int = 500
+    # Seconds to pause between backfill batches so live traffic keeps its share of the database
+    migration_throttle: float = 0.0
+    # Load the DEMO_DATA_* files at startup when the database is empty (otherwise `init` does it)
+    auto_seed: bool = False
+    # Length of the feedback windows whose useful rates are compared for the performance trend
+    evaluation_trend_days: int = 7
 
     model_config = SettingsConfigDict(case_sensitive=False)
 
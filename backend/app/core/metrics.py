@@ -0,0 +1,281 @@
+"""In-process request, SQL and InsightEngine instrumentation.
+
+Timings are collected into Prometheus-style histograms held by the module
+level :data:`registry`, and per request into a :class:`RequestStats` stored in
+a context variable, so the middleware can report a request's own SQL and
+analysis time in its ``Server-Timing`` header. Nothing here depends on
+FastAPI; the middleware and ``/metrics`` route live in
+``backend.app.api.instrumentation``.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+
+Labels = Tuple[Tuple[str, str], ...]
+F = TypeVar("F", bound=Callable)
+
+
+class Histogram:
+    """A labelled histogram with fixed upper bounds, rendered in Prometheus text format."""
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self._series: Dict[Labels, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            # Per-bucket counts, then the +Inf count and the sum
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+        for key, values in sorted(series.items()):
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, "+Inf"), values[:-1]):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(key, le=bound)} {cumulative:g}")
+            lines.append(f"{self.name}_sum{_labels(key)} {values[-1]:.6f}")
+            lines.append(f"{self.name}_count{_labels(key)} {cumulative:g}")
+        return lines
+
+    def count(self, **labels: str) -> int:
+        values = self._series.get(tuple(sorted(labels.items())))
+        return int(sum(values[:-1])) if values else 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+def _labels(key: Labels, **extra: object) -> str:
+    pairs = [*key, *((name, str(value)) for name, value in extra.items())]
+    if not pairs:
+        return ""
+    escaped = (f'{name}="{_escape(value)}"' for name, value in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """The histograms exported at ``/metrics``."""
+
+    def __init__(self) -> None:
+        self.request_seconds = Histogram(
+            "journeylens_http_request_duration_seconds", "HTTP request latency by route template."
+        )
+        self.request_sql_statements = Histogram(
+            "journeylens_http_request_sql_statements", "SQL statements executed per request.", STATEMENT_BUCKETS
+        )
+        self.request_sql_seconds = Histogram(
+            "journeylens_http_request_sql_seconds", "Time spent executing SQL per request."
+        )
+        self.sql_seconds = Histogram("journeylens_sql_statement_duration_seconds", "Latency of single SQL statements.")
+        self.insight_engine_seconds = Histogram(
+            "journeylens_insight_engine_duration_seconds", "Time spent in InsightEngine methods."
+        )
+
+    @property
+    def histograms(self) -> List[Histogram]:
+        return [value for value in vars(self).values() if isinstance(value, Histogram)]
+
+    def render(self) -> str:
+        return "\n".join(line for histogram in self.histograms for line in histogram.render()) + "\n"
+
+    def reset(self) -> None:
+        for histogram in self.histograms:
+            histogram.reset()
+
+
+registry = MetricsRegistry()
+
+
+@dataclass
+class QueryLog:
+    """Parametrized SQL statements seen while the log was active, with their counts."""
+
+    statements: Counter = field(default_factory=Counter)
+
+    @property
+    def count(self) -> int:
+        return sum(self.statements.values())
+
+    def add(self, statement: str) -> None:
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int = 2) -> Dict[str, int]:
+        """Statements executed at least ``threshold`` times: the signature of an N+1 loop."""
+
+        return {statement: count for statement, count in self.statements.items() if count >= threshold}
+
+    def describe(self) -> str:
+        return "\n".join(f"{count:>4} x {' '.join(statement.split())}" for statement, count in self.statements.most_common())
+
+
+@dataclass
+class RequestStats:
+    """Work attributed to the request currently being served."""
+
+    sql_statements: int = 0
+    sql_seconds: float = 0.0
+    # InsightEngine method -> seconds
+    engine_seconds: Dict[str, float] = field(default_factory=dict)
+    # Only filled while SQL tracing is on (see trace_statements)
+    queries: QueryLog = field(default_factory=QueryLog)
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+# Logs collecting every statement on tracked engines, from any thread (see count_queries)
+_query_logs: List[QueryLog] = []
+_tracing = False
+# Set while a timed InsightEngine call is running, so nested calls are not counted twice
+_engine_call: ContextVar[bool] = ContextVar("insight_engine_call", default=False)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+def start_request() -> Tuple[RequestStats, object]:
+    """Begin collecting stats for a request; pass the token to :func:`end_request`."""
+
+    stats = RequestStats()
+    return stats, _request_stats.set(stats)
+
+
+def end_request(token: object) -> None:
+    _request_stats.reset(token)
+
+
+def trace_statements(enabled: bool = True) -> None:
+    """Keep the text of every statement on the request's :class:`QueryLog` (debug mode)."""
+
+    global _tracing
+    _tracing = enabled
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryLog]:
+    """Collect the statements run on tracked engines inside the block, whichever thread runs them."""
+
+    log = QueryLog()
+    _query_logs.append(log)
+    try:
+        yield log
+    finally:
+        _query_logs.remove(log)
+
+
+@contextmanager
+def assert_max_queries(limit: int, repeat_limit: Optional[int] = None) -> Iterator[QueryLog]:
+    """Fail if the block runs more than ``limit`` statements, or any single statement more than ``repeat_limit`` times."""
+
+    with count_queries() as log:
+        yield log
+    if log.count > limit:
+        raise AssertionError(f"Expected at most {limit} queries, ran {log.count}:\n{log.describe()}")
+    if repeat_limit is not None and log.repeated(repeat_limit + 1):
+        raise AssertionError(f"A statement ran more than {repeat_limit} times (N+1?):\n{log.describe()}")
+
+
+def timed(method: str) -> Callable[[F], F]:
+    """Record the wall time of an InsightEngine method under ``method``."""
+
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _engine_call.get():
+                return func(*args, **kwargs)
+            token = _engine_call.set(True)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                _engine_call.reset(token)
+                registry.insight_engine_seconds.observe(elapsed, method=method)
+                stats = _request_stats.get()
+                if stats is not None:
+                    stats.engine_seconds[method] = stats.engine_seconds.get(method, 0.0) + elapsed
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def track_queries(engine: Engine) -> None:
+    """Feed every statement executed on ``engine`` to the active :func:`count_queries` logs.
+
+    Attached to every engine regardless of ``METRICS_ENABLED``, so query
+    budgets and SQL tracing work whether or not timings are collected.
+    """
+
+    if not event.contains(engine, "after_cursor_execute", _log_statement):
+        event.listen(engine, "after_cursor_execute", _log_statement)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement executed on ``engine`` (use ``sync_engine`` for async engines)."""
+
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+def _before_cursor_execute(connection, cursor, statement, parameters, context, executemany) -> None:
+    connection.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(connection, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - connection.info["query_started"].pop()
+    registry.sql_seconds.observe(elapsed)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.sql_statements += 1
+        stats.sql_seconds += elapsed
+
+
+def _log_statement(connection, cursor, statement, parameters, context, executemany) -> None:
+    if _tracing:
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries.add(statement)
+    if _query_logs:
+        for log in list(_query_logs):
+            log.add(statement)
+
+
+def _handle_error(exception_context) -> None:
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
@@ -0,0 +1,93 @@
+"""Startup phase timings and ``-X importtime`` summaries.
+
+:func:`phase` records how long each step of application startup takes, and
+:func:`profile_imports` imports a module in a fresh interpreter under
+``python -X importtime`` and parses its report. ``python -m backend.app
+startup profile`` prints both.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+# "import time:       111 |        111 |     asyncio.base_futures"; the indent is two spaces per nesting level
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+# Phase name -> seconds, in the order the phases ran
+timings: Dict[str, float] = {}
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a startup step; the result is kept in :data:`timings` and logged."""
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - started
+        logger.info("startup phase %s took %.1f ms", name, timings[name] * 1000)
+
+
+@dataclass(frozen=True)
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportTime]:
+    entries = []
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append(ImportTime(module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+def profile_imports(module: str) -> List[ImportTime]:
+    """Import ``module`` in a new interpreter with ``-X importtime`` and return its report."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def summarize_imports(entries: List[ImportTime], top: int = 15) -> str:
+    """Total import time, then the most expensive top-level packages and single modules (own time)."""
+
+    total = sum(entry.cumulative_us for entry in entries if entry.depth == 0)
+    packages: Dict[str, int] = defaultdict(int)
+    for entry in entries:
+        packages[entry.module.split(".")[0]] += entry.self_us
+
+    lines = [f"imports: {total / 1000:.1f} ms across {len(entries)} modules", "by package:"]
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        lines.append(f"  {self_us / 1000:8.1f} ms  {package}")
+    lines.append("slowest modules (own time):")
+    for entry in sorted(entries, key=lambda item: -item.self_us)[:top]:
+        lines.append(f"  {entry.self_us / 1000:8.1f} ms  {entry.module}")
+    return "\n".join(lines)
+
+
+def format_timings(phases: Dict[str, float]) -> str:
+    lines = ["startup phases:"]
+    lines += [f"  {seconds * 1000:8.1f} ms  {name}" for name, seconds in phases.items()]
+    lines.append(f"  {sum(phases.values()) * 1000:8.1f} ms  total")
+    return "\n".join(lines)
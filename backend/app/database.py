@@ -2,22 +2,92 @@
 
 from __future__ import annotations
 
-from typing import Generator
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import declarative_base, sessionmaker
 
-from .core.config import get_settings
+if TYPE_CHECKING:
+    # sqlalchemy.ext.asyncio is imported on first use; workers without ASYNC_DATABASE never pay for it
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from .core.config import Settings, get_settings
+from .core.metrics import instrument_engine, track_queries
 
 settings = get_settings()
 
-connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
 
-db_engine = create_engine(settings.database_url, connect_args=connect_args, future=True)
+def engine_options(database_url: str, config: Settings, read_only: bool = False) -> Dict[str, Any]:
+    """Pool and driver options for an engine on ``database_url``."""
+
+    url = make_url(database_url)
+    options: Dict[str, Any] = {"pool_pre_ping": config.db_pool_pre_ping, "pool_recycle": config.db_pool_recycle}
+    connect_args: Dict[str, Any] = {}
+    if url.get_backend_name() == "sqlite":
+        connect_args["check_same_thread"] = False
+        if url.database in (None, "", ":memory:"):
+            # In-memory databases live on a single connection; pool sizing does not apply
+            return {"connect_args": connect_args}
+    elif read_only and url.get_backend_name() == "postgresql":
+        connect_args["options"] = "-c default_transaction_read_only=on"
+    options.update(pool_size=config.db_pool_size, max_overflow=config.db_max_overflow, connect_args=connect_args)
+    return options
+
+
+def configure_sqlite(engine: Engine, config: Settings, read_only: bool = False) -> None:
+    """Apply the SQLite pragma profile to every new connection of ``engine``.
+
+    WAL lets readers proceed while one writer commits, and ``busy_timeout``
+    makes competing writers wait instead of failing with "database is locked".
+    """
+
+    if engine.dialect.name != "sqlite":
+        return
+
+    pragmas = [f"busy_timeout={int(config.sqlite_busy_timeout)}"]
+    if config.sqlite_wal:
+        pragmas.append("journal_mode=WAL")
+    pragmas += [
+        f"synchronous={config.sqlite_synchronous}",
+        f"mmap_size={int(config.sqlite_mmap_size)}",
+        f"cache_size={int(config.sqlite_cache_size)}",
+    ]
+    if read_only:
+        pragmas.append("query_only=ON")
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(f"PRAGMA {pragma}")
+        finally:
+            cursor.close()
+
+
+def create_db_engine(database_url: str, config: Settings, read_only: bool = False) -> Engine:
+    engine = create_engine(database_url, future=True, **engine_options(database_url, config, read_only))
+    configure_sqlite(engine, config, read_only)
+    track_queries(engine)
+    if config.metrics_enabled:
+        instrument_engine(engine)
+    return engine
+
+
+db_engine = create_db_engine(settings.database_url, settings)
 SessionLocal = sessionmaker(bind=db_engine, autoflush=False, autocommit=False, future=True)
 
+# GET routes read through their own pool so they never queue behind writers
+read_db_engine = create_db_engine(settings.read_database_url or settings.database_url, settings, read_only=True)
+ReadSessionLocal = sessionmaker(bind=read_db_engine, autoflush=False, autocommit=False, future=True)
+
 Base = declarative_base()
 
+# Async driver used for each backend when no explicit async URL is configured
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
 
 def get_db() -> Generator:
     """Yield a database session for request scope."""
@@ -27,3 +97,55 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+def get_read_db() -> Generator:
+    """Yield a read-only database session for request scope."""
+
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def async_database_url(database_url: str) -> str:
+    """Map a sync database URL onto the matching async driver."""
+
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for {backend!r}; set ASYNC_DATABASE_URL explicitly")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+@lru_cache()
+def get_async_engine() -> AsyncEngine:
+    """Return the shared AsyncEngine, created on first use so the driver stays optional."""
+
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = settings.async_database_url or async_database_url(settings.database_url)
+    options = engine_options(url, settings)
+    # The asyncpg and aiosqlite drivers take their own connect arguments
+    options.pop("connect_args", None)
+    engine = create_async_engine(url, **options)
+    configure_sqlite(engine.sync_engine, settings)
+    track_queries(engine.sync_engine)
+    if settings.metrics_enabled:
+        instrument_engine(engine.sync_engine)
+    return engine
+
+
+@lru_cache()
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    return async_sessionmaker(bind=get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Yield an async database session for request scope."""
+
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -1,4 +1,11 @@
-"""Entry point for the JourneyLens FastAPI application."""
+"""Entry point for the JourneyLens FastAPI application.
+
+Importing this module only builds the app; it never touches the database.
+The one-time work (tables, migrations, demo data) belongs to
+``python -m backend.app init``. With ``AUTO_MIGRATE`` and ``AUTO_SEED`` off,
+the default, a worker's startup is just starting the analysis queue, which is
+what keeps cold starts short when workers are autoscaled.
+"""
 
 from __future__ import annotations
 
@@ -6,23 +13,51 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
-from .api.routes import router
+from .api import instrumentation
+from .api.pagination import NEXT_CURSOR_HEADER
+from .api.responses import FastJSONResponse
+from .api.routes import analysis_queue, router
 from .core.config import get_settings
-from .database import Base, SessionLocal, db_engine
-from .services.seed import load_demo_data
+from .core.metrics import trace_statements
+from .core.startup import phase
+from .database import SessionLocal, db_engine, get_async_engine
 
 settings = get_settings()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    with SessionLocal() as session:
-        load_demo_data(session, settings)
+    # Migration and seeding code is only imported by processes that run it
+    if settings.auto_migrate:
+        from .migrations import upgrade
+
+        with phase("migrate"):
+            upgrade(db_engine, batch_size=settings.migration_batch_size, throttle=settings.migration_throttle)
+    if settings.auto_seed:
+        from .services.seed import load_demo_data
+
+        with phase("seed"), SessionLocal() as session:
+            load_demo_data(session, settings)
+    with phase("analysis queue"):
+        analysis_queue.start()
+    if settings.async_database:
+        # Fail at startup rather than on the first request if the async driver is missing
+        with phase("async engine"):
+            async_engine = get_async_engine()
     yield
+    analysis_queue.stop()
+    if settings.async_database:
+        await async_engine.dispose()
 
 
-app = FastAPI(title=settings.app_name, version=settings.api_version, lifespan=lifespan)
+app = FastAPI(
+    title=settings.app_name,
+    version=settings.api_version,
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse if settings.fast_json_responses else JSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -30,13 +65,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Last-Modified"],
 )
+if settings.sql_debug:
+    trace_statements()
+if settings.metrics_enabled or settings.sql_debug:
+    app.add_middleware(
+        instrumentation.InstrumentationMiddleware,
+        repeat_threshold=settings.sql_repeat_threshold if settings.sql_debug else None,
+        record_metrics=settings.metrics_enabled,
+    )
 
-# Ensure database tables exist
-Base.metadata.create_all(bind=db_engine)
+# Register API routes; async read routes, when enabled, shadow their sync counterparts
+if settings.async_database:
+    from .api import async_routes
 
-# Register API routes
+    app.include_router(async_routes.router)
 app.include_router(router)
+if settings.metrics_enabled:
+    app.include_router(instrumentation.router)
 
 
 @app.get("/")
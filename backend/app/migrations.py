@@ -0,0 +1,323 @@
+"""Versioned schema migrations for databases created by older releases.
+
+``Base.metadata.create_all`` only creates missing tables, so columns added to
+existing tables (and data derived for them) are applied here. Applied
+versions are recorded in ``schema_migrations``; each migration must also be
+safe on a fresh database where ``create_all`` already produced the new schema.
+
+Nothing runs on import: call :func:`upgrade` (``python -m backend.app db
+migrate``, or app startup when ``AUTO_MIGRATE`` is on). A migration is a
+short schema step plus optional :class:`Backfill` data steps. Backfills walk
+their table in primary-key batches, one transaction per batch with an
+optional pause in between, so a live database is never locked for long, and
+record the last key done in ``migration_progress`` so an interrupted run
+resumes where it stopped.
+
+The one exception is migration 5, which builds the single global
+evaluation totals row. Writers only add to that row once it exists, so it
+has to be computed from one consistent read of every table; batches would
+either miss or double count writes landing between them. It is a few
+aggregate statements and one row per feedback day, not a per-row rewrite.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, delete, func, inspect, select, text, update
+from sqlalchemy.engine import Connection, Engine, Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .database import Base
+from .models import Account, AccountRiskRollup, Feedback, Insight, Interaction
+from .services.analysis import extract_terms, pack_terms
+from .services.rollups import rebuild_evaluation, rebuild_rollups
+
+BACKFILL_BATCH_SIZE = 500
+# pg_advisory_lock key shared by every process that upgrades the same database
+MIGRATION_LOCK_KEY = 0x4A4C4D47
+
+migration_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+)
+migration_progress = Table(
+    "migration_progress",
+    migration_metadata,
+    Column("name", String, primary_key=True),
+    Column("last_key", Integer, nullable=False),
+    Column("rows_done", Integer, nullable=False, default=0),
+    Column("updated_at", DateTime(timezone=True), nullable=False, default=func.now(), onupdate=func.now()),
+)
+
+# Called after every committed backfill batch with the backfill name and rows done so far
+Progress = Callable[[str, int], None]
+
+
+@dataclass(frozen=True)
+class Backfill:
+    """A resumable data step that rewrites one table in primary-key batches.
+
+    ``fetch(connection, after_key, batch_size)`` returns the next batch of
+    rows, ordered by key with the key first; ``apply(connection, rows)``
+    writes their new values. Both run in the batch's transaction.
+    """
+
+    name: str
+    fetch: Callable[[Connection, int, int], Sequence[Row]]
+    apply: Callable[[Connection, Sequence[Row]], None]
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+    backfills: Tuple[Backfill, ...] = ()
+
+
+def run_backfill(
+    engine: Engine,
+    backfill: Backfill,
+    *,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+    throttle: float = 0.0,
+    progress: Optional[Progress] = None,
+) -> int:
+    """Run ``backfill`` to completion and return the number of rows it processed in this call.
+
+    Each batch commits together with its progress marker, so a crash never
+    loses or repeats a committed batch. ``throttle`` seconds are slept
+    between batches to leave room for foreground traffic.
+    """
+
+    migration_metadata.create_all(bind=engine, tables=[migration_progress])
+    with engine.connect() as connection:
+        state = connection.execute(
+            select(migration_progress.c.last_key, migration_progress.c.rows_done).where(
+                migration_progress.c.name == backfill.name
+            )
+        ).first()
+    last_key, rows_done = (state.last_key, state.rows_done) if state else (0, 0)
+    saved = state is not None
+
+    processed = 0
+    while True:
+        with engine.begin() as connection:
+            rows = backfill.fetch(connection, last_key, batch_size)
+            if not rows:
+                connection.execute(delete(migration_progress).where(migration_progress.c.name == backfill.name))
+                return processed
+            backfill.apply(connection, rows)
+            last_key = rows[-1][0]
+            rows_done += len(rows)
+            _save_progress(connection, backfill.name, last_key, rows_done, exists=saved)
+            saved = True
+        processed += len(rows)
+        if progress is not None:
+            progress(backfill.name, rows_done)
+        if throttle > 0:
+            time.sleep(throttle)
+
+
+def _save_progress(connection: Connection, name: str, last_key: int, rows_done: int, exists: bool) -> None:
+    values = {"last_key": last_key, "rows_done": rows_done}
+    if exists:
+        connection.execute(update(migration_progress).where(migration_progress.c.name == name).values(**values))
+    else:
+        connection.execute(migration_progress.insert().values(name=name, **values))
+
+
+def _add_column(connection: Connection, table: str, column: str, ddl_type: str) -> None:
+    existing = {info["name"] for info in inspect(connection).get_columns(table)}
+    if column not in existing:
+        connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+
+
+def _insight_terms(connection: Connection) -> None:
+    _add_column(connection, "insights", "terms", "TEXT")
+    _add_column(connection, "insights", "term_count", "INTEGER")
+
+
+def _fetch_insight_summaries(connection: Connection, after_id: int, batch_size: int) -> Sequence[Row]:
+    return connection.execute(
+        text("SELECT id, summary FROM insights WHERE id > :last_id AND terms IS NULL ORDER BY id LIMIT :batch_size"),
+        {"last_id": after_id, "batch_size": batch_size},
+    ).all()
+
+
+def _store_insight_terms(connection: Connection, rows: Sequence[Row]) -> None:
+    updates = []
+    for insight_id, summary in rows:
+        terms = extract_terms(summary or "")
+        updates.append({"id": insight_id, "terms": pack_terms(terms), "term_count": len(terms)})
+    connection.execute(
+        text("UPDATE insights SET terms = :terms, term_count = :term_count WHERE id = :id"),
+        updates,
+    )
+
+
+def _rollup_tables(connection: Connection) -> None:
+    """The rollup tables come from ``create_all``; the backfill fills them for existing data."""
+
+
+def _fetch_account_ids(connection: Connection, after_id: int, batch_size: int) -> Sequence[Row]:
+    return connection.execute(
+        select(Account.id).where(Account.id > after_id).order_by(Account.id).limit(batch_size)
+    ).all()
+
+
+def _rebuild_account_rollups(connection: Connection, rows: Sequence[Row]) -> None:
+    with Session(bind=connection) as session:
+        rebuild_rollups(session, [account_id for account_id, in rows])
+
+
+def _evaluation_rollups(connection: Connection) -> None:
+    # Not a backfill: see the module docstring
+    with Session(bind=connection) as session:
+        rebuild_evaluation(session)
+
+
+def _keyset_indexes(connection: Connection) -> None:
+    connection.execute(text("DROP INDEX IF EXISTS ix_account_risk_rollups_risk_score"))
+    for index in (
+        Account.__table__.indexes | Interaction.__table__.indexes | AccountRiskRollup.__table__.indexes
+    ):
+        index.create(bind=connection, checkfirst=True)
+
+
+def _read_path_indexes(connection: Connection) -> None:
+    # Feedback.insight_id is already the leading column of uq_feedback_per_user
+    for model in (Account, Insight, Feedback, AccountRiskRollup):
+        for index in model.__table__.indexes:
+            index.create(bind=connection, checkfirst=True)
+
+    # Insights tables from the first release lack the unique index on interaction_id
+    inspector = inspect(connection)
+    leading = {
+        entry["column_names"][0]
+        for entry in [*inspector.get_indexes("insights"), *inspector.get_unique_constraints("insights")]
+    }
+    if "interaction_id" not in leading:
+        connection.execute(text("CREATE INDEX ix_insights_interaction_id ON insights (interaction_id)"))
+
+
+def _descending_risk_index(connection: Connection) -> None:
+    # The ascending (risk_score, account_id) index left the account_id tiebreak to a temporary sort
+    connection.execute(text("DROP INDEX IF EXISTS ix_account_risk_rollups_risk_score_account_id"))
+    for index in AccountRiskRollup.__table__.indexes:
+        index.create(bind=connection, checkfirst=True)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        1,
+        "Persist retrieval terms on insights",
+        _insight_terms,
+        backfills=(Backfill("insight_terms", _fetch_insight_summaries, _store_insight_terms),),
+    ),
+    Migration(
+        2,
+        "Build account risk rollups",
+        _rollup_tables,
+        backfills=(Backfill("account_risk_rollups", _fetch_account_ids, _rebuild_account_rollups),),
+    ),
+    Migration(3, "Add composite indexes for keyset pagination", _keyset_indexes),
+    Migration(4, "Index insight recency, feedback ratings and fingerprint timestamps", _read_path_indexes),
+    Migration(5, "Build evaluation totals and daily feedback counts", _evaluation_rollups),
+    Migration(6, "Order the dashboard risk index by descending risk", _descending_risk_index),
+]
+
+
+def pending_migrations(engine: Engine) -> List[Migration]:
+    migration_metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        done = set(connection.scalars(select(schema_migrations.c.version)))
+    return [migration for migration in sorted(MIGRATIONS, key=lambda item: item.version) if migration.version not in done]
+
+
+def run_migrations(
+    engine: Engine,
+    *,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+    throttle: float = 0.0,
+    progress: Optional[Progress] = None,
+) -> List[int]:
+    """Apply pending migrations in version order and return their versions.
+
+    A migration is recorded as applied only after its backfills finish, so
+    an interrupted run repeats the (idempotent) schema step and resumes the
+    backfill from its saved progress.
+    """
+
+    applied: List[int] = []
+    for migration in pending_migrations(engine):
+        with engine.begin() as connection:
+            migration.apply(connection)
+        for backfill in migration.backfills:
+            run_backfill(engine, backfill, batch_size=batch_size, throttle=throttle, progress=progress)
+        try:
+            with engine.begin() as connection:
+                connection.execute(
+                    schema_migrations.insert().values(version=migration.version, description=migration.description)
+                )
+        except IntegrityError:
+            # Recorded by a process that ran it without the lock; the steps are idempotent
+            continue
+        applied.append(migration.version)
+
+    return applied
+
+
+@contextmanager
+def migration_lock(engine: Engine) -> Iterator[None]:
+    """Hold an exclusive lock on upgrading ``engine``'s database.
+
+    PostgreSQL takes a session-level advisory lock; a SQLite file gets an
+    ``flock`` on a ``.migrate.lock`` file beside it (a write transaction
+    would block the migration's own connections). Both are released when
+    the holder exits, so a crashed worker never leaves a stale lock. An
+    in-memory SQLite database belongs to one process and needs none.
+    """
+
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as connection:
+            connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            try:
+                yield
+            finally:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        return
+
+    database = engine.url.database
+    if engine.dialect.name != "sqlite" or database in (None, "", ":memory:"):
+        yield
+        return
+
+    import fcntl
+
+    with open(f"{database}.migrate.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def upgrade(engine: Engine, **options: Any) -> List[int]:
+    """Create missing tables, then apply pending migrations (see :func:`run_migrations`).
+
+    Safe to call from every worker at once: the work runs under
+    :func:`migration_lock`, and whoever gets it second finds nothing pending.
+    """
+
+    with migration_lock(engine):
+        Base.metadata.create_all(bind=engine)
+        return run_migrations(engine, **options)
@@ -2,10 +2,23 @@
 
 from __future__ import annotations
 
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 from typing import Optional
 
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .database import Base
@@ -22,6 +35,8 @@ class TimestampMixin:
 
 class Account(Base, TimestampMixin):
     __tablename__ = "accounts"
+    # updated_at indexes let the conditional GET fingerprints read max(updated_at) without a scan
+    __table_args__ = (Index("ix_accounts_name_id", "name", "id"), Index("ix_accounts_updated_at", "updated_at"))
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String, index=True)
@@ -47,6 +62,7 @@ class Contact(Base, TimestampMixin):
 
 class Interaction(Base, TimestampMixin):
     __tablename__ = "interactions"
+    __table_args__ = (Index("ix_interactions_account_id_timestamp", "account_id", "timestamp"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"), index=True)
@@ -64,6 +80,8 @@ class Interaction(Base, TimestampMixin):
 
 class Insight(Base, TimestampMixin):
     __tablename__ = "insights"
+    # Newest-first listings (recent insights) and the insights fingerprint
+    __table_args__ = (Index("ix_insights_created_at", "created_at"), Index("ix_insights_updated_at", "updated_at"))
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     interaction_id: Mapped[int] = mapped_column(ForeignKey("interactions.id"), unique=True)
@@ -73,6 +91,9 @@ class Insight(Base, TimestampMixin):
     confidence: Mapped[float] = mapped_column(Float, default=0.5)
     summary: Mapped[str] = mapped_column(Text)
     keywords: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # Space separated retrieval terms of the summary, so RAG never re-tokenizes it
+    terms: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    term_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
     interaction: Mapped[Interaction] = relationship("Interaction", back_populates="insight")
     feedback_items: Mapped[list["Feedback"]] = relationship("Feedback", back_populates="insight", cascade="all, delete-orphan")
@@ -80,12 +101,15 @@ class Insight(Base, TimestampMixin):
 
 class Feedback(Base, TimestampMixin):
     __tablename__ = "feedback"
-    __table_args__ = (UniqueConstraint("insight_id", "user_id", name="uq_feedback_per_user"),)
+    __table_args__ = (
+        UniqueConstraint("insight_id", "user_id", name="uq_feedback_per_user"),
+        Index("ix_feedback_updated_at", "updated_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     insight_id: Mapped[int] = mapped_column(ForeignKey("insights.id"))
     user_id: Mapped[str] = mapped_column(String)
-    rating: Mapped[bool] = mapped_column(Boolean)
+    rating: Mapped[bool] = mapped_column(Boolean, index=True)
     reason_code: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     comments: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
@@ -102,3 +126,74 @@ class EvalSample(Base, TimestampMixin):
     expected_risk: Mapped[float] = mapped_column(Float)
 
     interaction: Mapped[Interaction] = relationship("Interaction")
+
+
+class AccountRiskRollup(Base, TimestampMixin):
+    """Running risk aggregates per account, maintained whenever insights are written."""
+
+    __tablename__ = "account_risk_rollups"
+    __table_args__ = (
+        # Matches the dashboard's ORDER BY risk_score DESC, account_id ASC, so neither key needs a sort
+        Index("ix_account_risk_rollups_risk_score_desc_account_id", text("risk_score DESC"), "account_id"),
+        Index("ix_account_risk_rollups_updated_at", "updated_at"),
+    )
+
+    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"), primary_key=True)
+    risk_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    insight_count: Mapped[int] = mapped_column(Integer, default=0)
+    risk_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    interaction_count: Mapped[int] = mapped_column(Integer, default=0)
+    last_interaction: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    dominant_intent: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+
+    account: Mapped[Account] = relationship("Account")
+
+
+class AccountIntentCount(Base):
+    """Per-intent insight counter backing ``AccountRiskRollup.dominant_intent``."""
+
+    __tablename__ = "account_intent_counts"
+
+    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"), primary_key=True)
+    intent: Mapped[str] = mapped_column(String, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, default=0)
+    # Earliest interaction carrying this intent; breaks ties between equally common intents
+    first_interaction_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+
+# EvaluationRollup holds a single row under this id
+EVALUATION_ROLLUP_ID = 1
+
+
+class EvaluationRollup(Base, TimestampMixin):
+    """Running totals behind ``/evaluations/metrics``, maintained whenever insights or feedback are written."""
+
+    __tablename__ = "evaluation_rollups"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    interaction_count: Mapped[int] = mapped_column(Integer, default=0)
+    insight_count: Mapped[int] = mapped_column(Integer, default=0)
+    confidence_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    feedback_count: Mapped[int] = mapped_column(Integer, default=0)
+    positive_feedback_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class FeedbackDailyCount(Base):
+    """Feedback received per UTC day, for the windowed useful-rate trend."""
+
+    __tablename__ = "feedback_daily_counts"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    feedback_count: Mapped[int] = mapped_column(Integer, default=0)
+    positive_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class PendingAnalysis(Base, TimestampMixin):
+    """Interaction waiting for the background analysis queue; deleted once its insight exists."""
+
+    __tablename__ = "pending_analysis"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    interaction_id: Mapped[int] = mapped_column(ForeignKey("interactions.id"), unique=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
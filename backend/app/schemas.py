@@ -51,6 +51,23 @@ class Interaction(BaseModel):
     model_config = ConfigDict(from_attributes=True)  # type: ignore[call-arg]
 
 
+class InteractionSummary(BaseModel):
+    """Timeline entry without the full ``content`` body."""
+
+    id: int
+    account_id: int
+    contact_id: Optional[int]
+    channel: str
+    summary: Optional[str]
+    timestamp: datetime
+    created_at: datetime
+    updated_at: datetime
+    source_file: Optional[str]
+    insight: Optional[Insight]
+
+    model_config = ConfigDict(from_attributes=True)  # type: ignore[call-arg]
+
+
 class InteractionCreate(BaseModel):
     account_id: int
     contact_id: Optional[int] = Field(default=None)
@@ -59,6 +76,11 @@ class InteractionCreate(BaseModel):
     timestamp: Optional[datetime] = None
 
 
+class AnalysisAccepted(BaseModel):
+    interaction_id: int
+    status: str
+
+
 class FeedbackCreate(BaseModel):
     insight_id: int
     rating: bool
@@ -94,6 +116,10 @@ class AccountWithInsights(Account):
     interactions: List[Interaction]
 
 
+class AccountWithInteractionSummaries(Account):
+    interactions: List[InteractionSummary]
+
+
 class DashboardAccount(BaseModel):
     account_id: int
     account_name: str
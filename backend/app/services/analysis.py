@@ -5,11 +5,13 @@ from __future__ import annotations
 from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime
+import heapq
 import math
 import re
 from textwrap import shorten
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import AbstractSet, Dict, Iterable, List, Mapping, Optional, Tuple
 
+from ..core.metrics import timed
 from ..models import Insight, Interaction
 
 POSITIVE_KEYWORDS = {
@@ -48,6 +50,13 @@ INTENT_KEYWORDS = {
     "product_feedback": {"feedback", "improvement", "like", "suggestion"},
 }
 
+# Terms compared between a RAG query and insight summaries
+TERM_PATTERN = re.compile(r"[a-zA-Z]{3,}")
+
+# Phrases that nudge the risk score after intent and sentiment are applied
+RISK_ESCALATION_KEYWORDS = {"urgent", "immediately"}
+RISK_DAMPENING_KEYWORDS = {"happy", "excited"}
+
 NEXT_ACTIONS = {
     "support_request": "Escalate to technical support",
     "pricing_inquiry": "Review pricing options",
@@ -68,51 +77,146 @@ class ExpectedInsight:
     expected_risk: float
 
 
+@dataclass(frozen=True)
+class KeywordHits:
+    """Every keyword table match found in a single interaction."""
+
+    intent_scores: Dict[str, int]
+    positive: int
+    negative: int
+    escalates_risk: bool
+    dampens_risk: bool
+
+
+class KeywordMatcher:
+    """Match all keyword tables against a text using one shared vocabulary.
+
+    Keywords are substring matches, so ``"grow"`` also hits ``"growing"``. Each
+    distinct keyword is searched for once per text and every classifier reads
+    from the resulting hit set instead of rescanning the text itself.
+    """
+
+    def __init__(
+        self,
+        intent_keywords: Mapping[str, AbstractSet[str]],
+        positive_keywords: AbstractSet[str],
+        negative_keywords: AbstractSet[str],
+        escalation_keywords: AbstractSet[str] = frozenset(),
+        dampening_keywords: AbstractSet[str] = frozenset(),
+    ):
+        self.intent_keywords = {label: frozenset(keywords) for label, keywords in intent_keywords.items()}
+        self.positive_keywords = frozenset(positive_keywords)
+        self.negative_keywords = frozenset(negative_keywords)
+        self.escalation_keywords = frozenset(escalation_keywords)
+        self.dampening_keywords = frozenset(dampening_keywords)
+
+        vocabulary = set(self.positive_keywords | self.negative_keywords)
+        vocabulary |= self.escalation_keywords | self.dampening_keywords
+        for keywords in self.intent_keywords.values():
+            vocabulary |= keywords
+        self.vocabulary: Tuple[str, ...] = tuple(sorted(vocabulary))
+
+    def find(self, text: str) -> frozenset[str]:
+        """Return the keywords present in already-lowercased ``text``."""
+
+        return frozenset([keyword for keyword in self.vocabulary if keyword in text])
+
+    def match(self, text: str) -> KeywordHits:
+        """Return intent, sentiment and risk-modifier hits for ``text``."""
+
+        return self.hits(self.find(text))
+
+    def hits(self, found: AbstractSet[str]) -> KeywordHits:
+        """Group a set of found keywords by the table they belong to."""
+
+        return KeywordHits(
+            intent_scores={label: len(keywords & found) for label, keywords in self.intent_keywords.items()},
+            positive=len(self.positive_keywords & found),
+            negative=len(self.negative_keywords & found),
+            escalates_risk=not self.escalation_keywords.isdisjoint(found),
+            dampens_risk=not self.dampening_keywords.isdisjoint(found),
+        )
+
+
+KEYWORD_MATCHER = KeywordMatcher(
+    INTENT_KEYWORDS,
+    POSITIVE_KEYWORDS,
+    NEGATIVE_KEYWORDS,
+    RISK_ESCALATION_KEYWORDS,
+    RISK_DAMPENING_KEYWORDS,
+)
+
+
 class InsightEngine:
     """Provide lightweight heuristics for insights without external AI."""
 
     def __init__(self, expected_lookup: Dict[int, ExpectedInsight] | None = None):
         self.expected_lookup = expected_lookup or {}
 
+    @timed("analyze")
     def analyze(self, interaction_id: Optional[int], content: str) -> Dict[str, float | str]:
         normalized = content.lower()
 
         # If we have an expected value (from seed data) use it as primary signal
         if interaction_id and interaction_id in self.expected_lookup:
             expected = self.expected_lookup[interaction_id]
-            return {
-                "intent": expected.expected_intent,
-                "sentiment": expected.expected_sentiment,
-                "risk_score": float(expected.expected_risk),
-                "summary": self._summarize(content),
-                "confidence": 0.9,
-                "keywords": self._format_keywords(normalized),
-            }
-
-        intent = self._infer_intent(normalized)
-        sentiment = self._infer_sentiment(normalized)
-        risk_score = self._estimate_risk(intent, sentiment, normalized)
-
-        return {
-            "intent": intent,
-            "sentiment": sentiment,
-            "risk_score": risk_score,
-            "summary": self._summarize(content),
-            "confidence": 0.65,
-            "keywords": self._format_keywords(normalized),
-        }
-
-    def rag_answer(self, query: str, insights: Iterable[Insight]) -> Tuple[str, List[Insight]]:
+            return self._result(
+                expected.expected_intent,
+                expected.expected_sentiment,
+                float(expected.expected_risk),
+                0.9,
+                content,
+                normalized,
+            )
+
+        intent, sentiment, risk_score = self._classify(KEYWORD_MATCHER.match(normalized))
+        return self._result(intent, sentiment, risk_score, 0.65, content, normalized)
+
+    @timed("analyze_many")
+    def analyze_many(self, items: Iterable[Tuple[Optional[int], str]]) -> List[Dict[str, float | str]]:
+        """Analyze a batch of ``(interaction_id, content)`` pairs.
+
+        Results match calling :meth:`analyze` on each pair in order. Labels are
+        computed once per distinct keyword hit pattern in the batch, which is
+        far smaller than the batch itself for large re-scoring runs.
+        """
+
+        results: List[Dict[str, float | str]] = []
+        labels_by_hits: Dict[frozenset[str], Tuple[str, str, float]] = {}
+
+        for interaction_id, content in items:
+            if interaction_id and interaction_id in self.expected_lookup:
+                results.append(self.analyze(interaction_id, content))
+                continue
+
+            normalized = content.lower()
+            found = KEYWORD_MATCHER.find(normalized)
+            labels = labels_by_hits.get(found)
+            if labels is None:
+                labels = labels_by_hits[found] = self._classify(KEYWORD_MATCHER.hits(found))
+
+            intent, sentiment, risk_score = labels
+            results.append(self._result(intent, sentiment, risk_score, 0.65, content, normalized))
+
+        return results
+
+    @timed("rag_answer")
+    def rag_answer(self, query: str, insights: Iterable[Insight], limit: int = 3) -> Tuple[str, List[Insight]]:
         """Return a simple retrieval augmented response using stored summaries."""
 
-        normalized_query = query.lower()
-        ranked = sorted(
-            insights,
-            key=lambda insight: self._similarity(normalized_query, insight.summary.lower() if insight.summary else ""),
-            reverse=True,
+        query_terms = extract_terms(query)
+        candidates = [insight for insight in insights if insight.summary]
+        # Ties keep their input order, matching a stable descending sort
+        ranked = heapq.nsmallest(
+            limit,
+            enumerate(candidates),
+            key=lambda item: (-self._similarity(query_terms, stored_terms(item[1])), item[0]),
         )
+        return self.compose_answer([insight for _, insight in ranked])
 
-        top_insights = [insight for insight in ranked if insight.summary][:3]
+    @staticmethod
+    def compose_answer(top_insights: List[Insight]) -> Tuple[str, List[Insight]]:
+        """Format ranked insights into the RAG answer text."""
 
         if not top_insights:
             return ("No relevant insights found for this account yet.", [])
@@ -133,12 +237,37 @@ class InsightEngine:
 
         return answer, top_insights
 
+    @classmethod
+    def _result(
+        cls,
+        intent: str,
+        sentiment: str,
+        risk_score: float,
+        confidence: float,
+        content: str,
+        normalized: str,
+    ) -> Dict[str, float | str]:
+        summary = cls._summarize(content)
+        terms = extract_terms(summary)
+        return {
+            "intent": intent,
+            "sentiment": sentiment,
+            "risk_score": risk_score,
+            "summary": summary,
+            "confidence": confidence,
+            "keywords": cls._format_keywords(normalized),
+            "terms": pack_terms(terms),
+            "term_count": len(terms),
+        }
+
     @staticmethod
     def _summarize(content: str, max_length: int = 240) -> str:
         cleaned = re.sub(r"\s+", " ", content.strip())
         if not cleaned:
             return "No summary available."
-        return shorten(cleaned, width=max_length, placeholder="…")
+        # shorten() only looks past the width to see whether another word follows,
+        # so trim long transcripts before it re-splits the whole text
+        return shorten(cleaned[: max_length + 2], width=max_length, placeholder="…")
 
     @staticmethod
     def _extract_keywords(text: str) -> List[str]:
@@ -151,28 +280,30 @@ class InsightEngine:
         keywords = InsightEngine._extract_keywords(text)
         return ", ".join(sorted(set(keywords)))
 
+    @classmethod
+    def _classify(cls, hits: KeywordHits) -> Tuple[str, str, float]:
+        intent = cls._infer_intent(hits)
+        sentiment = cls._infer_sentiment(hits)
+        return intent, sentiment, cls._estimate_risk(intent, sentiment, hits)
+
     @staticmethod
-    def _infer_intent(text: str) -> str:
-        scores = {label: 0 for label in INTENT_KEYWORDS}
-        for label, keywords in INTENT_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in text:
-                    scores[label] += 1
+    def _infer_intent(hits: KeywordHits) -> str:
+        scores = hits.intent_scores
 
         # Default to support request when nothing matches
         best_intent = max(scores, key=lambda label: scores[label])
         return best_intent if scores[best_intent] > 0 else "support_request"
 
     @staticmethod
-    def _infer_sentiment(text: str) -> str:
-        pos = sum(word in text for word in POSITIVE_KEYWORDS)
-        neg = sum(word in text for word in NEGATIVE_KEYWORDS)
+    def _infer_sentiment(hits: KeywordHits) -> str:
+        pos = hits.positive
+        neg = hits.negative
         if pos == neg:
             return "neutral"
         return "positive" if pos > neg else "negative"
 
     @staticmethod
-    def _estimate_risk(intent: str, sentiment: str, text: str) -> float:
+    def _estimate_risk(intent: str, sentiment: str, hits: KeywordHits) -> float:
         base = 0.3
 
         if intent == "churn_risk":
@@ -187,20 +318,55 @@ class InsightEngine:
         elif sentiment == "positive":
             base -= 0.2
 
-        if "urgent" in text or "immediately" in text:
+        if hits.escalates_risk:
             base += 0.1
-        if "happy" in text or "excited" in text:
+        if hits.dampens_risk:
             base -= 0.1
 
         return round(min(max(base, 0.05), 0.95), 2)
 
     @staticmethod
-    def _similarity(query: str, text: str) -> float:
-        if not text:
-            return 0.0
-        query_terms = set(re.findall(r"[a-zA-Z]{3,}", query))
-        text_terms = set(re.findall(r"[a-zA-Z]{3,}", text))
+    def _similarity(query_terms: AbstractSet[str], text_terms: AbstractSet[str]) -> float:
         if not query_terms or not text_terms:
             return 0.0
         overlap = len(query_terms & text_terms)
         return overlap / math.sqrt(len(query_terms) * len(text_terms))
+
+
+def extract_terms(text: str) -> frozenset[str]:
+    """Return the lowercased terms used for retrieval scoring."""
+
+    return frozenset(TERM_PATTERN.findall(text.lower()))
+
+
+def pack_terms(terms: Iterable[str]) -> str:
+    """Serialize a term set for the ``Insight.terms`` column."""
+
+    return " ".join(sorted(terms))
+
+
+def unpack_terms(packed: str) -> frozenset[str]:
+    return frozenset(packed.split())
+
+
+def stored_terms(insight: Insight) -> frozenset[str]:
+    """Return an insight's persisted terms, tokenizing only rows not yet backfilled."""
+
+    if insight.terms is not None:
+        return unpack_terms(insight.terms)
+    return extract_terms(insight.summary or "")
+
+
+def insight_columns(analysis: Dict[str, float | str]) -> Dict[str, float | str | int | None]:
+    """Map an analysis result onto ``Insight`` column values."""
+
+    return {
+        "intent": analysis["intent"],
+        "sentiment": analysis["sentiment"],
+        "risk_score": float(analysis["risk_score"]),
+        "confidence": float(analysis.get("confidence", 0.65)),
+        "summary": analysis["summary"],
+        "keywords": analysis.get("keywords"),
+        "terms": analysis.get("terms"),
+        "term_count": analysis.get("term_count"),
+    }
@@ -0,0 +1,213 @@
+"""In-process background queue that scores interactions outside the request.
+
+Work items are persisted in the ``pending_analysis`` table in the same
+transaction as their interaction, so nothing is lost across restarts: on
+start-up the queue re-reads every pending row. The in-memory queue is bounded;
+when it is full new items stay in the table only and are picked up again once
+the workers have drained the backlog.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Callable, Dict, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models import Insight, Interaction, PendingAnalysis
+from .analysis import InsightEngine, insight_columns
+from .rollups import RollupDelta
+
+MAX_ATTEMPTS = 3
+
+
+def analyze_pending(session: Session, interaction_id: int, engine: InsightEngine) -> Optional[int]:
+    """Score one queued interaction and clear its pending row.
+
+    Returns the interaction's account id, or ``None`` when there is nothing
+    left to do for the interaction. The caller commits.
+    """
+
+    pending = session.scalars(select(PendingAnalysis).where(PendingAnalysis.interaction_id == interaction_id)).first()
+    interaction = session.get(Interaction, interaction_id)
+    if pending is None or interaction is None:
+        return None
+
+    if interaction.insight is None:
+        analysis = engine.analyze(interaction.id, interaction.content)
+        insight = Insight(interaction_id=interaction.id, **insight_columns(analysis))
+        interaction.summary = insight.summary
+        session.add(insight)
+
+        rollup = RollupDelta()
+        rollup.add_insight(
+            interaction.account_id, interaction.id, insight.intent, insight.risk_score, insight.confidence
+        )
+        session.flush()
+        rollup.apply(session)
+
+    session.delete(pending)
+    return interaction.account_id
+
+
+class AnalysisQueue:
+    """Bounded worker pool draining the ``pending_analysis`` table."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        engine: InsightEngine,
+        workers: int = 2,
+        max_queued: int = 1000,
+        on_complete: Optional[Callable[[int], None]] = None,
+    ):
+        self.session_factory = session_factory
+        self.engine = engine
+        self.workers = max(1, workers)
+        self.max_queued = max(1, max_queued)
+        # Called with the account id after each committed analysis
+        self.on_complete = on_complete
+
+        self._queue: "queue.Queue[Optional[int]]" = queue.Queue(maxsize=self.max_queued)
+        self._known: Set[int] = set()
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._overflowed = False
+
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.deferred = 0
+        self._total_latency = 0.0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._threads)
+
+    def start(self) -> None:
+        """Start the workers and queue every interaction still pending in the database."""
+
+        if self.running:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"analysis-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        self._refill()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the workers; anything not yet processed stays in the table for next start."""
+
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        with self._lock:
+            self._known.clear()
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    def submit(self, interaction_id: int) -> bool:
+        """Queue an interaction whose pending row is committed.
+
+        Returns ``False`` when the queue is full (backpressure); the item is
+        then processed after the current backlog drains.
+        """
+
+        with self._lock:
+            if interaction_id in self._known:
+                return True
+            try:
+                self._queue.put_nowait(interaction_id)
+            except queue.Full:
+                self._overflowed = True
+                self.deferred += 1
+                return False
+            self._known.add(interaction_id)
+            return True
+
+    def metrics(self) -> Dict[str, float | int | bool]:
+        with self._lock:
+            processed = self.completed + self.failed
+            return {
+                "running": self.running,
+                "workers": self.workers,
+                "capacity": self.max_queued,
+                "queued": self._queue.qsize(),
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "failed": self.failed,
+                "deferred": self.deferred,
+                "avg_processing_ms": round(self._total_latency / processed * 1000, 2) if processed else 0.0,
+            }
+
+    def _work(self) -> None:
+        while True:
+            interaction_id = self._queue.get()
+            if interaction_id is None:
+                return
+            with self._lock:
+                self.in_flight += 1
+            started = time.perf_counter()
+            succeeded = self._process(interaction_id)
+            with self._lock:
+                self.in_flight -= 1
+                self._known.discard(interaction_id)
+                self._total_latency += time.perf_counter() - started
+                if succeeded:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+                refill = self._overflowed and self._queue.qsize() <= self.max_queued // 2
+                if refill:
+                    self._overflowed = False
+            if refill:
+                self._refill()
+
+    def _process(self, interaction_id: int) -> bool:
+        with self.session_factory() as session:
+            try:
+                account_id = analyze_pending(session, interaction_id, self.engine)
+                session.commit()
+            except Exception as exc:  # noqa: BLE001 - keep the worker alive, record the failure
+                session.rollback()
+                error = f"{exc.__class__.__name__}: {exc}"
+            else:
+                if account_id is not None and self.on_complete is not None:
+                    self.on_complete(account_id)
+                return True
+
+        with self.session_factory() as session:
+            pending = session.scalars(
+                select(PendingAnalysis).where(PendingAnalysis.interaction_id == interaction_id)
+            ).first()
+            if pending is not None:
+                pending.attempts += 1
+                pending.last_error = error
+                session.commit()
+                if pending.attempts < MAX_ATTEMPTS:
+                    # Picked up again by the next refill
+                    with self._lock:
+                        self._overflowed = True
+        return False
+
+    def _refill(self) -> None:
+        """Queue pending rows from the table until the in-memory queue is full."""
+
+        with self.session_factory() as session:
+            interaction_ids = session.scalars(
+                select(PendingAnalysis.interaction_id)
+                .where(PendingAnalysis.attempts < MAX_ATTEMPTS)
+                .order_by(PendingAnalysis.id)
+                .limit(self.max_queued + 1)
+            ).all()
+        for interaction_id in interaction_ids[: self.max_queued]:
+            if not self.submit(interaction_id):
+                break
+        if len(interaction_ids) > self.max_queued:
+            with self._lock:
+                self._overflowed = True
@@ -0,0 +1,294 @@
+"""Seeded synthetic dataset generator for load testing.
+
+Produces accounts, contacts, interactions and expected insights in the demo
+file layout, so the output can be loaded through the seed path by pointing the
+``DEMO_DATA_*`` settings at it. Account sizes follow a Zipf distribution (a
+few accounts hold most interactions, as in production), the intent mix is
+configurable and timestamps are spread over several years. Records are
+streamed straight to disk, so memory stays flat from 10^3 to 10^7
+interactions; only per-account lookup tables are held.
+
+Usage::
+
+    python -m backend.app.services.datagen --interactions 1000000 --format ndjson --output-dir backend_data/synthetic
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import itertools
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .datasets import FORMATS, TableWriter, dataset_path
+
+DEFAULT_END = datetime(2025, 1, 1)
+
+# Share of interactions per intent when no --intent-mix is given
+DEFAULT_INTENT_MIX: Dict[str, float] = {
+    "support_request": 0.30,
+    "pricing_inquiry": 0.15,
+    "upgrade_inquiry": 0.10,
+    "expansion_inquiry": 0.10,
+    "churn_risk": 0.10,
+    "feature_request": 0.15,
+    "product_feedback": 0.10,
+}
+
+# Ground-truth sentiment and risk per intent, as in the hand-labelled demo data
+INTENT_LABELS: Dict[str, tuple[str, float]] = {
+    "support_request": ("negative", 0.7),
+    "pricing_inquiry": ("neutral", 0.5),
+    "upgrade_inquiry": ("positive", 0.1),
+    "expansion_inquiry": ("positive", 0.2),
+    "churn_risk": ("negative", 0.9),
+    "feature_request": ("positive", 0.3),
+    "product_feedback": ("neutral", 0.3),
+}
+
+# Sentences carrying each intent's keywords; the filler below avoids all of them
+INTENT_SENTENCES: Dict[str, List[str]] = {
+    "support_request": [
+        "We keep getting an error when we {task}.",
+        "There is a technical issue with the {module} screen since this morning.",
+        "Could your support team help us sort this out today?",
+        "It looks like a bug in {module} is blocking our crews.",
+    ],
+    "pricing_inquiry": [
+        "Could you send a quote for {count} more users?",
+        "Our latest invoice shows a charge we do not recognise.",
+        "What would the pricing be on an annual plan?",
+        "Can you explain the billing for the {module} module?",
+    ],
+    "upgrade_inquiry": [
+        "We are ready to upgrade to the Professional plan.",
+        "The advanced reporting would save our office hours every week.",
+        "Which add-on covers {module} for our team?",
+        "We heard about the new features in {module} and want them.",
+    ],
+    "expansion_inquiry": [
+        "We are opening a new location in {city} next quarter.",
+        "We plan to expand to {count} more crews this year.",
+        "We are hiring {count} technicians and need to scale our scheduling.",
+    ],
+    "churn_risk": [
+        "We are seriously considering whether to cancel our subscription.",
+        "The team is frustrated with how {module} has been working.",
+        "A competitor made us an offer and we may switch next month.",
+        "Please process a refund for last month.",
+    ],
+    "feature_request": [
+        "Is a {module} export on your roadmap?",
+        "We have a feature request for the {module} screen.",
+        "An enhancement to {module} would save our dispatcher hours.",
+    ],
+    "product_feedback": [
+        "Some feedback on the new {module} layout from our crews.",
+        "One suggestion: show the {module} totals on the home screen.",
+        "We noticed a real improvement in {module} after the last release.",
+    ],
+}
+FILLER_SENTENCES = [
+    "Thanks for getting back to us so quickly.",
+    "We run {count} crews across {city} during the busy season.",
+    "Our office manager reviewed the schedule this morning.",
+    "Most of our jobs are residential, with a few commercial contracts.",
+    "We have been with you for about {count} months now.",
+    "Let me know if a call works better than email.",
+]
+CHANNELS = ["email", "email", "call", "chat", "meeting"]
+CITIES = ["Austin", "Denver", "Calgary", "Tampa", "Portland", "Columbus", "Raleigh", "Phoenix", "Halifax", "Boise"]
+MODULES = ["scheduling", "invoicing", "quoting", "dispatch", "timesheets", "client hub", "routing", "reports"]
+TASKS = ["sync the calendar", "send a quote", "close out a job", "export timesheets", "assign a visit"]
+INDUSTRIES = ["landscaping", "plumbing", "cleaning", "pressure_washing", "hvac", "electrical", "roofing", "painting"]
+NAME_PREFIXES = ["Sunshine", "QuickFix", "Elite", "PowerWash", "City", "Summit", "Evergreen", "Bright", "Prime", "Coastal"]
+NAME_SUFFIXES = ["Services", "Pros", "Solutions", "Co", "Group", "Crew", "Works"]
+FIRST_NAMES = ["Maria", "James", "Mike", "Sarah", "Robert", "Lisa", "Priya", "Omar", "Chen", "Ava", "Noah", "Zoe"]
+LAST_NAMES = ["Rodriguez", "Thompson", "Chen", "Williams", "Davis", "Johnson", "Patel", "Nguyen", "Kowalski", "Brown"]
+ROLES = ["Owner", "Operations Manager", "Office Manager", "General Manager", "Dispatcher"]
+
+
+@dataclass
+class GeneratorConfig:
+    interactions: int = 1_000
+    accounts: Optional[int] = None
+    seed: int = 42
+    intent_mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_INTENT_MIX))
+    zipf_exponent: float = 1.1
+    years: float = 3.0
+    end: datetime = DEFAULT_END
+    max_contacts: int = 3
+
+    @property
+    def account_count(self) -> int:
+        # Roughly fifty interactions per account unless told otherwise
+        return self.accounts or max(1, self.interactions // 50)
+
+
+def parse_intent_mix(value: str) -> Dict[str, float]:
+    """Parse ``intent=weight,...``; weights are relative and need not sum to one."""
+
+    mix: Dict[str, float] = {}
+    for part in value.split(","):
+        if not part.strip():
+            continue
+        intent, _, weight = part.partition("=")
+        intent = intent.strip()
+        if intent not in INTENT_SENTENCES:
+            raise ValueError(f"Unknown intent {intent!r}; expected one of {', '.join(INTENT_SENTENCES)}")
+        mix[intent] = float(weight)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("The intent mix needs at least one positive weight")
+    return mix
+
+
+def _fill(template: str, rng: random.Random) -> str:
+    return template.format(
+        task=rng.choice(TASKS),
+        module=rng.choice(MODULES),
+        city=rng.choice(CITIES),
+        count=rng.randint(2, 24),
+    )
+
+
+def compose_content(intent: str, rng: random.Random, contact_name: str, account_name: str) -> str:
+    sentences = [_fill(template, rng) for template in rng.sample(INTENT_SENTENCES[intent], rng.randint(1, 2))]
+    sentences += [_fill(template, rng) for template in rng.sample(FILLER_SENTENCES, rng.randint(1, 3))]
+    rng.shuffle(sentences)
+    return f"Hi team,\n\n{' '.join(sentences)}\n\n{contact_name}\n{account_name}"
+
+
+def generate_dataset(config: GeneratorConfig, output_dir: Path, fmt: str = "csv") -> Dict[str, Path]:
+    """Write the four dataset tables to ``output_dir`` and return their paths."""
+
+    rng = random.Random(config.seed)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = {table: dataset_path(output_dir, table, fmt) for table in ("accounts", "contacts", "interactions", "expected_insights")}
+    account_count = config.account_count
+    start = config.end - timedelta(days=365 * config.years)
+
+    # Per-account lookups: name, first contact id and contact names
+    account_names: List[str] = []
+    contact_offsets: List[int] = []
+    contact_names: List[List[str]] = []
+    with TableWriter(paths["accounts"], "accounts", fmt) as accounts, TableWriter(
+        paths["contacts"], "contacts", fmt
+    ) as contacts:
+        contact_id = 0
+        for account_id in range(1, account_count + 1):
+            name = f"{rng.choice(NAME_PREFIXES)} {rng.choice(INDUSTRIES).replace('_', ' ').title()} {rng.choice(NAME_SUFFIXES)}"
+            if account_id > len(NAME_PREFIXES):
+                name = f"{name} {account_id}"
+            account_names.append(name)
+            accounts.write(
+                {
+                    "id": account_id,
+                    "name": name,
+                    "industry": rng.choice(INDUSTRIES),
+                    "status": "active" if rng.random() < 0.95 else "paused",
+                    "created_at": start - timedelta(days=rng.randint(0, 365)),
+                }
+            )
+            contact_offsets.append(contact_id + 1)
+            names = []
+            for _ in range(rng.randint(1, config.max_contacts)):
+                contact_id += 1
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                names.append(f"{first} {last}")
+                contacts.write(
+                    {
+                        "id": contact_id,
+                        "account_id": account_id,
+                        "name": f"{first} {last}",
+                        "email": f"{first.lower()}.{last.lower()}{contact_id}@example.com",
+                        "role": rng.choice(ROLES),
+                        "created_at": start - timedelta(days=rng.randint(0, 180)),
+                    }
+                )
+            contact_names.append(names)
+
+    # Zipf over account ranks, with ranks shuffled so large accounts are spread across ids
+    cumulative = list(itertools.accumulate(1 / rank**config.zipf_exponent for rank in range(1, account_count + 1)))
+    account_by_rank = list(range(1, account_count + 1))
+    rng.shuffle(account_by_rank)
+    intents = list(config.intent_mix)
+    intent_cumulative = list(itertools.accumulate(config.intent_mix[intent] for intent in intents))
+    span_seconds = int((config.end - start).total_seconds())
+
+    with TableWriter(paths["interactions"], "interactions", fmt) as interactions, TableWriter(
+        paths["expected_insights"], "expected_insights", fmt
+    ) as expected:
+        for interaction_id in range(1, config.interactions + 1):
+            rank = bisect.bisect_left(cumulative, rng.random() * cumulative[-1])
+            account_id = account_by_rank[min(rank, account_count - 1)]
+            intent = intents[
+                min(bisect.bisect_left(intent_cumulative, rng.random() * intent_cumulative[-1]), len(intents) - 1)
+            ]
+            names = contact_names[account_id - 1]
+            contact_index = rng.randrange(len(names))
+            # Business hours on a uniformly drawn day
+            day = start + timedelta(seconds=rng.randrange(span_seconds))
+            timestamp = day.replace(hour=rng.randint(7, 18), minute=rng.randint(0, 59), second=rng.randint(0, 59))
+            interactions.write(
+                {
+                    "id": interaction_id,
+                    "account_id": account_id,
+                    "contact_id": contact_offsets[account_id - 1] + contact_index,
+                    "channel": rng.choice(CHANNELS),
+                    "content": compose_content(intent, rng, names[contact_index], account_names[account_id - 1]),
+                    "timestamp": timestamp,
+                }
+            )
+            sentiment, risk = INTENT_LABELS[intent]
+            expected.write(
+                {
+                    "interaction_id": interaction_id,
+                    "expected_intent": intent,
+                    "expected_sentiment": sentiment,
+                    "expected_risk_score": risk,
+                }
+            )
+
+    return paths
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a seeded synthetic JourneyLens dataset.")
+    parser.add_argument("--interactions", type=int, default=1_000, help="Interactions to generate (default: 1000)")
+    parser.add_argument("--accounts", type=int, default=None, help="Accounts to generate (default: interactions / 50)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed; the same seed yields the same dataset")
+    parser.add_argument("--intent-mix", type=parse_intent_mix, default=None, help="e.g. churn_risk=0.2,support_request=0.8")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent of account sizes (default: 1.1)")
+    parser.add_argument("--years", type=float, default=3.0, help="Years of history to spread timestamps over")
+    parser.add_argument("--end", type=datetime.fromisoformat, default=DEFAULT_END, help="Latest timestamp (ISO date)")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="csv", help="Output format (default: csv)")
+    parser.add_argument("--output-dir", type=Path, default=Path("backend_data/synthetic"), help="Output directory")
+    args = parser.parse_args(argv)
+
+    config = GeneratorConfig(
+        interactions=max(1, args.interactions),
+        accounts=args.accounts,
+        seed=args.seed,
+        intent_mix=args.intent_mix or dict(DEFAULT_INTENT_MIX),
+        zipf_exponent=args.zipf,
+        years=args.years,
+        end=args.end,
+    )
+    paths = generate_dataset(config, args.output_dir, args.format)
+    print(f"Wrote {config.interactions} interactions for {config.account_count} accounts to {args.output_dir}")
+    print("Load them through the seed path with:")
+    for table, setting in (
+        ("accounts", "DEMO_DATA_ACCOUNTS"),
+        ("contacts", "DEMO_DATA_CONTACTS"),
+        ("interactions", "DEMO_DATA_INTERACTIONS"),
+        ("expected_insights", "DEMO_DATA_EXPECTED"),
+    ):
+        print(f"  {setting}={paths[table].resolve()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Readers and writers for demo dataset files in CSV, NDJSON or Parquet.
+
+Every table is streamed record by record (Parquet in row batches), so
+datasets of any size are written and read in constant memory. File names
+follow the ``demo_<table>.<ext>`` convention of the bundled demo CSVs, so a
+generated dataset can be pointed at with the ``DEMO_DATA_*`` settings.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+FORMATS = {"csv": "csv", "ndjson": "ndjson", "parquet": "parquet"}
+PARQUET_BATCH_SIZE = 50_000
+
+# Column name -> logical type, in file column order
+TABLES: Dict[str, Dict[str, str]] = {
+    "accounts": {"id": "int", "name": "str", "industry": "str", "status": "str", "created_at": "datetime"},
+    "contacts": {
+        "id": "int",
+        "account_id": "int",
+        "name": "str",
+        "email": "str",
+        "role": "str",
+        "created_at": "datetime",
+    },
+    "interactions": {
+        "id": "int",
+        "account_id": "int",
+        "contact_id": "int",
+        "channel": "str",
+        "content": "str",
+        "timestamp": "datetime",
+    },
+    "expected_insights": {
+        "interaction_id": "int",
+        "expected_intent": "str",
+        "expected_sentiment": "str",
+        "expected_risk_score": "float",
+    },
+}
+
+
+def dataset_path(directory: Path, table: str, fmt: str = "csv") -> Path:
+    return directory / f"demo_{table}.{FORMATS[fmt]}"
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as exc:  # pragma: no cover - depends on the environment
+        raise RuntimeError("Parquet support requires pyarrow: pip install pyarrow") from exc
+    return pyarrow
+
+
+class TableWriter:
+    """Stream records of one table to a CSV, NDJSON or Parquet file."""
+
+    def __init__(self, path: Path, table: str, fmt: str):
+        self.path = path
+        self.columns = TABLES[table]
+        self.fmt = fmt
+        self._handle = None
+        self._writer = None
+        self._batch: List[Dict[str, Any]] = []
+
+    def __enter__(self) -> "TableWriter":
+        if self.fmt == "parquet":
+            pa = _import_pyarrow()
+            types = {"int": pa.int64(), "str": pa.string(), "float": pa.float64(), "datetime": pa.timestamp("us")}
+            self._schema = pa.schema([(name, types[kind]) for name, kind in self.columns.items()])
+            self._writer = pa.parquet.ParquetWriter(self.path, self._schema)
+        else:
+            self._handle = self.path.open("w", encoding="utf-8", newline="")
+            if self.fmt == "csv":
+                self._writer = csv.DictWriter(self._handle, fieldnames=list(self.columns))
+                self._writer.writeheader()
+        return self
+
+    def write(self, record: Dict[str, Any]) -> None:
+        if self.fmt == "csv":
+            self._writer.writerow(
+                {key: value.isoformat() if isinstance(value, datetime) else value for key, value in record.items()}
+            )
+        elif self.fmt == "ndjson":
+            self._handle.write(json.dumps(record, default=datetime.isoformat, ensure_ascii=False) + "\n")
+        else:
+            self._batch.append(record)
+            if len(self._batch) >= PARQUET_BATCH_SIZE:
+                self._flush()
+
+    def _flush(self) -> None:
+        if self._batch:
+            pa = _import_pyarrow()
+            self._writer.write_table(pa.Table.from_pylist(self._batch, schema=self._schema))
+            self._batch = []
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self.fmt == "parquet":
+            self._flush()
+            self._writer.close()
+        else:
+            self._handle.close()
+
+
+def iter_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield the records of a dataset file; the format follows the file extension.
+
+    CSV values are strings (empty cells become ``None``); NDJSON and Parquet
+    keep their native types.
+    """
+
+    suffix = path.suffix.lower()
+    if suffix == ".parquet":
+        parquet = _import_pyarrow().parquet
+        for batch in parquet.ParquetFile(path).iter_batches(batch_size=PARQUET_BATCH_SIZE):
+            yield from batch.to_pylist()
+    elif suffix in (".ndjson", ".jsonl"):
+        with path.open("r", encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with path.open("r", encoding="utf-8", newline="") as fh:
+            for row in csv.DictReader(fh):
+                yield {key: (value if value != "" else None) for key, value in row.items()}
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """Accept ``datetime`` values (Parquet) as well as ISO strings (CSV, NDJSON)."""
+
+    if isinstance(value, datetime):
+        return value
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
@@ -0,0 +1,228 @@
+"""Bulk ingest of interaction records from NDJSON or CSV streams.
+
+Records are parsed lazily from a binary stream, analysed and written in
+chunks (one transaction each), and a per-record result is emitted for every
+input row, so memory use does not grow with the size of the upload.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import UTC, datetime
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .. import schemas
+from ..models import Account, Insight, Interaction
+from .analysis import InsightEngine, insight_columns
+from .rollups import RollupDelta
+
+NDJSON_MEDIA_TYPES = {"application/x-ndjson", "application/jsonl", "application/json-seq"}
+CSV_MEDIA_TYPES = {"text/csv", "application/csv"}
+
+# (1-based row number, parsed record or None, error message or None)
+ParsedRow = Tuple[int, Dict[str, Any] | None, str | None]
+
+
+class IterStream(io.RawIOBase):
+    """Expose an iterator of byte chunks as a readable binary stream."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            try:
+                self._pending = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def iter_ndjson_records(stream: IO[bytes]) -> Iterator[ParsedRow]:
+    """Yield one parsed record per non-blank NDJSON line."""
+
+    for row_number, raw_line in enumerate(stream, start=1):
+        # Lines are decoded one at a time so a bad byte only costs its own row
+        try:
+            line = raw_line.decode("utf-8")
+        except UnicodeDecodeError as exc:
+            yield row_number, None, f"Invalid UTF-8: {exc.reason}"
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield row_number, None, f"Invalid JSON: {exc.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield row_number, None, "Expected a JSON object"
+            continue
+        yield row_number, record, None
+
+
+def iter_csv_records(stream: IO[bytes]) -> Iterator[ParsedRow]:
+    """Yield one record per CSV row; the header names the interaction fields.
+
+    A line that is not UTF-8 or not valid CSV ends the stream with an error
+    row, since quoted fields make it impossible to tell where the next row starts.
+    """
+
+    reader = csv.DictReader(line.decode("utf-8") for line in stream)
+    row_number = 0
+    try:
+        for row_number, row in enumerate(reader, start=1):
+            # Empty cells mean "not provided" so optional fields fall back to defaults
+            yield row_number, {key: value for key, value in row.items() if key and value not in ("", None)}, None
+    except UnicodeDecodeError as exc:
+        yield row_number + 1, None, f"Invalid UTF-8: {exc.reason}; the rest of the upload was not read"
+    except csv.Error as exc:
+        yield row_number + 1, None, f"Invalid CSV: {exc}; the rest of the upload was not read"
+
+
+def _chunked(rows: Iterable[ParsedRow], size: int) -> Iterator[List[ParsedRow]]:
+    chunk: List[ParsedRow] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def ingest_records(
+    session: Session,
+    rows: Iterable[ParsedRow],
+    engine: InsightEngine,
+    chunk_size: int = 1000,
+    on_commit: Optional[Callable[[Set[int]], None]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Validate, analyse and persist records chunk by chunk.
+
+    Yields one result per input row, in input order. Each chunk is committed
+    before its results are yielded; invalid rows are reported and skipped
+    without affecting the rest of their chunk. ``on_commit`` receives the
+    ids of the accounts written by each committed chunk.
+    """
+
+    for chunk in _chunked(rows, chunk_size):
+        results: Dict[int, Dict[str, Any]] = {}
+        valid: List[Tuple[int, schemas.InteractionCreate]] = []
+        for row_number, record, error in chunk:
+            if error is not None:
+                results[row_number] = {"row": row_number, "status": "error", "detail": error}
+                continue
+            try:
+                valid.append((row_number, schemas.InteractionCreate.model_validate(record)))
+            except ValidationError as exc:
+                results[row_number] = {"row": row_number, "status": "error", "detail": _describe(exc)}
+
+        known_accounts = set(
+            session.scalars(select(Account.id).where(Account.id.in_({payload.account_id for _, payload in valid})))
+        )
+        accepted = []
+        for row_number, payload in valid:
+            if payload.account_id in known_accounts:
+                accepted.append((row_number, payload))
+            else:
+                results[row_number] = {"row": row_number, "status": "error", "detail": "Invalid account_id"}
+
+        if accepted:
+            try:
+                written = _write_chunk(session, accepted, engine)
+                session.commit()
+                if on_commit is not None:
+                    on_commit({payload.account_id for _, payload in accepted})
+            except SQLAlchemyError as exc:
+                session.rollback()
+                detail = f"Database error: {exc.__class__.__name__}"
+                written = [{"row": row_number, "status": "error", "detail": detail} for row_number, _ in accepted]
+            for result in written:
+                results[result["row"]] = result
+
+        for row_number, _, _ in chunk:
+            yield results[row_number]
+
+
+def _write_chunk(
+    session: Session,
+    accepted: List[Tuple[int, schemas.InteractionCreate]],
+    engine: InsightEngine,
+) -> List[Dict[str, Any]]:
+    now = datetime.now(UTC)
+    analyses = engine.analyze_many((None, payload.content) for _, payload in accepted)
+
+    interaction_ids = _insert_returning_ids(
+        session,
+        Interaction,
+        [
+            {
+                "account_id": payload.account_id,
+                "contact_id": payload.contact_id,
+                "channel": payload.channel,
+                "content": payload.content,
+                "summary": analysis["summary"],
+                "timestamp": payload.timestamp or now,
+            }
+            for (_, payload), analysis in zip(accepted, analyses)
+        ],
+    )
+
+    insight_rows = [
+        {"interaction_id": interaction_id, **insight_columns(analysis)}
+        for interaction_id, analysis in zip(interaction_ids, analyses)
+    ]
+    insight_ids = _insert_returning_ids(session, Insight, insight_rows)
+
+    rollup = RollupDelta()
+    results = []
+    for (row_number, payload), interaction_id, insight_id, values in zip(
+        accepted, interaction_ids, insight_ids, insight_rows
+    ):
+        rollup.add_interaction(payload.account_id, payload.timestamp or now)
+        rollup.add_insight(
+            payload.account_id, interaction_id, values["intent"], values["risk_score"], values["confidence"]
+        )
+        results.append(
+            {
+                "row": row_number,
+                "status": "created",
+                "interaction_id": interaction_id,
+                "insight_id": insight_id,
+                "intent": values["intent"],
+                "sentiment": values["sentiment"],
+                "risk_score": values["risk_score"],
+            }
+        )
+    rollup.apply(session)
+    return results
+
+
+def _insert_returning_ids(session: Session, model: type, rows: List[Dict[str, Any]]) -> List[int]:
+    """Insert ``rows`` in one batch and return the new ids in parameter order."""
+
+    if session.get_bind().dialect.name == "sqlite":
+        # SQLite cannot order RETURNING rows, so sort_by_parameter_order would fall back to
+        # one INSERT per row. Under SQLite's single writer lock new rowids ascend in
+        # parameter order, so sorting the returned ids restores that order.
+        return sorted(session.scalars(insert(model).returning(model.id), rows).all())
+    return list(session.scalars(insert(model).returning(model.id, sort_by_parameter_order=True), rows).all())
+
+
+def _describe(exc: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors())
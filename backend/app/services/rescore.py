@@ -0,0 +1,219 @@
+"""Re-run the insight heuristics over interactions that are already stored.
+
+Usage::
+
+    python -m backend.app.services.rescore --workers 4 --chunk-size 2000
+
+Interactions are read in primary-key order, analysed in a process pool and
+their insights upserted one chunk per transaction. The last committed
+interaction id is written to a checkpoint file so an interrupted run picks up
+where it stopped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models import Insight, Interaction
+from .analysis import InsightEngine, insight_columns
+from .rollups import RollupDelta
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_CHECKPOINT = Path("backend_data/rescore.checkpoint.json")
+
+Row = Tuple[int, str]
+
+_engine = InsightEngine()
+
+
+def analyze_chunk(rows: Sequence[Row]) -> List[Tuple[int, Dict[str, float | str]]]:
+    """Analyze a chunk of ``(interaction_id, content)`` rows.
+
+    Module level so it can be pickled into worker processes.
+    """
+
+    return list(zip((interaction_id for interaction_id, _ in rows), _engine.analyze_many(rows)))
+
+
+def iter_interaction_chunks(
+    session: Session,
+    chunk_size: int,
+    after_id: int = 0,
+    since: Optional[datetime] = None,
+) -> Iterator[List[Row]]:
+    """Yield interaction rows in primary-key chunks using keyset pagination."""
+
+    last_id = after_id
+    while True:
+        stmt = select(Interaction.id, Interaction.content).where(Interaction.id > last_id)
+        if since is not None:
+            stmt = stmt.where(Interaction.timestamp >= since)
+        rows = [tuple(row) for row in session.execute(stmt.order_by(Interaction.id).limit(chunk_size))]
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield rows
+
+
+def upsert_insights(session: Session, results: Sequence[Tuple[int, Dict[str, float | str]]]) -> None:
+    """Insert or update the insight of each analysed interaction in bulk.
+
+    The account risk rollups and evaluation totals are adjusted in the same transaction.
+    """
+
+    if not results:
+        return
+
+    interaction_ids = [interaction_id for interaction_id, _ in results]
+    current = {
+        interaction_id: (account_id, insight_id, intent, risk_score, confidence)
+        for interaction_id, account_id, insight_id, intent, risk_score, confidence in session.execute(
+            select(
+                Interaction.id,
+                Interaction.account_id,
+                Insight.id,
+                Insight.intent,
+                Insight.risk_score,
+                Insight.confidence,
+            )
+            .outerjoin(Insight, Insight.interaction_id == Interaction.id)
+            .where(Interaction.id.in_(interaction_ids))
+        )
+    }
+
+    rollup = RollupDelta()
+    inserts: list[dict] = []
+    updates: list[dict] = []
+    for interaction_id, analysis in results:
+        values = insight_columns(analysis)
+        account_id, insight_id, old_intent, old_risk, old_confidence = current[interaction_id]
+        if insight_id is not None:
+            updates.append({"id": insight_id, **values})
+            rollup.remove_insight(account_id, old_intent, old_risk, old_confidence)
+        else:
+            inserts.append({"interaction_id": interaction_id, **values})
+        rollup.add_insight(account_id, interaction_id, values["intent"], values["risk_score"], values["confidence"])
+
+    if updates:
+        session.execute(update(Insight), updates)
+    if inserts:
+        session.execute(insert(Insight), inserts)
+    session.execute(
+        update(Interaction),
+        [{"id": interaction_id, "summary": analysis["summary"]} for interaction_id, analysis in results],
+    )
+    rollup.apply(session)
+
+
+def rescore_interactions(
+    session_factory: Callable[[], Session],
+    *,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    since: Optional[datetime] = None,
+    checkpoint: Optional[Path] = None,
+) -> int:
+    """Re-analyse stored interactions and return how many were rescored.
+
+    With ``workers`` of one or less the analysis runs in-process; otherwise
+    chunks are fanned out to a process pool while the main process keeps
+    reading and writing. Results are committed in primary-key order so the
+    checkpoint always marks a fully persisted prefix.
+    """
+
+    after_id = _read_checkpoint(checkpoint, since)
+    processed = 0
+
+    with session_factory() as reader, session_factory() as writer:
+        chunks = iter_interaction_chunks(reader, chunk_size, after_id=after_id, since=since)
+
+        def persist(results: List[Tuple[int, Dict[str, float | str]]]) -> None:
+            nonlocal processed
+            upsert_insights(writer, results)
+            writer.commit()
+            processed += len(results)
+            _write_checkpoint(checkpoint, results[-1][0], since)
+
+        if workers <= 1:
+            for rows in chunks:
+                persist(analyze_chunk(rows))
+            return processed
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending: Deque[Future] = deque()
+            for rows in chunks:
+                pending.append(pool.submit(analyze_chunk, rows))
+                # Bound the number of in-flight chunks so memory stays flat
+                if len(pending) >= workers * 2:
+                    persist(pending.popleft().result())
+            while pending:
+                persist(pending.popleft().result())
+
+    return processed
+
+
+def _read_checkpoint(path: Optional[Path], since: Optional[datetime]) -> int:
+    if path is None or not path.exists():
+        return 0
+    state = json.loads(path.read_text(encoding="utf-8"))
+    # A checkpoint only applies to the run it was written for
+    if state.get("since") != (since.isoformat() if since else None):
+        return 0
+    return int(state.get("last_id", 0))
+
+
+def _write_checkpoint(path: Optional[Path], last_id: int, since: Optional[datetime]) -> None:
+    if path is None:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(
+        json.dumps({"last_id": last_id, "since": since.isoformat() if since else None}),
+        encoding="utf-8",
+    )
+    tmp_path.replace(path)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Re-run insight analysis over stored interactions.")
+    parser.add_argument("--workers", type=int, default=1, help="Analyzer processes to run (default: 1)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Interactions per chunk")
+    parser.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        default=None,
+        help="Only rescore interactions at or after this ISO timestamp",
+    )
+    parser.add_argument("--checkpoint", type=Path, default=DEFAULT_CHECKPOINT, help="Checkpoint file path")
+    parser.add_argument("--restart", action="store_true", help="Ignore any existing checkpoint")
+    args = parser.parse_args(argv)
+
+    if args.restart and args.checkpoint.exists():
+        args.checkpoint.unlink()
+
+    processed = rescore_interactions(
+        SessionLocal,
+        workers=args.workers,
+        chunk_size=max(1, args.chunk_size),
+        since=args.since,
+        checkpoint=args.checkpoint,
+    )
+    print(f"Rescored {processed} interactions")
+
+    # A completed run leaves nothing to resume
+    if args.checkpoint.exists():
+        args.checkpoint.unlink()
+
+
+if __name__ == "__main__":
+    main()
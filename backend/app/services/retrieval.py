@@ -0,0 +1,180 @@
+"""In-memory inverted indexes over insight summaries for account RAG queries."""
+
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+from collections import OrderedDict, defaultdict
+from datetime import datetime
+from typing import AbstractSet, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import Select, case, func, select
+from sqlalchemy.orm import Session
+
+from ..models import Insight, Interaction
+from .analysis import extract_terms, stored_terms, unpack_terms
+
+# (newest insight id, newest insight update) for one account
+IndexStamp = Tuple[Optional[int], Optional[datetime]]
+
+
+class AccountIndex:
+    """Inverted index of one account's insight summaries.
+
+    Each insight keeps its term set and size so queries only touch the
+    posting lists of their own terms. Only insights with a summary belong in
+    the index, since the others are never returned as supporting evidence.
+    """
+
+    def __init__(self) -> None:
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+        self.terms: Dict[int, frozenset[str]] = {}
+        self.sizes: Dict[int, int] = {}
+        self.stamp: IndexStamp = (None, None)
+
+    def add(self, insight_id: int, terms: frozenset[str], size: Optional[int] = None) -> None:
+        """Index (or re-index) the summary terms of an insight."""
+
+        self.remove(insight_id)
+        self.terms[insight_id] = terms
+        self.sizes[insight_id] = len(terms) if size is None else size
+        for term in terms:
+            self.postings[term].add(insight_id)
+
+    def remove(self, insight_id: int) -> None:
+        for term in self.terms.pop(insight_id, ()):
+            posting = self.postings[term]
+            posting.discard(insight_id)
+            if not posting:
+                del self.postings[term]
+        self.sizes.pop(insight_id, None)
+
+    def search(self, query_terms: AbstractSet[str], limit: int = 3) -> List[int]:
+        """Return the ids of the ``limit`` best matching insights.
+
+        Scores are the cosine overlap used by ``InsightEngine.rag_answer`` and
+        ties fall back to insight id order. When fewer than ``limit`` insights
+        share a term with the query the remainder is filled with the oldest
+        insights, as the full ranking did.
+        """
+
+        overlaps: Dict[int, int] = defaultdict(int)
+        for term in query_terms:
+            for insight_id in self.postings.get(term, ()):
+                overlaps[insight_id] += 1
+
+        query_size = len(query_terms)
+        scored = (
+            (-overlap / math.sqrt(query_size * self.sizes[insight_id]), insight_id)
+            for insight_id, overlap in overlaps.items()
+        )
+        top_ids = [insight_id for _, insight_id in heapq.nsmallest(limit, scored)]
+
+        if len(top_ids) < limit:
+            matched = set(top_ids)
+            top_ids.extend(
+                heapq.nsmallest(
+                    limit - len(top_ids),
+                    (insight_id for insight_id in self.terms if insight_id not in matched),
+                )
+            )
+        return top_ids
+
+
+class InsightIndex:
+    """Per-account inverted indexes, built lazily and updated on write.
+
+    Indexes live in process memory, bounded to the ``max_accounts`` most
+    recently queried accounts. Before use, an index is checked against the
+    account's newest insight id and update and rebuilt when another process
+    (a second worker or the rescoring job) has changed them. Callers that
+    already read that stamp, as the RAG route's fingerprint does, pass it in.
+    """
+
+    def __init__(self, max_accounts: int = 256):
+        self.max_accounts = max_accounts
+        self._accounts: OrderedDict[int, AccountIndex] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def search(
+        self, db: Session, account_id: int, query: str, limit: int = 3, stamp: Optional[IndexStamp] = None
+    ) -> List[Insight]:
+        """Return the best matching insights of an account for ``query``."""
+
+        if stamp is None:
+            stamp = self._stamp(db, account_id)
+        with self._lock:
+            index = self._accounts.get(account_id)
+            if index is None or index.stamp != stamp:
+                index = self._build(db, account_id, stamp)
+                self._accounts[account_id] = index
+            self._accounts.move_to_end(account_id)
+            while len(self._accounts) > self.max_accounts:
+                self._accounts.popitem(last=False)
+            insight_ids = index.search(extract_terms(query), limit)
+
+        if not insight_ids:
+            return []
+        insights = {insight.id: insight for insight in db.scalars(select(Insight).where(Insight.id.in_(insight_ids)))}
+        return [insights[insight_id] for insight_id in insight_ids if insight_id in insights]
+
+    def add(self, account_id: int, insight: Insight) -> None:
+        """Fold a freshly persisted insight into an already built index."""
+
+        with self._lock:
+            index = self._accounts.get(account_id)
+            if index is None:
+                return
+            newest_id, newest_update = index.stamp
+            if insight.summary:
+                index.add(insight.id, stored_terms(insight), insight.term_count)
+            index.stamp = (
+                max(newest_id or 0, insight.id),
+                max(newest_update, insight.updated_at) if newest_update else insight.updated_at,
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._accounts.clear()
+
+    @staticmethod
+    def _stamp(db: Session, account_id: int) -> IndexStamp:
+        newest_id, newest_update = db.execute(stamp_query(account_id)).one()
+        return newest_id, newest_update
+
+    @staticmethod
+    def _build(db: Session, account_id: int, stamp: IndexStamp) -> AccountIndex:
+        index = AccountIndex()
+        rows = db.execute(terms_query(account_id))
+        for insight_id, packed, term_count, summary in rows:
+            if packed is None:
+                index.add(insight_id, extract_terms(summary))
+            else:
+                index.add(insight_id, unpack_terms(packed), term_count)
+        index.stamp = stamp
+        return index
+
+
+def stamp_query(account_id: int) -> Select:
+    """Newest insight id and update of an account; changes whenever its insights do."""
+
+    return (
+        select(func.max(Insight.id), func.max(Insight.updated_at))
+        .join(Interaction, Interaction.id == Insight.interaction_id)
+        .where(Interaction.account_id == account_id)
+    )
+
+
+def terms_query(account_id: int) -> Select:
+    return (
+        select(
+            Insight.id,
+            Insight.terms,
+            Insight.term_count,
+            # Only rows written before terms were persisted need their summary
+            case((Insight.terms.is_(None), Insight.summary)),
+        )
+        .join(Interaction, Interaction.id == Insight.interaction_id)
+        .where(Interaction.account_id == account_id, Insight.summary != "")
+    )
@@ -0,0 +1,386 @@
+"""Maintain the per-account risk rollups that back the CSM dashboard.
+
+Writers describe what they changed with a :class:`RollupDelta` and apply it
+inside their own transaction, so the rollups commit (or roll back) together
+with the interactions and insights they summarize. The same delta keeps the
+global evaluation totals and daily feedback counts behind
+``/evaluations/metrics`` up to date. Counters are updated with
+relative ``SET col = col + :delta`` statements so concurrent writers never
+overwrite each other's increments.
+
+Run ``python -m backend.app.services.rollups`` to rebuild every rollup from
+the raw insights and feedback, e.g. after a manual data fix.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Dict, Iterable, Optional, Type
+
+from sqlalchemy import Date, DateTime, Float, Integer, bindparam, case, delete, func, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models import (
+    EVALUATION_ROLLUP_ID,
+    AccountIntentCount,
+    AccountRiskRollup,
+    EvaluationRollup,
+    Feedback,
+    FeedbackDailyCount,
+    Insight,
+    Interaction,
+)
+
+APPLY_BATCH_SIZE = 500
+
+
+@dataclass
+class _AccountDelta:
+    risk_sum: float = 0.0
+    insight_count: int = 0
+    interaction_count: int = 0
+    last_interaction: Optional[datetime] = None
+    # intent -> [count delta, earliest interaction id added]
+    intents: Dict[str, list] = field(default_factory=dict)
+
+
+@dataclass
+class _EvaluationDelta:
+    interaction_count: int = 0
+    insight_count: int = 0
+    confidence_sum: float = 0.0
+    feedback_count: int = 0
+    positive_feedback_count: int = 0
+    # day -> [feedback count delta, positive count delta]
+    days: Dict[date, list] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.interaction_count or self.insight_count or self.confidence_sum or self.days)
+
+
+class RollupDelta:
+    """Accumulate rollup changes for a batch of writes and apply them together."""
+
+    def __init__(self) -> None:
+        self._accounts: Dict[int, _AccountDelta] = {}
+        self._evaluation = _EvaluationDelta()
+
+    def __bool__(self) -> bool:
+        return bool(self._accounts or self._evaluation)
+
+    def add_interaction(self, account_id: int, timestamp: Optional[datetime]) -> None:
+        delta = self._accounts.setdefault(account_id, _AccountDelta())
+        delta.interaction_count += 1
+        if timestamp is not None and (delta.last_interaction is None or timestamp > delta.last_interaction):
+            delta.last_interaction = timestamp
+        self._evaluation.interaction_count += 1
+
+    def add_insight(
+        self, account_id: int, interaction_id: int, intent: str, risk_score: float, confidence: float
+    ) -> None:
+        delta = self._accounts.setdefault(account_id, _AccountDelta())
+        delta.risk_sum += risk_score
+        delta.insight_count += 1
+        counter = delta.intents.setdefault(intent, [0, None])
+        counter[0] += 1
+        if counter[1] is None or interaction_id < counter[1]:
+            counter[1] = interaction_id
+        self._evaluation.insight_count += 1
+        self._evaluation.confidence_sum += confidence
+
+    def remove_insight(self, account_id: int, intent: str, risk_score: float, confidence: float) -> None:
+        """Retract an insight that is being replaced, e.g. by the rescoring job.
+
+        Counts and sums are exact, but an intent's earliest-interaction tie
+        breaker is not moved forward; a rebuild recomputes it exactly.
+        """
+
+        delta = self._accounts.setdefault(account_id, _AccountDelta())
+        delta.risk_sum -= risk_score
+        delta.insight_count -= 1
+        delta.intents.setdefault(intent, [0, None])[0] -= 1
+        self._evaluation.insight_count -= 1
+        self._evaluation.confidence_sum -= confidence
+
+    def add_feedback(self, rating: bool, day: date) -> None:
+        evaluation = self._evaluation
+        evaluation.feedback_count += 1
+        evaluation.positive_feedback_count += int(rating)
+        counts = evaluation.days.setdefault(day, [0, 0])
+        counts[0] += 1
+        counts[1] += int(rating)
+
+    def apply(self, session: Session) -> None:
+        """Write the accumulated changes through ``session`` and reset the delta."""
+
+        accounts, self._accounts = self._accounts, {}
+        account_ids = sorted(accounts)
+        for start in range(0, len(account_ids), APPLY_BATCH_SIZE):
+            batch = {account_id: accounts[account_id] for account_id in account_ids[start : start + APPLY_BATCH_SIZE]}
+            _apply_batch(session, batch)
+
+        evaluation, self._evaluation = self._evaluation, _EvaluationDelta()
+        if evaluation:
+            _apply_evaluation(session, evaluation)
+
+
+def _apply_batch(session: Session, accounts: Dict[int, _AccountDelta]) -> None:
+    connection = session.connection()
+    intent_rows = [
+        {"b_account_id": account_id, "b_intent": intent, "b_count": count, "b_first": first}
+        for account_id, delta in accounts.items()
+        for intent, (count, first) in delta.intents.items()
+    ]
+
+    _insert_missing(session, AccountRiskRollup, [{"account_id": account_id} for account_id in accounts])
+    _insert_missing(
+        session,
+        AccountIntentCount,
+        [{"account_id": row["b_account_id"], "intent": row["b_intent"], "count": 0} for row in intent_rows],
+    )
+
+    last = AccountRiskRollup.last_interaction
+    new_last = bindparam("b_last", type_=DateTime(timezone=True))
+    connection.execute(
+        update(AccountRiskRollup)
+        .where(AccountRiskRollup.account_id == bindparam("b_account_id"))
+        .values(
+            risk_sum=AccountRiskRollup.risk_sum + bindparam("b_risk_sum", type_=Float),
+            insight_count=AccountRiskRollup.insight_count + bindparam("b_insight_count", type_=Integer),
+            interaction_count=AccountRiskRollup.interaction_count + bindparam("b_interaction_count", type_=Integer),
+            last_interaction=case(
+                (new_last.is_(None), last),
+                (or_(last.is_(None), last < new_last), new_last),
+                else_=last,
+            ),
+        ),
+        [
+            {
+                "b_account_id": account_id,
+                "b_risk_sum": delta.risk_sum,
+                "b_insight_count": delta.insight_count,
+                "b_interaction_count": delta.interaction_count,
+                "b_last": delta.last_interaction,
+            }
+            for account_id, delta in accounts.items()
+        ],
+    )
+
+    if intent_rows:
+        first = AccountIntentCount.first_interaction_id
+        new_first = bindparam("b_first", type_=Integer)
+        connection.execute(
+            update(AccountIntentCount)
+            .where(
+                AccountIntentCount.account_id == bindparam("b_account_id"),
+                AccountIntentCount.intent == bindparam("b_intent"),
+            )
+            .values(
+                count=AccountIntentCount.count + bindparam("b_count", type_=Integer),
+                first_interaction_id=case(
+                    (new_first.is_(None), first),
+                    (or_(first.is_(None), first > new_first), new_first),
+                    else_=first,
+                ),
+            ),
+            intent_rows,
+        )
+        connection.execute(delete(AccountIntentCount).where(AccountIntentCount.count <= 0))
+
+    refresh_derived(session, list(accounts))
+
+
+def _apply_evaluation(session: Session, delta: _EvaluationDelta) -> None:
+    connection = session.connection()
+    # No row means the totals were never built (migration 5); the rebuild will count these writes too
+    connection.execute(
+        update(EvaluationRollup)
+        .where(EvaluationRollup.id == EVALUATION_ROLLUP_ID)
+        .values(
+            interaction_count=EvaluationRollup.interaction_count + delta.interaction_count,
+            insight_count=EvaluationRollup.insight_count + delta.insight_count,
+            confidence_sum=EvaluationRollup.confidence_sum + delta.confidence_sum,
+            feedback_count=EvaluationRollup.feedback_count + delta.feedback_count,
+            positive_feedback_count=EvaluationRollup.positive_feedback_count + delta.positive_feedback_count,
+        )
+    )
+
+    if not delta.days:
+        return
+    daily = (
+        update(FeedbackDailyCount)
+        .where(FeedbackDailyCount.day == bindparam("b_day"))
+        .values(
+            feedback_count=FeedbackDailyCount.feedback_count + bindparam("b_count", type_=Integer),
+            positive_count=FeedbackDailyCount.positive_count + bindparam("b_positive", type_=Integer),
+        )
+    )
+    rows = [{"b_day": day, "b_count": count, "b_positive": positive} for day, (count, positive) in delta.days.items()]
+    if len(rows) == 1 and connection.execute(daily, rows[0]).rowcount == 1:
+        # The usual case, feedback on a day that already has its row, costs one statement
+        return
+    _insert_missing(session, FeedbackDailyCount, [{"day": row["b_day"]} for row in rows])
+    connection.execute(daily, rows)
+
+
+def refresh_derived(session: Session, account_ids: Optional[Iterable[int]] = None) -> None:
+    """Recompute the average risk and dominant intent from the stored counters."""
+
+    dominant = (
+        select(AccountIntentCount.intent)
+        .where(AccountIntentCount.account_id == AccountRiskRollup.account_id)
+        .order_by(AccountIntentCount.count.desc(), AccountIntentCount.first_interaction_id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    stmt = update(AccountRiskRollup).values(
+        risk_score=case(
+            (AccountRiskRollup.insight_count > 0, AccountRiskRollup.risk_sum / AccountRiskRollup.insight_count),
+            else_=None,
+        ),
+        dominant_intent=dominant,
+    )
+    if account_ids is not None:
+        stmt = stmt.where(AccountRiskRollup.account_id.in_(list(account_ids)))
+    session.connection().execute(stmt)
+
+
+def rebuild_rollups(session: Session, account_ids: Optional[Iterable[int]] = None) -> int:
+    """Recompute the rollups of ``account_ids`` (default: every account); return the row count.
+
+    Each account's rows are replaced as a whole, so rebuilding a batch of
+    accounts while writers keep incrementing the others stays exact.
+    """
+
+    connection = session.connection()
+    rollup_scope, intent_scope, interaction_scope = [], [], []
+    if account_ids is not None:
+        account_ids = list(account_ids)
+        rollup_scope = [AccountRiskRollup.account_id.in_(account_ids)]
+        intent_scope = [AccountIntentCount.account_id.in_(account_ids)]
+        interaction_scope = [Interaction.account_id.in_(account_ids)]
+    connection.execute(delete(AccountIntentCount).where(*intent_scope))
+    connection.execute(delete(AccountRiskRollup).where(*rollup_scope))
+
+    interaction_stats = session.execute(
+        select(Interaction.account_id, func.count(Interaction.id), func.max(Interaction.timestamp))
+        .where(*interaction_scope)
+        .group_by(Interaction.account_id)
+    ).all()
+    insight_stats = {
+        account_id: (risk_sum, insight_count)
+        for account_id, risk_sum, insight_count in session.execute(
+            select(Interaction.account_id, func.sum(Insight.risk_score), func.count(Insight.id))
+            .join(Insight, Insight.interaction_id == Interaction.id)
+            .where(*interaction_scope)
+            .group_by(Interaction.account_id)
+        )
+    }
+
+    rollups = []
+    for account_id, interaction_count, last_interaction in interaction_stats:
+        risk_sum, insight_count = insight_stats.get(account_id, (0.0, 0))
+        rollups.append(
+            {
+                "account_id": account_id,
+                "risk_sum": float(risk_sum),
+                "insight_count": insight_count,
+                "interaction_count": interaction_count,
+                "last_interaction": last_interaction,
+            }
+        )
+    if rollups:
+        connection.execute(AccountRiskRollup.__table__.insert(), rollups)
+
+    intent_counts = [
+        {"account_id": account_id, "intent": intent, "count": count, "first_interaction_id": first}
+        for account_id, intent, count, first in session.execute(
+            select(Interaction.account_id, Insight.intent, func.count(Insight.id), func.min(Interaction.id))
+            .join(Insight, Insight.interaction_id == Interaction.id)
+            .where(*interaction_scope)
+            .group_by(Interaction.account_id, Insight.intent)
+        )
+    ]
+    if intent_counts:
+        connection.execute(AccountIntentCount.__table__.insert(), intent_counts)
+
+    refresh_derived(session, account_ids)
+    return len(rollups)
+
+
+def rebuild_evaluation(session: Session) -> None:
+    """Recompute the evaluation totals and daily feedback counts from the raw tables."""
+
+    connection = session.connection()
+    connection.execute(delete(FeedbackDailyCount))
+    connection.execute(delete(EvaluationRollup))
+
+    positive = func.coalesce(func.sum(case((Feedback.rating.is_(True), 1), else_=0)), 0)
+    insight_count, confidence_sum = session.execute(
+        select(func.count(Insight.id), func.coalesce(func.sum(Insight.confidence), 0.0))
+    ).one()
+    feedback_count, positive_count = session.execute(select(func.count(Feedback.id), positive)).one()
+    connection.execute(
+        EvaluationRollup.__table__.insert(),
+        {
+            "id": EVALUATION_ROLLUP_ID,
+            "interaction_count": session.scalar(select(func.count(Interaction.id))),
+            "insight_count": insight_count,
+            "confidence_sum": float(confidence_sum),
+            "feedback_count": feedback_count,
+            "positive_feedback_count": positive_count,
+        },
+    )
+
+    created_at = Feedback.created_at
+    if session.get_bind().dialect.name == "postgresql":
+        # date() of a timestamptz follows the session time zone; add_feedback buckets by the UTC day
+        created_at = func.timezone("UTC", created_at)
+    day = func.date(created_at, type_=Date)
+    daily = [
+        {"day": feedback_day, "feedback_count": count, "positive_count": positive_day}
+        for feedback_day, count, positive_day in session.execute(
+            select(day, func.count(Feedback.id), positive).group_by(day)
+        )
+    ]
+    if daily:
+        connection.execute(FeedbackDailyCount.__table__.insert(), daily)
+
+
+def _insert_missing(session: Session, model: Type, rows: list[dict]) -> None:
+    """Insert rows whose primary key does not exist yet."""
+
+    if not rows:
+        return
+
+    table = model.__table__
+    dialect = session.get_bind().dialect.name
+    dialect_insert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}.get(dialect)
+    if dialect_insert is not None:
+        session.connection().execute(dialect_insert(table).on_conflict_do_nothing(), rows)
+        return
+
+    key_columns = [column.name for column in table.primary_key.columns]
+    wanted = {tuple(row[name] for name in key_columns): row for row in rows}
+    existing = session.connection().execute(
+        select(*table.primary_key.columns).where(table.primary_key.columns[key_columns[0]].in_({key[0] for key in wanted}))
+    )
+    for key in existing:
+        wanted.pop(tuple(key), None)
+    if wanted:
+        session.connection().execute(table.insert(), list(wanted.values()))
+
+
+def main() -> None:
+    with SessionLocal() as session:
+        rebuilt = rebuild_rollups(session)
+        rebuild_evaluation(session)
+        session.commit()
+    print(f"Rebuilt risk rollups for {rebuilt} accounts and the evaluation totals")
+
+
+if __name__ == "__main__":
+    main()
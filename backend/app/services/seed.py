@@ -1,139 +1,323 @@
-"""Utilities to seed the database with demo CSV data."""
+"""Utilities to seed the database with demo CSV data.
+
+Dataset files are streamed in chunks and written with Core ``insert()``
+executemany (``COPY`` on PostgreSQL), one transaction per chunk, so memory
+stays flat however large the export is and a failure only loses the chunk in
+flight. Insights are computed afterwards, chunk by chunk, from the stored
+interactions joined with their expected labels.
+
+Run ``python -m backend.app.services.seed`` to load the configured
+``DEMO_DATA_*`` files with progress output; ``--resume`` continues a load
+that was interrupted.
+"""
 
 from __future__ import annotations
 
+import argparse
 import csv
+import io
 from datetime import datetime
 from pathlib import Path
-from typing import Dict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
 
+from sqlalchemy import Connection, Table, func, insert, select, text, update
 from sqlalchemy.orm import Session
 
-from ..core.config import Settings
+from ..core.config import Settings, get_settings
 from ..models import Account, Contact, EvalSample, Insight, Interaction
-from .analysis import ExpectedInsight, InsightEngine
+from .analysis import ExpectedInsight, InsightEngine, insight_columns
+from .datasets import iter_records, parse_datetime
+from .rollups import RollupDelta
 
+DEFAULT_CHUNK_SIZE = 5000
+COPY_DRIVERS = {"psycopg", "psycopg2"}
 
-def load_demo_data(session: Session, settings: Settings) -> None:
-    """Populate the database with demo data if it's empty."""
+# Called after every committed chunk with the table name and its rows loaded so far
+Progress = Callable[[str, int], None]
 
-    if session.query(Account).count() > 0:
-        return
 
-    expected_lookup = _load_expected_map(settings.demo_data_expected)
-    engine = InsightEngine(expected_lookup)
-
-    accounts = _load_accounts(settings.demo_data_accounts)
-    session.bulk_save_objects(accounts)
-    session.flush()
-
-    contacts = _load_contacts(settings.demo_data_contacts)
-    session.bulk_save_objects(contacts)
-    session.flush()
-
-    interactions = _load_interactions(settings.demo_data_interactions)
-    session.bulk_save_objects(interactions)
-    session.flush()
-
-    for interaction in interactions:
-        analysis = engine.analyze(interaction.id, interaction.content)
-        insight = Insight(
-            interaction_id=interaction.id,
-            intent=analysis["intent"],
-            sentiment=analysis["sentiment"],
-            risk_score=float(analysis["risk_score"]),
-            confidence=float(analysis.get("confidence", 0.65)),
-            summary=analysis["summary"],
-            keywords=analysis.get("keywords"),
-        )
-        interaction.summary = insight.summary
-        session.add(insight)
-
-    eval_samples = [
-        EvalSample(
-            interaction_id=interaction_id,
-            expected_intent=insight.expected_intent,
-            expected_sentiment=insight.expected_sentiment,
-            expected_risk=float(insight.expected_risk),
-        )
-        for interaction_id, insight in expected_lookup.items()
+def load_demo_data(
+    session: Session,
+    settings: Settings,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[Progress] = None,
+    resume: bool = False,
+) -> Dict[str, int]:
+    """Populate the database with demo data if it's empty.
+
+    Returns the rows written per table, plus the number of malformed input
+    rows that were skipped. With ``resume`` a partially loaded database is
+    topped up instead of left alone; rows whose ids are already stored are
+    skipped, which assumes the files are sorted by id as exported.
+    """
+
+    if not resume and session.scalar(select(Account.id).limit(1)) is not None:
+        return {}
+
+    loaded: Dict[str, int] = {"skipped": 0}
+    sources = [
+        ("accounts", Account, _account_row, settings.demo_data_accounts),
+        ("contacts", Contact, _contact_row, settings.demo_data_contacts),
+        ("interactions", Interaction, _interaction_row, settings.demo_data_interactions),
+        ("eval_samples", EvalSample, _eval_sample_row, settings.demo_data_expected),
     ]
-    session.bulk_save_objects(eval_samples)
+    for name, model, build, path in sources:
+        if not path.exists() and model is EvalSample:
+            loaded[name] = 0
+            continue
+        loaded[name] = _load_table(session, name, model, build, path, chunk_size, progress, loaded)
 
+    reset_sequences(session, (Account, Contact, Interaction))
     session.commit()
+    loaded["insights"] = _analyze_interactions(session, chunk_size, progress)
+    return loaded
 
 
-def _load_accounts(path: Path) -> list[Account]:
-    with path.open("r", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh)
-        return [
-            Account(
-                id=int(row["id"]),
-                name=row["name"],
-                industry=row.get("industry"),
-                status=row.get("status", "active"),
-                created_at=_parse_datetime(row.get("created_at")),
-            )
-            for row in reader
-        ]
-
-
-def _load_contacts(path: Path) -> list[Contact]:
-    with path.open("r", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh)
-        return [
-            Contact(
-                id=int(row["id"]),
-                account_id=int(row["account_id"]),
-                name=row["name"],
-                email=row.get("email"),
-                role=row.get("role"),
-                created_at=_parse_datetime(row.get("created_at")),
-            )
-            for row in reader
-        ]
-
-
-def _load_interactions(path: Path) -> list[Interaction]:
-    interactions: list[Interaction] = []
-    with path.open("r", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh)
-        for row in reader:
-            interactions.append(
-                Interaction(
-                    id=int(row["id"]),
-                    account_id=int(row["account_id"]),
-                    contact_id=int(row["contact_id"]) if row.get("contact_id") else None,
-                    channel=row.get("channel", "email"),
-                    content=row.get("content", ""),
-                    timestamp=_parse_datetime(row.get("timestamp")),
-                    source_file=None,
-                )
-            )
-    return interactions
-
-
-def _load_expected_map(path: Path) -> Dict[int, ExpectedInsight]:
-    lookup: Dict[int, ExpectedInsight] = {}
-    if not path.exists():
-        return lookup
-
-    with path.open("r", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh)
-        for row in reader:
-            interaction_id = int(row["interaction_id"])
-            lookup[interaction_id] = ExpectedInsight(
-                expected_intent=row.get("expected_intent", "support_request"),
-                expected_sentiment=row.get("expected_sentiment", "neutral"),
-                expected_risk=float(row.get("expected_risk_score", 0.5)),
+def _load_table(
+    session: Session,
+    name: str,
+    model: type,
+    build: Callable[[Dict[str, Any]], Dict[str, Any]],
+    path: Path,
+    chunk_size: int,
+    progress: Optional[Progress],
+    loaded: Dict[str, int],
+) -> int:
+    key = "interaction_id" if model is EvalSample else "id"
+    after = session.scalar(select(func.max(getattr(model, key)))) or 0
+    written = 0
+    for chunk in _chunked(_build_rows(path, build, loaded), chunk_size):
+        rows = [row for row in chunk if row[key] > after]
+        if not rows:
+            continue
+        bulk_insert(session, model.__table__, rows)
+        session.commit()
+        written += len(rows)
+        if progress is not None:
+            progress(name, written)
+    return written
+
+
+def _build_rows(
+    path: Path, build: Callable[[Dict[str, Any]], Dict[str, Any]], loaded: Dict[str, int]
+) -> Iterator[Dict[str, Any]]:
+    for record in iter_records(path):
+        try:
+            yield build(record)
+        except (KeyError, TypeError, ValueError):
+            # A malformed row is counted and skipped rather than failing the whole load
+            loaded["skipped"] += 1
+
+
+def _chunked(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk: List[Dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _analyze_interactions(session: Session, chunk_size: int, progress: Optional[Progress]) -> int:
+    """Create the insight of every interaction that lacks one, one chunk per transaction."""
+
+    analysed = 0
+    last_id = 0
+    while True:
+        rows = session.execute(
+            select(
+                Interaction.id,
+                Interaction.account_id,
+                Interaction.timestamp,
+                Interaction.content,
+                EvalSample.expected_intent,
+                EvalSample.expected_sentiment,
+                EvalSample.expected_risk,
             )
-    return lookup
+            .outerjoin(EvalSample, EvalSample.interaction_id == Interaction.id)
+            .outerjoin(Insight, Insight.interaction_id == Interaction.id)
+            .where(Interaction.id > last_id, Insight.id.is_(None))
+            .order_by(Interaction.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            return analysed
+        last_id = rows[-1].id
+
+        # Only this chunk's expected labels are held in memory
+        engine = InsightEngine(
+            {
+                row.id: ExpectedInsight(row.expected_intent, row.expected_sentiment, row.expected_risk)
+                for row in rows
+                if row.expected_intent is not None
+            }
+        )
+        analyses = engine.analyze_many((row.id, row.content) for row in rows)
+
+        rollup = RollupDelta()
+        insights = []
+        for row, analysis in zip(rows, analyses):
+            values = insight_columns(analysis)
+            insights.append({"interaction_id": row.id, **values})
+            rollup.add_interaction(row.account_id, row.timestamp)
+            rollup.add_insight(row.account_id, row.id, values["intent"], values["risk_score"], values["confidence"])
+        bulk_insert(session, Insight.__table__, insights)
+        session.execute(
+            update(Interaction),
+            [{"id": row.id, "summary": analysis["summary"]} for row, analysis in zip(rows, analyses)],
+        )
+        rollup.apply(session)
+        session.commit()
+
+        analysed += len(rows)
+        if progress is not None:
+            progress("insights", analysed)
+
+
+def bulk_insert(session: Session, table: Table, rows: List[Dict[str, Any]]) -> None:
+    """Insert ``rows`` with a single executemany, or ``COPY`` on PostgreSQL."""
+
+    rows = _with_defaults(table, rows)
+    connection = session.connection()
+    if connection.dialect.name == "postgresql" and connection.dialect.driver in COPY_DRIVERS:
+        _copy_rows(connection, table, rows)
+    else:
+        connection.execute(insert(table), rows)
+
 
+def _with_defaults(table: Table, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # COPY bypasses SQLAlchemy's Python-side defaults, so fill them in up front
+    defaults = {
+        column.name: column.default
+        for column in table.columns
+        if column.default is not None and column.name not in rows[0]
+    }
+    if not defaults:
+        return rows
+    values = {
+        name: default.arg(None) if default.is_callable else default.arg
+        for name, default in defaults.items()
+        if default.is_callable or default.is_scalar
+    }
+    return [{**row, **values} for row in rows]
 
-def _parse_datetime(value: str | None) -> datetime:
-    if not value:
-        return datetime.utcnow()
+
+def _copy_rows(connection: Connection, table: Table, rows: List[Dict[str, Any]]) -> None:
+    preparer = connection.dialect.identifier_preparer
+    columns = list(rows[0])
+    statement = (
+        f"COPY {preparer.format_table(table)} ({', '.join(preparer.quote(name) for name in columns)}) "
+        "FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+    )
+    cursor = connection.connection.driver_connection.cursor()
     try:
-        return datetime.fromisoformat(value)
-    except ValueError:
-        return datetime.utcnow()
+        if connection.dialect.driver == "psycopg":
+            with cursor.copy(statement) as copy:
+                for row in rows:
+                    copy.write(_csv_line(row[name] for name in columns))
+        else:
+            buffer = io.StringIO()
+            for row in rows:
+                buffer.write(_csv_line(row[name] for name in columns))
+            buffer.seek(0)
+            cursor.copy_expert(statement, buffer)
+    finally:
+        cursor.close()
+
+
+def _csv_line(values: Iterable[Any]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerow(
+        "\\N" if value is None else value.isoformat() if isinstance(value, datetime) else value for value in values
+    )
+    return buffer.getvalue()
+
+
+def reset_sequences(session: Session, models: Sequence[type]) -> None:
+    """Move PostgreSQL id sequences past ids that were inserted explicitly."""
+
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    for model in models:
+        table = model.__tablename__
+        session.execute(
+            text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 1)) FROM {table}")
+        )
+
+
+def _account_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": int(row["id"]),
+        "name": row["name"],
+        "industry": row.get("industry"),
+        "status": row.get("status") or "active",
+        "created_at": _parse_datetime(row.get("created_at")),
+    }
+
+
+def _contact_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": int(row["id"]),
+        "account_id": int(row["account_id"]),
+        "name": row["name"],
+        "email": row.get("email"),
+        "role": row.get("role"),
+        "created_at": _parse_datetime(row.get("created_at")),
+    }
+
+
+def _interaction_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": int(row["id"]),
+        "account_id": int(row["account_id"]),
+        "contact_id": int(row["contact_id"]) if row.get("contact_id") else None,
+        "channel": row.get("channel") or "email",
+        "content": row.get("content") or "",
+        "timestamp": _parse_datetime(row.get("timestamp")),
+        "source_file": None,
+    }
+
+
+def _eval_sample_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    expected_risk = row.get("expected_risk_score")
+    return {
+        "interaction_id": int(row["interaction_id"]),
+        "expected_intent": row.get("expected_intent") or "support_request",
+        "expected_sentiment": row.get("expected_sentiment") or "neutral",
+        "expected_risk": float(expected_risk) if expected_risk is not None else 0.5,
+    }
+
+
+def _parse_datetime(value: Any) -> datetime:
+    return parse_datetime(value) or datetime.utcnow()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    from ..database import SessionLocal, db_engine
+    from ..migrations import upgrade
+
+    parser = argparse.ArgumentParser(description="Load the configured DEMO_DATA_* files into the database.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per transaction")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted load")
+    args = parser.parse_args(argv)
+
+    upgrade(db_engine)
+    with SessionLocal() as session:
+        loaded = load_demo_data(
+            session,
+            get_settings(),
+            chunk_size=max(1, args.chunk_size),
+            progress=lambda table, count: print(f"{table}: {count} rows", flush=True),
+            resume=args.resume,
+        )
+    if not loaded:
+        print("Database already holds accounts; pass --resume to top up an interrupted load")
+        return
+    print(", ".join(f"{table}={count}" for table, count in loaded.items()))
+
+
+if __name__ == "__main__":
+    main()
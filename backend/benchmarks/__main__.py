@@ -0,0 +1,5 @@
+"""Allow ``python -m backend.benchmarks``."""
+
+from .suite import main
+
+main()
@@ -0,0 +1,71 @@
+"""Scaled benchmark datasets built from ``script_3.py``'s demo data."""
+
+from __future__ import annotations
+
+import importlib.util
+from functools import lru_cache
+from pathlib import Path
+from types import ModuleType
+from typing import Optional
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.api import routes
+from backend.app.api.deps import get_db_session, get_read_db_session
+from backend.app.core.config import Settings
+from backend.app.database import Base
+from backend.app.services.seed import load_demo_data
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+AUTH_HEADERS = {"Authorization": "Bearer demo-token"}
+
+
+@lru_cache()
+def demo_script() -> ModuleType:
+    """Import ``script_3.py`` from the repository root without running its CLI."""
+
+    spec = importlib.util.spec_from_file_location("script_3", REPO_ROOT / "script_3.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def generate_dataset(directory: Path, accounts: int, interactions: int, seed: Optional[int] = 0) -> Path:
+    """Write ``accounts`` accounts and ``interactions`` interactions as demo CSVs."""
+
+    demo_script().create_demo_data(num_accounts=accounts, num_interactions=interactions, output_dir=directory, seed=seed)
+    return directory
+
+
+def load_dataset(directory: Path) -> sessionmaker:
+    """Seed a SQLite database next to the CSVs and return a session factory for it."""
+
+    engine = create_engine(f"sqlite:///{directory / 'benchmark.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, autoflush=False, future=True)
+    settings = Settings(
+        demo_data_accounts=directory / "demo_accounts.csv",
+        demo_data_contacts=directory / "demo_contacts.csv",
+        demo_data_interactions=directory / "demo_interactions.csv",
+        demo_data_expected=directory / "demo_expected_insights.csv",
+    )
+    with factory() as session:
+        load_demo_data(session, settings)
+    return factory
+
+
+def api_client(factory: sessionmaker) -> TestClient:
+    """An in-process client for the API routes, bound to ``factory``'s database."""
+
+    def session_override():
+        with factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(routes.router)
+    app.dependency_overrides[get_db_session] = session_override
+    app.dependency_overrides[get_read_db_session] = session_override
+    return TestClient(app)
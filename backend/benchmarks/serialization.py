@@ -0,0 +1,132 @@
+"""Compare the standard and fast JSON paths of the timeline and recent-insights routes.
+
+Run with ``python -m backend.benchmarks.serialization --interactions 5000``.
+Each request is timed end to end through the ASGI app against a temporary
+SQLite database, with the response cache and conditional GETs bypassed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.api.cache import response_cache
+from backend.app.api.pagination import MAX_PAGE_SIZE
+from backend.app.core.config import get_settings
+from backend.app.database import Base
+from backend.app.models import Account, Insight, Interaction
+
+from .data import AUTH_HEADERS, api_client
+
+
+def build_database(path: Path, interactions: int) -> sessionmaker:
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    now = datetime.now(UTC)
+    with engine.begin() as connection:
+        connection.execute(insert(Account), [{"id": 1, "name": "Benchmark Co", "industry": "software"}])
+        connection.execute(
+            insert(Interaction),
+            [
+                {
+                    "id": i,
+                    "account_id": 1,
+                    "channel": "email",
+                    "content": f"Customer note {i}: the invoice looks wrong and we need help. " * 4,
+                    "summary": f"Customer note {i}",
+                    "timestamp": now - timedelta(minutes=i),
+                }
+                for i in range(1, interactions + 1)
+            ],
+        )
+        connection.execute(
+            insert(Insight),
+            [
+                {
+                    "interaction_id": i,
+                    "intent": "pricing_inquiry",
+                    "sentiment": "negative",
+                    "risk_score": 0.55,
+                    "confidence": 0.7,
+                    "summary": f"Customer note {i}",
+                    "keywords": "invoice",
+                }
+                for i in range(1, interactions + 1)
+            ],
+        )
+    return sessionmaker(bind=engine, autoflush=False)
+
+
+def time_requests(client: TestClient, url: str, params: Dict, repeats: int) -> Dict[str, float]:
+    timings = []
+    body_size = 0
+    for _ in range(repeats):
+        started = time.perf_counter()
+        response = client.get(url, params=params, headers=AUTH_HEADERS)
+        timings.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+        body_size = len(response.content)
+    return {"median_ms": round(statistics.median(timings), 2), "min_ms": round(min(timings), 2), "bytes": body_size}
+
+
+def run(interactions: int, repeats: int) -> Dict:
+    settings = get_settings()
+    page_size = min(interactions, MAX_PAGE_SIZE)
+    cases = {
+        "timeline_full": ("/accounts/1", {"limit": page_size}),
+        "timeline_summary": ("/accounts/1", {"limit": page_size, "fields": "summary"}),
+        "recent_insights": ("/insights/recent", {"limit": 50}),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        client = api_client(build_database(Path(directory) / "bench.db", interactions))
+
+        results: Dict[str, Dict] = {}
+        cache_enabled, fast_enabled = response_cache.enabled, settings.fast_json_responses
+        response_cache.enabled = False
+        try:
+            for name, (url, params) in cases.items():
+                results[name] = {}
+                for mode, fast in (("standard", False), ("fast", True)):
+                    settings.fast_json_responses = fast
+                    results[name][mode] = time_requests(client, url, params, repeats)
+                results[name]["speedup"] = round(
+                    results[name]["standard"]["median_ms"] / max(results[name]["fast"]["median_ms"], 1e-6), 2
+                )
+        finally:
+            response_cache.enabled, settings.fast_json_responses = cache_enabled, fast_enabled
+
+    return {
+        "benchmark": "serialization",
+        "interactions": interactions,
+        "page_size": page_size,
+        "repeats": repeats,
+        "results": results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the standard vs fast JSON response paths.")
+    parser.add_argument("--interactions", type=int, default=5000, help="Interactions stored for the account")
+    parser.add_argument("--repeats", type=int, default=10, help="Requests per case and mode")
+    parser.add_argument("--output", type=Path, default=None, help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    report = run(max(1, args.interactions), max(1, args.repeats))
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""Micro and macro benchmarks for the InsightEngine and the API.
+
+Run with ``python -m backend.benchmarks --scale small --output bench.json``.
+Results are written as JSON (with the commit they were measured on) so two
+runs can be diffed to spot regressions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional, Sequence
+
+from backend.app.api.cache import response_cache
+from backend.app.services.analysis import InsightEngine, extract_terms, pack_terms
+from backend.app.services.retrieval import AccountIndex
+
+from . import serialization
+from .data import AUTH_HEADERS, REPO_ROOT, api_client, demo_script, generate_dataset, load_dataset
+
+SCALES: Dict[str, Dict[str, List[int]]] = {
+    "small": {"text_kb": [1, 4, 16], "insights": [100, 1_000], "accounts": [50, 200], "ingest_rows": [500]},
+    "medium": {
+        "text_kb": [1, 4, 16, 64],
+        "insights": [100, 1_000, 10_000],
+        "accounts": [100, 1_000],
+        "ingest_rows": [2_000],
+    },
+    "large": {
+        "text_kb": [1, 4, 16, 64, 256],
+        "insights": [1_000, 10_000, 100_000],
+        "accounts": [1_000, 10_000],
+        "ingest_rows": [20_000],
+    },
+}
+BENCHMARKS = ("analyze", "rag", "dashboard", "ingest", "serialization")
+QUERY = "billing invoice cancel refund"
+
+
+def measure(func: Callable[[], object], repeats: int) -> Dict[str, float]:
+    """Median and best wall time of ``func`` in milliseconds."""
+
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": round(statistics.median(timings), 4), "min_ms": round(min(timings), 4)}
+
+
+def sample_texts() -> List[str]:
+    return [conversation["content"].strip() for conversation in demo_script().sample_conversations]
+
+
+def bench_analyze(sizes_kb: Sequence[int], repeats: int) -> List[Dict]:
+    """InsightEngine.analyze cost per KB of input text."""
+
+    engine = InsightEngine()
+    corpus = "\n\n".join(sample_texts())
+    results = []
+    for size_kb in sizes_kb:
+        text = (corpus * (size_kb * 1024 // len(corpus) + 1))[: size_kb * 1024]
+        timing = measure(lambda: engine.analyze(None, text), repeats)
+        results.append({"text_kb": size_kb, **timing, "us_per_kb": round(timing["median_ms"] * 1000 / size_kb, 2)})
+    return results
+
+
+def bench_rag(counts: Sequence[int], repeats: int) -> List[Dict]:
+    """rag_answer (linear scan) against the per-account inverted index, by insight count."""
+
+    engine = InsightEngine()
+    texts = sample_texts()
+    results = []
+    for count in counts:
+        insights = []
+        index = AccountIndex()
+        for insight_id in range(1, count + 1):
+            summary = f"{texts[insight_id % len(texts)][:240]} case {insight_id}"
+            terms = extract_terms(summary)
+            insights.append(
+                SimpleNamespace(
+                    id=insight_id,
+                    summary=summary,
+                    terms=pack_terms(terms),
+                    intent="support_request",
+                    sentiment="neutral",
+                    risk_score=0.5,
+                )
+            )
+            index.add(insight_id, terms)
+        query_terms = extract_terms(QUERY)
+        results.append(
+            {
+                "insights": count,
+                "rag_answer": measure(lambda: engine.rag_answer(QUERY, insights), repeats),
+                "account_index": measure(lambda: index.search(query_terms, 3), repeats),
+            }
+        )
+    return results
+
+
+def bench_dashboard(account_counts: Sequence[int], repeats: int) -> List[Dict]:
+    """GET /dashboard/csm latency (first page and full walk) by account count."""
+
+    results = []
+    for accounts in account_counts:
+        with tempfile.TemporaryDirectory() as directory:
+            path = generate_dataset(Path(directory), accounts, accounts * 3)
+            client = api_client(load_dataset(path))
+
+            def first_page() -> None:
+                client.get("/dashboard/csm", params={"limit": 50}, headers=AUTH_HEADERS).raise_for_status()
+
+            def all_pages() -> None:
+                cursor = None
+                while True:
+                    params = {"limit": 500, **({"cursor": cursor} if cursor else {})}
+                    response = client.get("/dashboard/csm", params=params, headers=AUTH_HEADERS)
+                    response.raise_for_status()
+                    cursor = response.headers.get("X-Next-Cursor")
+                    if cursor is None:
+                        return
+
+            results.append(
+                {"accounts": accounts, "first_page": measure(first_page, repeats), "all_pages": measure(all_pages, repeats)}
+            )
+    return results
+
+
+def bench_ingest(row_counts: Sequence[int]) -> List[Dict]:
+    """POST /interactions/bulk throughput in rows per second."""
+
+    texts = sample_texts()
+    results = []
+    for rows in row_counts:
+        with tempfile.TemporaryDirectory() as directory:
+            client = api_client(load_dataset(generate_dataset(Path(directory), 50, 50)))
+            body = "\n".join(
+                json.dumps({"account_id": row % 50 + 1, "channel": "email", "content": f"{texts[row % len(texts)]} #{row}"})
+                for row in range(rows)
+            )
+            started = time.perf_counter()
+            response = client.post(
+                "/interactions/bulk",
+                content=body,
+                headers={**AUTH_HEADERS, "Content-Type": "application/x-ndjson"},
+            )
+            elapsed = time.perf_counter() - started
+            response.raise_for_status()
+            created = sum(1 for line in response.text.splitlines() if '"status": "created"' in line)
+            results.append(
+                {"rows": rows, "created": created, "seconds": round(elapsed, 3), "rows_per_s": round(rows / elapsed, 1)}
+            )
+    return results
+
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scale: str, repeats: int, only: Sequence[str] = BENCHMARKS) -> Dict:
+    params = SCALES[scale]
+    results: Dict[str, object] = {}
+    # Measure the work itself, not the response cache
+    cache_enabled, response_cache.enabled = response_cache.enabled, False
+    try:
+        if "analyze" in only:
+            results["analyze"] = bench_analyze(params["text_kb"], repeats)
+        if "rag" in only:
+            results["rag"] = bench_rag(params["insights"], repeats)
+        if "dashboard" in only:
+            results["dashboard"] = bench_dashboard(params["accounts"], repeats)
+        if "ingest" in only:
+            results["ingest"] = bench_ingest(params["ingest_rows"])
+    finally:
+        response_cache.enabled = cache_enabled
+    if "serialization" in only:
+        results["serialization"] = serialization.run(max(params["accounts"]), repeats)["results"]
+
+    return {
+        "commit": current_commit(),
+        "created_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "scale": scale,
+        "repeats": repeats,
+        "results": results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the JourneyLens benchmark suite.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small", help="Dataset sizes to run (default: small)")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed repetitions per case")
+    parser.add_argument(
+        "--only",
+        default=",".join(BENCHMARKS),
+        help=f"Comma separated subset of: {', '.join(BENCHMARKS)}",
+    )
+    parser.add_argument("--output", type=Path, default=None, help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    only = [name.strip() for name in args.only.split(",") if name.strip()]
+    unknown = sorted(set(only) - set(BENCHMARKS))
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    report = run(args.scale, max(1, args.repeats), only)
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
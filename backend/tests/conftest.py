@@ -0,0 +1,23 @@
+"""Point the app at a throwaway database before any test imports it.
+
+``backend.app.database`` builds its engines from ``DATABASE_URL`` on import,
+so this has to happen here rather than in a fixture. Each test session gets
+a fresh file, which keeps runs independent of each other and away from the
+developer's ``backend_data/journeylens.db``.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+_database_dir = Path(tempfile.mkdtemp(prefix="journeylens-tests-"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_database_dir / 'journeylens.db'}"
+for _variable in ("READ_DATABASE_URL", "ASYNC_DATABASE_URL"):
+    os.environ.pop(_variable, None)
+
+
+def pytest_unconfigure(config) -> None:
+    shutil.rmtree(_database_dir, ignore_errors=True)
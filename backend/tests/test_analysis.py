@@ -0,0 +1,54 @@
+"""Unit tests for the rule-based insight engine."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from backend.app.services.analysis import KEYWORD_MATCHER, InsightEngine, extract_terms
+from backend.app.services.retrieval import AccountIndex
+
+
+def test_matcher_keeps_substring_semantics() -> None:
+    hits = KEYWORD_MATCHER.match("we requested a cancellation while growing fast")
+
+    assert hits.intent_scores["churn_risk"] == 2  # "cancel" and "cancellation"
+    assert hits.intent_scores["feature_request"] == 1  # "request" inside "requested"
+    assert hits.intent_scores["expansion_inquiry"] == 1  # "grow" inside "growing"
+    assert hits.positive == 1
+    assert hits.negative == 1
+
+
+def test_analyze_labels_churn_risk() -> None:
+    analysis = InsightEngine().analyze(None, "This is urgent: we want to cancel and get a refund.")
+
+    assert analysis["intent"] == "churn_risk"
+    assert analysis["sentiment"] == "negative"
+    assert analysis["risk_score"] == 0.95
+
+
+def test_analyze_many_matches_analyze() -> None:
+    engine = InsightEngine()
+    items = [
+        (None, "Love the new features, we are expanding to a new location."),
+        (None, "There is a billing error on our invoice."),
+        (None, "There is a billing error on our invoice."),
+        (None, "   "),
+    ]
+
+    assert engine.analyze_many(items) == [engine.analyze(*item) for item in items]
+
+
+def test_account_index_ranks_like_rag_answer() -> None:
+    summaries = ["Billing issue on invoice", "Asked about billing", "", "Wants to expand to a new location", "Thanks"]
+    insights = [
+        SimpleNamespace(id=i, summary=summary, terms=None, intent="support_request", sentiment="neutral", risk_score=0.5)
+        for i, summary in enumerate(summaries, start=1)
+    ]
+    index = AccountIndex()
+    for insight in insights:
+        if insight.summary:
+            index.add(insight.id, extract_terms(insight.summary))
+
+    for query in ["billing invoice", "new location", "nothing relevant"]:
+        _, expected = InsightEngine().rag_answer(query, insights)
+        assert index.search(extract_terms(query)) == [insight.id for insight in expected]
@@ -0,0 +1,57 @@
+"""Tests for the background analysis queue."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.database import Base
+from backend.app.models import Account, AccountRiskRollup, Insight, Interaction, PendingAnalysis
+from backend.app.services.analysis import InsightEngine
+from backend.app.services.analysis_queue import AnalysisQueue
+
+
+def _session_factory(path: Path):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, autoflush=False, future=True)
+
+
+def _wait_for(condition, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the analysis queue"
+        time.sleep(0.05)
+
+
+def test_queue_recovers_pending_rows_with_backpressure(tmp_path: Path) -> None:
+    factory = _session_factory(tmp_path / "queue.db")
+    with factory() as session:
+        session.add(Account(id=1, name="Acme"))
+        session.add_all(
+            Interaction(id=i, account_id=1, channel="email", content=f"Billing error on invoice #{i}")
+            for i in range(1, 8)
+        )
+        session.add_all(PendingAnalysis(interaction_id=i) for i in range(1, 8))
+        session.commit()
+
+    # Rows left behind by a previous process are picked up on start, three at a time
+    queue = AnalysisQueue(factory, InsightEngine(), workers=2, max_queued=3)
+    queue.start()
+    try:
+        with factory() as session:
+            _wait_for(lambda: session.scalar(select(func.count(PendingAnalysis.id))) == 0)
+    finally:
+        queue.stop()
+
+    with factory() as session:
+        intents = session.scalars(select(Insight.intent)).all()
+        rollup = session.get(AccountRiskRollup, 1)
+    assert intents == ["pricing_inquiry"] * 7
+    assert rollup.insight_count == 7
+    metrics = queue.metrics()
+    assert metrics["completed"] == 7
+    assert metrics["failed"] == 0
@@ -2,19 +2,36 @@
 
 from __future__ import annotations
 
+import json
 from collections.abc import Iterator
-from datetime import datetime
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
 
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from sqlalchemy import text
 
+from backend.app.api import conditional
+from backend.app.api.cache import response_cache
+from backend.app.api.instrumentation import InstrumentationMiddleware
+from backend.app.api.queries import evaluation_fallback_query, evaluation_query, evaluation_summary, performance_trend
+from backend.app.core.config import get_settings
+from backend.app.core.metrics import assert_max_queries, trace_statements
+from backend.app.database import SessionLocal, create_db_engine, db_engine
 from backend.app.main import app
+from backend.app.migrations import upgrade
+from backend.app.services.seed import load_demo_data
 
 AUTH_HEADERS = {"Authorization": "Bearer demo-token"}
 
 
 @pytest.fixture(scope="module")
 def client() -> Iterator[TestClient]:
+    # What `python -m backend.app init` does; workers no longer migrate or seed at startup
+    upgrade(db_engine)
+    with SessionLocal() as session:
+        load_demo_data(session, get_settings())
     with TestClient(app) as test_client:
         yield test_client
 
@@ -57,4 +74,375 @@ def test_rag_answers_query(client: TestClient) -> None:
     assert response.status_code == 200
     data = response.json()
     assert "answer" in data
-    assert data["account_id"] == 1
\ No newline at end of file
+    assert data["account_id"] == 1
+
+
+def test_csm_dashboard_sorted_by_risk(client: TestClient) -> None:
+    response = client.get("/dashboard/csm", headers=AUTH_HEADERS)
+    assert response.status_code == 200
+    rows = response.json()
+    assert rows
+    assert [row["risk_score"] for row in rows] == sorted((row["risk_score"] for row in rows), reverse=True)
+    assert {"account_id", "account_name", "recent_interactions", "last_interaction", "next_action"}.issubset(rows[0])
+
+
+def test_dashboard_keyset_pages_cover_full_listing(client: TestClient) -> None:
+    full = client.get("/dashboard/csm", headers=AUTH_HEADERS).json()
+
+    pages: list[dict] = []
+    params: dict[str, str | int] = {"limit": 1}
+    while True:
+        response = client.get("/dashboard/csm", params=params, headers=AUTH_HEADERS)
+        assert response.status_code == 200
+        pages.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params["cursor"] = cursor
+
+    assert pages == full
+
+
+def test_account_timeline_filters_and_pages(client: TestClient) -> None:
+    # A window before any seeded data keeps the listing small and leaves "newest" untouched for other tests
+    window = {"start": "2001-01-01T00:00:00", "end": "2001-01-31T00:00:00", "channel": "email"}
+    for day, channel in ((3, "email"), (5, "call"), (7, "email"), (7, "email")):
+        client.post(
+            "/interactions",
+            json={
+                "account_id": 1,
+                "channel": channel,
+                "content": "Timeline paging fixture.",
+                "timestamp": f"2001-01-0{day}T09:00:00",
+            },
+            headers=AUTH_HEADERS,
+        )
+
+    full = client.get("/accounts/1", params={**window, "limit": 500}, headers=AUTH_HEADERS).json()["interactions"]
+    assert len(full) >= 3
+    assert all(interaction["channel"] == "email" for interaction in full)
+
+    pages: list[dict] = []
+    params: dict[str, str | int] = {**window, "limit": 1}
+    while True:
+        response = client.get("/accounts/1", params=params, headers=AUTH_HEADERS)
+        assert response.status_code == 200
+        page = response.json()["interactions"]
+        assert len(page) == 1
+        pages.extend(page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params["cursor"] = cursor
+
+    assert pages == full
+
+    bad_cursor = client.get("/accounts", params={"cursor": "not-a-cursor"}, headers=AUTH_HEADERS)
+    assert bad_cursor.status_code == 400
+
+
+def test_account_timeline_summary_fields_omit_content(client: TestClient) -> None:
+    response = client.get("/accounts/1", params={"fields": "summary"}, headers=AUTH_HEADERS)
+    assert response.status_code == 200
+    interactions = response.json()["interactions"]
+    assert interactions
+    assert all("content" not in interaction and "summary" in interaction for interaction in interactions)
+    timestamps = [interaction["timestamp"] for interaction in interactions]
+    assert timestamps == sorted(timestamps, reverse=True)
+
+
+def test_bulk_ingest_ndjson_reports_each_row(client: TestClient) -> None:
+    body = "\n".join(
+        [
+            '{"account_id": 1, "channel": "call", "content": "We are thrilled and expanding to a new location."}',
+            '{"account_id": 999999, "content": "Unknown account"}',
+            "not json",
+            '{"account_id": 1, "content": "Billing error on the latest invoice."}',
+        ]
+    )
+    response = client.post(
+        "/interactions/bulk",
+        params={"chunk_size": 2},
+        content=body,
+        headers={**AUTH_HEADERS, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [result["row"] for result in results] == [1, 2, 3, 4]
+    assert [result["status"] for result in results] == ["created", "error", "error", "created"]
+    assert results[3]["intent"] == "pricing_inquiry"
+
+
+def test_bulk_ingest_reports_undecodable_rows(client: TestClient) -> None:
+    valid = b'{"account_id": 1, "content": "Encoding fixture row."}'
+    response = client.post(
+        "/interactions/bulk",
+        params={"chunk_size": 2},
+        content=b"\n".join([valid, valid, valid, b"\xff\xfe"]),
+        headers={**AUTH_HEADERS, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [result["status"] for result in results] == ["created", "created", "created", "error"]
+    assert results[3]["detail"].startswith("Invalid UTF-8")
+
+    response = client.post(
+        "/interactions/bulk",
+        params={"chunk_size": 1},
+        content=b"account_id,content\n1,Encoding fixture row.\n1,\xff\xfe\n1,Never read.\n",
+        headers={**AUTH_HEADERS, "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [(result["row"], result["status"]) for result in results] == [(1, "created"), (2, "error")]
+
+
+def test_bulk_ingest_csv(client: TestClient) -> None:
+    body = 'account_id,channel,content\n1,email,"Multi-line\nsupport request about a bug"\n'
+    response = client.post(
+        "/interactions/bulk",
+        content=body,
+        headers={**AUTH_HEADERS, "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 200
+    (result,) = [json.loads(line) for line in response.text.splitlines()]
+    assert result["status"] == "created"
+    assert client.post("/interactions/bulk", content="x", headers=AUTH_HEADERS).status_code == 415
+
+
+def test_async_interaction_returns_202_and_long_polls(client: TestClient) -> None:
+    payload = {"account_id": 1, "channel": "email", "content": "Please cancel our plan, we want a refund."}
+    response = client.post("/interactions", json=payload, headers={**AUTH_HEADERS, "Prefer": "respond-async"})
+    assert response.status_code == 202
+    accepted = response.json()
+    assert accepted["status"] == "pending"
+
+    response = client.get(
+        f"/interactions/{accepted['interaction_id']}/insight", params={"wait": 10}, headers=AUTH_HEADERS
+    )
+    assert response.status_code == 200
+    assert response.json()["intent"] == "churn_risk"
+
+    metrics = client.get("/analysis/queue", headers=AUTH_HEADERS).json()
+    assert metrics["running"] is True
+    assert metrics["completed"] >= 1
+
+
+def test_cached_reads_revalidate_and_invalidate_on_write(client: TestClient) -> None:
+    first = client.get("/accounts/1", params={"limit": 5}, headers=AUTH_HEADERS)
+    etag = first.headers["ETag"]
+    response_cache.enabled = False
+    try:
+        uncached = client.get("/accounts/1", params={"limit": 5}, headers=AUTH_HEADERS)
+    finally:
+        response_cache.enabled = True
+    assert first.content == uncached.content
+
+    revalidated = client.get("/accounts/1", params={"limit": 5}, headers={**AUTH_HEADERS, "If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+    client.post("/interactions", json={"account_id": 1, "content": "Quick check-in call."}, headers=AUTH_HEADERS)
+    refreshed = client.get("/accounts/1", params={"limit": 5}, headers={**AUTH_HEADERS, "If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.json()["interactions"][0]["content"] == "Quick check-in call."
+
+
+def test_conditional_get_uses_table_fingerprints(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    insight_id = client.post(
+        "/interactions", json={"account_id": 1, "content": "Thanks for the onboarding session."}, headers=AUTH_HEADERS
+    ).json()["id"]
+    # Last-Modified is only sent once the second of the newest write has passed
+    later = datetime.now(UTC) + timedelta(seconds=2)
+    monkeypatch.setattr(conditional, "current_time", lambda: later)
+
+    response = client.get("/evaluations/metrics", headers=AUTH_HEADERS)
+    etag, modified = response.headers["ETag"], response.headers["Last-Modified"]
+    assert etag.startswith('W/"')
+
+    assert client.get("/evaluations/metrics", headers={**AUTH_HEADERS, "If-None-Match": etag}).status_code == 304
+    assert client.get("/evaluations/metrics", headers={**AUTH_HEADERS, "If-Modified-Since": modified}).status_code == 304
+    assert client.get("/insights/recent", headers={**AUTH_HEADERS, "If-None-Match": etag}).status_code == 200
+
+    client.post(
+        "/feedback",
+        json={"insight_id": insight_id, "rating": True, "reason_code": "accurate"},
+        headers=AUTH_HEADERS,
+    )
+    assert client.get("/evaluations/metrics", headers={**AUTH_HEADERS, "If-None-Match": etag}).status_code == 200
+
+
+def test_evaluation_metrics_are_maintained_incrementally(client: TestClient) -> None:
+    before = client.get("/evaluations/metrics", headers=AUTH_HEADERS).json()
+    insight = client.post(
+        "/interactions", json={"account_id": 1, "content": "The new dashboard saved us hours."}, headers=AUTH_HEADERS
+    ).json()
+    client.post(
+        "/feedback", json={"insight_id": insight["id"], "rating": True, "reason_code": "accurate"}, headers=AUTH_HEADERS
+    )
+
+    after = client.get("/evaluations/metrics", headers=AUTH_HEADERS).json()
+    assert after["total_insights"] == before["total_insights"] + 1
+    assert 0 < after["ai_coverage"] <= 100
+    assert 0 < after["avg_confidence"] <= 1
+
+    # The rollups agree with a direct aggregation of the raw tables
+    today = datetime.now(UTC).date()
+    with SessionLocal() as session:
+        maintained = session.execute(evaluation_query(today, 7)).one()
+        aggregated = session.execute(evaluation_fallback_query(today, 7)).one()
+    assert evaluation_summary(maintained) == evaluation_summary(aggregated)
+    assert maintained.recent_feedback >= 1
+
+
+def test_performance_trend_compares_feedback_windows() -> None:
+    assert performance_trend(20, 18, 20, 12) == "improving"
+    assert performance_trend(20, 12, 20, 18) == "declining"
+    assert performance_trend(20, 15, 20, 15) == "stable"
+    assert performance_trend(3, 3, 20, 10) == "insufficient_data"
+
+
+def test_if_modified_since_is_not_trusted_within_the_write_second(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(response_cache, "enabled", False)
+    written = datetime.fromisoformat(
+        client.post(
+            "/interactions", json={"account_id": 1, "content": "Same-second write fixture."}, headers=AUTH_HEADERS
+        ).json()["updated_at"]
+    ).replace(tzinfo=UTC)
+    truncated = format_datetime(written.replace(microsecond=0), usegmt=True)
+
+    # A read in the same second as the write: a later write could share the truncated timestamp
+    monkeypatch.setattr(conditional, "current_time", lambda: written)
+    response = client.get("/insights/recent", headers=AUTH_HEADERS)
+    assert "Last-Modified" not in response.headers
+    assert client.get("/insights/recent", headers={**AUTH_HEADERS, "If-Modified-Since": truncated}).status_code == 200
+
+    monkeypatch.setattr(conditional, "current_time", lambda: written + timedelta(seconds=1))
+    response = client.get("/insights/recent", headers=AUTH_HEADERS)
+    assert response.headers["Last-Modified"] == truncated
+    assert client.get("/insights/recent", headers={**AUTH_HEADERS, "If-Modified-Since": truncated}).status_code == 304
+
+
+def test_fast_json_path_is_byte_compatible(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(response_cache, "enabled", False)
+    requests = [
+        ("/accounts/1", {"limit": 3}),
+        ("/accounts/1", {"limit": 3, "fields": "summary"}),
+        ("/insights/recent", {"limit": 20}),
+    ]
+    standard = [client.get(url, params=params, headers=AUTH_HEADERS) for url, params in requests]
+    monkeypatch.setattr(get_settings(), "fast_json_responses", True)
+    fast = [client.get(url, params=params, headers=AUTH_HEADERS) for url, params in requests]
+
+    for expected, actual in zip(standard, fast):
+        assert actual.status_code == 200
+        assert actual.content == expected.content
+        assert actual.headers.get("X-Next-Cursor") == expected.headers.get("X-Next-Cursor")
+
+
+def test_sql_debug_traces_repeats_with_metrics_disabled(caplog: pytest.LogCaptureFixture) -> None:
+    engine = create_db_engine("sqlite://", get_settings().model_copy(update={"metrics_enabled": False}))
+    debug_app = FastAPI()
+    debug_app.add_middleware(InstrumentationMiddleware, repeat_threshold=2, record_metrics=False)
+
+    @debug_app.get("/loop")
+    def loop() -> dict[str, int]:
+        with engine.connect() as connection:
+            for value in range(2):
+                connection.execute(text("SELECT :value"), {"value": value})
+        return {"ok": 1}
+
+    trace_statements()
+    try:
+        response = TestClient(debug_app).get("/loop")
+    finally:
+        trace_statements(False)
+
+    assert response.status_code == 200
+    assert "Server-Timing" not in response.headers
+    assert any("GET /loop ran the same statement 2 times" in message for message in caplog.messages)
+
+
+def test_requests_report_server_timing_and_prometheus_metrics(client: TestClient) -> None:
+    created = client.post(
+        "/interactions",
+        json={"account_id": 1, "channel": "email", "content": "We want to upgrade to the advanced plan."},
+        headers=AUTH_HEADERS,
+    )
+    assert created.status_code == 201
+    timing = created.headers["Server-Timing"]
+    assert timing.startswith("app;dur=")
+    assert "insight-analyze;dur=" in timing
+    queries = int(timing.split('desc="')[1].split(" queries")[0])
+    assert queries > 0
+
+    assert client.get("/metrics").status_code == 401
+    metrics = client.get("/metrics", headers=AUTH_HEADERS)
+    assert metrics.status_code == 200
+    assert metrics.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = metrics.text
+    assert "# TYPE journeylens_http_request_duration_seconds histogram" in body
+    assert 'journeylens_http_request_duration_seconds_count{method="POST",route="/interactions",status="201"}' in body
+    assert 'journeylens_http_request_sql_statements_bucket{route="/interactions",le="+Inf"}' in body
+    assert 'journeylens_insight_engine_duration_seconds_count{method="analyze"}' in body
+
+
+# (method, path, request options, max statements). Pages are requested at their
+# maximum size so a per-row lazy load would blow the budget.
+QUERY_BUDGETS = [
+    ("GET", "/health", {}, 0),
+    ("GET", "/accounts", {"params": {"limit": 200}}, 2),
+    ("GET", "/accounts/1", {"params": {"limit": 200}}, 3),
+    ("GET", "/accounts/1", {"params": {"limit": 200, "fields": "summary"}}, 3),
+    ("GET", "/dashboard/csm", {"params": {"limit": 500}}, 2),
+    ("POST", "/interactions", {"json": {"account_id": 1, "content": "Billing question about our invoice."}}, 13),
+    ("GET", "/interactions/{interaction_id}/insight", {}, 3),
+    ("GET", "/analysis/queue", {}, 0),
+    (
+        "POST",
+        "/interactions/bulk",
+        {
+            "content": "\n".join(json.dumps({"account_id": 1, "content": f"Bulk budget row {row}"}) for row in range(50)),
+            "headers": {"Content-Type": "application/x-ndjson"},
+        },
+        10,
+    ),
+    ("GET", "/accounts/1/rag", {"params": {"query": "billing"}}, 4),
+    ("POST", "/feedback", {"json": {"insight_id": "{insight_id}", "rating": True, "reason_code": "accurate"}}, 6),
+    ("GET", "/insights/recent", {"params": {"limit": 50}}, 2),
+    ("GET", "/evaluations/metrics", {}, 2),
+    ("GET", "/metrics", {}, 0),
+]
+
+
+@pytest.mark.parametrize(("method", "path", "options", "budget"), QUERY_BUDGETS)
+def test_route_query_budget(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+    method: str,
+    path: str,
+    options: dict,
+    budget: int,
+) -> None:
+    # Measure the handler itself rather than a cached response
+    monkeypatch.setattr(response_cache, "enabled", False)
+    created = client.post(
+        "/interactions", json={"account_id": 1, "content": "Budget fixture interaction."}, headers=AUTH_HEADERS
+    ).json()
+    ids = {"interaction_id": created["interaction_id"], "insight_id": created["id"]}
+    options = json.loads(json.dumps(options).replace('"{insight_id}"', str(ids["insight_id"])))
+
+    with assert_max_queries(budget, repeat_limit=1):
+        response = client.request(
+            method, path.format(**ids), headers={**AUTH_HEADERS, **options.pop("headers", {})}, **options
+        )
+    assert response.status_code < 300
+
+    if path == "/interactions/bulk":
+        # One batched INSERT per table must still map every row to its own ids
+        for line in response.text.splitlines():
+            result = json.loads(line)
+            insight = client.get(f"/interactions/{result['interaction_id']}/insight", headers=AUTH_HEADERS).json()
+            assert insight["id"] == result["insight_id"]
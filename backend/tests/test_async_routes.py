@@ -0,0 +1,81 @@
+"""Parity tests for the async read routes against their sync counterparts."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.api import async_routes, routes
+from backend.app.api.cache import response_cache
+from backend.app.api.deps import get_async_db_session, get_read_db_session
+from backend.app.database import Base, async_database_url
+from backend.app.models import Account, Insight, Interaction
+from backend.app.services.rollups import rebuild_rollups
+
+pytest.importorskip("aiosqlite")
+
+AUTH_HEADERS = {"Authorization": "Bearer demo-token"}
+
+
+def _client(path: Path, use_async: bool) -> TestClient:
+    url = f"sqlite:///{path}"
+    app = FastAPI()
+    if use_async:
+        factory = async_sessionmaker(bind=create_async_engine(async_database_url(url)), expire_on_commit=False)
+
+        async def override() -> AsyncSession:
+            async with factory() as db:
+                yield db
+
+        app.dependency_overrides[get_async_db_session] = override
+        app.include_router(async_routes.router)
+    else:
+        factory = sessionmaker(bind=create_engine(url, connect_args={"check_same_thread": False}))
+
+        def override():
+            with factory() as db:
+                yield db
+
+        app.dependency_overrides[get_read_db_session] = override
+    app.include_router(routes.router)
+    return TestClient(app)
+
+
+def test_async_read_routes_match_sync(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(response_cache, "enabled", False)
+    path = tmp_path / "async.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add_all([Account(id=1, name="Acme", industry="retail"), Account(id=2, name="Globex")])
+        start = datetime(2024, 1, 1)
+        for i in range(1, 7):
+            session.add(
+                Interaction(id=i, account_id=1 + i % 2, channel="email", content=f"note {i}", timestamp=start + timedelta(days=i))
+            )
+            session.add(Insight(interaction_id=i, intent="churn_risk", sentiment="negative", risk_score=i / 10, summary=f"s{i}"))
+        session.flush()
+        rebuild_rollups(session)
+        session.commit()
+
+    requests = [
+        ("/accounts", {"limit": 1}),
+        ("/accounts/1", {"limit": 2}),
+        ("/accounts/2", {"fields": "summary"}),
+        ("/dashboard/csm", {}),
+        ("/insights/recent", {"limit": 3}),
+    ]
+    sync_client, async_client = _client(path, use_async=False), _client(path, use_async=True)
+    for url, params in requests:
+        expected = sync_client.get(url, params=params, headers=AUTH_HEADERS)
+        actual = async_client.get(url, params=params, headers=AUTH_HEADERS)
+        assert actual.status_code == expected.status_code == 200
+        assert actual.json() == expected.json()
+        assert actual.headers.get("X-Next-Cursor") == expected.headers.get("X-Next-Cursor")
@@ -0,0 +1,26 @@
+"""Smoke tests for the benchmark dataset helpers."""
+
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+from backend.app.models import Account, Insight, Interaction
+from backend.benchmarks.data import generate_dataset, load_dataset
+
+
+def test_generated_dataset_scales_and_loads(tmp_path: Path) -> None:
+    generate_dataset(tmp_path, accounts=12, interactions=40, seed=7)
+
+    with (tmp_path / "demo_interactions.csv").open(encoding="utf-8", newline="") as fh:
+        rows = list(csv.DictReader(fh))
+    assert len(rows) == 40
+    assert {int(row["account_id"]) for row in rows} <= set(range(1, 13))
+
+    factory = load_dataset(tmp_path)
+    with factory() as session:
+        assert session.scalar(select(func.count(Account.id))) == 12
+        assert session.scalar(select(func.count(Interaction.id))) == 40
+        assert session.scalar(select(func.count(Insight.id))) == 40
@@ -0,0 +1,66 @@
+"""Tests for engine construction and the SQLite pragma profile."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from backend.app.core.config import get_settings
+from backend.app.core.metrics import assert_max_queries, count_queries
+from backend.app.database import create_db_engine
+
+
+def test_sqlite_engines_use_wal_and_read_only_replica(tmp_path: Path) -> None:
+    url = f"sqlite:///{tmp_path / 'pragmas.db'}"
+    settings = get_settings()
+    writer = create_db_engine(url, settings)
+    reader = create_db_engine(url, settings, read_only=True)
+
+    with writer.begin() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == settings.sqlite_busy_timeout
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        connection.execute(text("CREATE TABLE notes (id INTEGER PRIMARY KEY)"))
+        connection.execute(text("INSERT INTO notes (id) VALUES (1)"))
+
+    assert writer.pool.size() == settings.db_pool_size
+    with reader.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM notes")).scalar() == 1
+        with pytest.raises(OperationalError):
+            connection.execute(text("INSERT INTO notes (id) VALUES (2)"))
+
+
+def test_query_guard_flags_budget_overruns_and_repeated_statements() -> None:
+    engine = create_db_engine("sqlite://", get_settings())
+
+    with engine.connect() as connection:
+        with count_queries() as log:
+            for value in range(3):
+                connection.execute(text("SELECT :value"), {"value": value})
+        assert log.count == 3
+        assert list(log.repeated(3).values()) == [3]
+
+        with assert_max_queries(3):
+            connection.execute(text("SELECT 1"))
+        with pytest.raises(AssertionError, match="at most 1 queries"):
+            with assert_max_queries(1):
+                connection.execute(text("SELECT 1"))
+                connection.execute(text("SELECT 2"))
+        with pytest.raises(AssertionError, match="N\\+1"):
+            with assert_max_queries(10, repeat_limit=1):
+                for value in range(2):
+                    connection.execute(text("SELECT :value"), {"value": value})
+
+
+def test_query_guard_counts_with_metrics_disabled() -> None:
+    settings = get_settings().model_copy(update={"metrics_enabled": False})
+    engine = create_db_engine("sqlite://", settings)
+
+    with engine.connect() as connection:
+        with pytest.raises(AssertionError, match="at most 1 queries"):
+            with assert_max_queries(1):
+                connection.execute(text("SELECT 1"))
+                connection.execute(text("SELECT 2"))
@@ -0,0 +1,193 @@
+"""Tests for schema migrations against databases from older releases."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from sqlalchemy import create_engine, select, text
+
+from backend.app.advisor import advise, findings
+from backend.app.core.config import get_settings
+from backend.app.database import Base, create_db_engine
+from backend.app.migrations import (
+    MIGRATIONS,
+    migration_metadata,
+    migration_progress,
+    pending_migrations,
+    run_migrations,
+    schema_migrations,
+    upgrade,
+)
+
+
+def _legacy_engine():
+    """Create a database shaped like the first release, before any migration."""
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine, tables=[table for table in Base.metadata.sorted_tables if table.name != "insights"])
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE insights (id INTEGER PRIMARY KEY, interaction_id INTEGER NOT NULL, intent VARCHAR NOT NULL, "
+                "sentiment VARCHAR NOT NULL, risk_score FLOAT NOT NULL, confidence FLOAT NOT NULL, summary TEXT NOT NULL, "
+                "keywords VARCHAR, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO accounts (id, name, status, created_at, updated_at) "
+                "VALUES (1, 'Acme', 'active', '2024-01-01', '2024-01-01')"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO interactions (id, account_id, channel, content, timestamp, created_at, updated_at) VALUES "
+                "(1, 1, 'email', 'x', '2024-01-02 00:00:00', '2024-01-02', '2024-01-02'), "
+                "(2, 1, 'call', 'y', '2024-01-03 00:00:00', '2024-01-03', '2024-01-03')"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO insights (id, interaction_id, intent, sentiment, risk_score, confidence, summary, created_at, updated_at) VALUES "
+                "(1, 1, 'churn_risk', 'negative', 0.9, 0.6, 'Billing issue on the invoice', '2024-01-02', '2024-01-02'), "
+                "(2, 2, 'support_request', 'neutral', 0.5, 0.6, '…', '2024-01-03', '2024-01-03')"
+            )
+        )
+    return engine
+
+
+def test_migrations_upgrade_legacy_schema() -> None:
+    engine = _legacy_engine()
+
+    assert run_migrations(engine) == [migration.version for migration in MIGRATIONS]
+    assert run_migrations(engine) == []
+
+    with engine.connect() as connection:
+        terms = connection.execute(text("SELECT id, terms, term_count FROM insights ORDER BY id")).all()
+        rollup = connection.execute(
+            text("SELECT risk_score, insight_count, interaction_count, dominant_intent FROM account_risk_rollups")
+        ).one()
+        evaluation = connection.execute(
+            text("SELECT interaction_count, insight_count, confidence_sum, feedback_count FROM evaluation_rollups")
+        ).one()
+    assert terms == [(1, "billing invoice issue the", 4), (2, "", 0)]
+    assert rollup == (0.7, 2, 2, "churn_risk")
+    assert evaluation == (2, 2, 1.2, 0)
+
+
+def test_interrupted_backfill_resumes_from_saved_progress() -> None:
+    engine = _legacy_engine()
+    seen = []
+
+    def crash_after_first_batch(name: str, rows_done: int) -> None:
+        seen.append((name, rows_done))
+        raise RuntimeError("worker killed")
+
+    try:
+        run_migrations(engine, batch_size=1, progress=crash_after_first_batch)
+    except RuntimeError:
+        pass
+    assert pending_migrations(engine) == MIGRATIONS
+    with engine.connect() as connection:
+        assert connection.execute(select(migration_progress.c.name, migration_progress.c.last_key)).all() == [
+            ("insight_terms", 1)
+        ]
+        # The committed batch stays committed; the second row has not been touched yet
+        assert connection.execute(text("SELECT term_count FROM insights ORDER BY id")).scalars().all() == [4, None]
+
+    assert run_migrations(engine, batch_size=1, progress=lambda name, rows_done: seen.append((name, rows_done)))
+    assert seen == [("insight_terms", 1), ("insight_terms", 2), ("account_risk_rollups", 1)]
+    assert pending_migrations(engine) == []
+    with engine.connect() as connection:
+        assert connection.execute(select(migration_progress)).all() == []
+        assert connection.execute(text("SELECT term_count FROM insights ORDER BY id")).scalars().all() == [4, 0]
+
+
+def test_account_rollups_are_backfilled_in_account_batches() -> None:
+    engine = _legacy_engine()
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO accounts (id, name, status, created_at, updated_at) "
+                "VALUES (2, 'Globex', 'active', '2024-01-01', '2024-01-01')"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO interactions (id, account_id, channel, content, timestamp, created_at, updated_at) "
+                "VALUES (3, 2, 'email', 'z', '2024-01-04 00:00:00', '2024-01-04', '2024-01-04')"
+            )
+        )
+    seen = []
+
+    run_migrations(engine, batch_size=1, progress=lambda name, rows_done: seen.append((name, rows_done)))
+
+    assert [entry for entry in seen if entry[0] == "account_risk_rollups"] == [
+        ("account_risk_rollups", 1),
+        ("account_risk_rollups", 2),
+    ]
+    with engine.connect() as connection:
+        rollups = connection.execute(
+            text("SELECT account_id, insight_count, interaction_count FROM account_risk_rollups ORDER BY account_id")
+        ).all()
+    assert rollups == [(1, 2, 2), (2, 0, 1)]
+
+
+def test_index_advisor_flags_scans_until_read_path_indexes_exist() -> None:
+    before = _legacy_engine()
+    migration_metadata.create_all(bind=before)
+    with before.begin() as connection:
+        # Everything but the read path index migration
+        connection.execute(schema_migrations.insert().values(version=4, description="skipped"))
+    run_migrations(before)
+    with before.connect() as connection:
+        flagged = {(report.route, report.label): report.findings for report in advise(connection) if report.findings}
+
+    assert flagged[("GET /insights/recent", "page")] == [
+        "full scan of insights",
+        "sort: USE TEMP B-TREE FOR ORDER BY",
+    ]
+    assert set(flagged[("GET /insights/recent", "fingerprint")]) == {"full scan of insights"}
+    assert flagged[("GET /interactions/{interaction_id}/insight", "insight")] == ["full scan of insights"]
+
+    after = _legacy_engine()
+    run_migrations(after)
+    with after.connect() as connection:
+        assert [report for report in advise(connection) if report.findings] == []
+
+
+def test_index_advisor_flags_unbounded_index_walks_and_partial_sorts() -> None:
+    walk = ["SCAN insights USING COVERING INDEX ix_insights_updated_at"]
+    assert findings(walk, "sqlite") == ["full scan of insights (covering index ix_insights_updated_at)"]
+    # A limited walk in index order stops after LIMIT rows
+    assert findings(["SCAN insights USING INDEX ix_insights_created_at"], "sqlite", limited=True) == []
+    assert findings(["SEARCH insights USING INDEX ix_insights_created_at (created_at>?)"], "sqlite") == []
+
+    partial = [
+        "SCAN account_risk_rollups USING INDEX ix_account_risk_rollups_risk_score_account_id",
+        "SEARCH accounts USING INTEGER PRIMARY KEY (rowid=?)",
+        "USE TEMP B-TREE FOR RIGHT PART OF ORDER BY",
+    ]
+    assert findings(partial, "sqlite", limited=True) == [
+        "full scan of account_risk_rollups (index ix_account_risk_rollups_risk_score_account_id)",
+        "sort: USE TEMP B-TREE FOR RIGHT PART OF ORDER BY",
+    ]
+
+
+def test_concurrent_upgrades_apply_each_migration_once(tmp_path: Path) -> None:
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'workers.db'}", get_settings())
+    workers = 4
+    barrier = threading.Barrier(workers)
+
+    def boot() -> list:
+        barrier.wait()
+        return upgrade(engine)
+
+    with ThreadPoolExecutor(workers) as pool:
+        results = list(pool.map(lambda _: boot(), range(workers)))
+
+    assert sorted(version for applied in results for version in applied) == [m.version for m in MIGRATIONS]
+    with engine.connect() as connection:
+        assert len(connection.execute(select(schema_migrations)).all()) == len(MIGRATIONS)
@@ -0,0 +1,45 @@
+"""Tests for the historical interaction re-scoring job."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.app.database import Base
+from backend.app.models import Account, Insight, Interaction
+from backend.app.services.rescore import rescore_interactions
+
+
+def _session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, autoflush=False, future=True)
+
+
+def test_rescore_upserts_insights_and_resumes(tmp_path: Path) -> None:
+    factory = _session_factory()
+    with factory() as session:
+        session.add(Account(id=1, name="Acme"))
+        session.add_all(
+            Interaction(id=i, account_id=1, channel="email", content=f"Please cancel, we want a refund #{i}")
+            for i in range(1, 6)
+        )
+        session.add(Insight(interaction_id=1, intent="feature_request", sentiment="positive", risk_score=0.1, summary="stale"))
+        session.commit()
+
+    checkpoint = tmp_path / "rescore.json"
+    checkpoint.write_text(json.dumps({"last_id": 3, "since": None}), encoding="utf-8")
+
+    assert rescore_interactions(factory, chunk_size=1, checkpoint=checkpoint) == 2
+    assert json.loads(checkpoint.read_text(encoding="utf-8"))["last_id"] == 5
+
+    assert rescore_interactions(factory, chunk_size=2) == 5
+    with factory() as session:
+        insights = session.scalars(select(Insight).order_by(Insight.interaction_id)).all()
+        assert [insight.interaction_id for insight in insights] == [1, 2, 3, 4, 5]
+        assert {insight.intent for insight in insights} == {"churn_risk"}
+        assert session.get(Interaction, 1).summary == insights[0].summary
@@ -0,0 +1,87 @@
+"""Tests for the streaming demo data loader."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.core.config import Settings
+from backend.app.database import Base
+from backend.app.models import Account, AccountRiskRollup, EvalSample, Insight, Interaction
+from backend.app.services.seed import load_demo_data
+
+
+def _write_dataset(directory: Path, interactions: int) -> Settings:
+    (directory / "accounts.csv").write_text(
+        "id,name,industry,status,created_at\n1,Acme,hvac,active,2024-01-01T00:00:00\n2,Globex,,,\n",
+        encoding="utf-8",
+    )
+    (directory / "contacts.csv").write_text(
+        "id,account_id,name,email,role,created_at\n1,1,Ann,ann@example.com,Owner,\nx,1,Broken,,,\n",
+        encoding="utf-8",
+    )
+    lines = ["id,account_id,contact_id,channel,content,timestamp"]
+    lines += [
+        f"{i},{i % 2 + 1},{1 if i % 2 else ''},email,Please cancel and refund order {i},2024-02-{i:02d}T09:00:00"
+        for i in range(1, interactions + 1)
+    ]
+    (directory / "interactions.csv").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    expected = ["interaction_id,expected_intent,expected_sentiment,expected_risk_score", "1,pricing_inquiry,neutral,0.0"]
+    (directory / "expected.csv").write_text("\n".join(expected) + "\n", encoding="utf-8")
+    return Settings(
+        demo_data_accounts=directory / "accounts.csv",
+        demo_data_contacts=directory / "contacts.csv",
+        demo_data_interactions=directory / "interactions.csv",
+        demo_data_expected=directory / "expected.csv",
+    )
+
+
+def _session_factory(tmp_path: Path) -> sessionmaker:
+    engine = create_engine(f"sqlite:///{tmp_path / 'seed.db'}")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, autoflush=False, future=True)
+
+
+def test_loads_in_chunks_skips_bad_rows_and_reports_progress(tmp_path: Path) -> None:
+    settings = _write_dataset(tmp_path, interactions=7)
+    factory = _session_factory(tmp_path)
+    reported = []
+
+    with factory() as session:
+        loaded = load_demo_data(
+            session, settings, chunk_size=3, progress=lambda table, count: reported.append((table, count))
+        )
+
+    assert loaded == {"skipped": 1, "accounts": 2, "contacts": 1, "interactions": 7, "eval_samples": 1, "insights": 7}
+    assert ("interactions", 3) in reported and ("interactions", 7) in reported
+    assert reported[-1] == ("insights", 7)
+
+    with factory() as session:
+        assert session.scalar(select(func.count(Insight.id))) == 7
+        assert session.scalar(select(func.sum(AccountRiskRollup.interaction_count))) == 7
+        # Expected labels win over the heuristics, including a zero risk score
+        labelled = session.scalar(select(Insight).where(Insight.interaction_id == 1))
+        assert (labelled.intent, labelled.risk_score) == ("pricing_inquiry", 0.0)
+        assert session.get(Interaction, 2).summary == session.scalar(
+            select(Insight.summary).where(Insight.interaction_id == 2)
+        )
+        # A second call leaves a populated database alone
+        assert load_demo_data(session, settings) == {}
+
+
+def test_resume_tops_up_an_interrupted_load(tmp_path: Path) -> None:
+    factory = _session_factory(tmp_path)
+    with factory() as session:
+        load_demo_data(session, _write_dataset(tmp_path, interactions=4), chunk_size=2)
+        loaded = load_demo_data(session, _write_dataset(tmp_path, interactions=9), chunk_size=2, resume=True)
+
+    assert loaded["accounts"] == 0
+    assert loaded["interactions"] == 5
+    assert loaded["insights"] == 5
+    with factory() as session:
+        assert session.scalar(select(func.count(Account.id))) == 2
+        assert session.scalar(select(func.count(Interaction.id))) == 9
+        assert session.scalar(select(func.count(Insight.id))) == 9
+        assert session.scalar(select(func.count(EvalSample.id))) == 1
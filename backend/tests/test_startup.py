@@ -0,0 +1,58 @@
+"""Tests for the cheap worker boot path and the startup profiler."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+from backend.app.core.startup import format_timings, parse_importtime, phase, summarize_imports, timings
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:       300 |        900 |   sqlalchemy.sql
+import time:       500 |       1400 | sqlalchemy
+import time:      2000 |       2000 | fastapi
+"""
+
+
+def test_importing_the_app_stays_off_the_database_and_async_stack(tmp_path) -> None:
+    database = tmp_path / "boot.db"
+    check = (
+        "import sys, backend.app.main; "
+        "print(sorted(name for name in ('sqlalchemy.ext.asyncio', 'backend.app.api.async_routes', "
+        "'backend.app.migrations', 'backend.app.services.seed') if name in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", check],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).resolve().parents[2],
+        env={"DATABASE_URL": f"sqlite:///{database}", "PATH": ""},
+    )
+    assert result.stdout.strip() == "[]"
+    assert not database.exists()
+
+
+def test_parse_and_summarize_importtime() -> None:
+    entries = parse_importtime(IMPORTTIME_OUTPUT)
+
+    assert [(entry.module, entry.self_us, entry.depth) for entry in entries] == [
+        ("_io", 120, 2),
+        ("sqlalchemy.sql", 300, 1),
+        ("sqlalchemy", 500, 0),
+        ("fastapi", 2000, 0),
+    ]
+    summary = summarize_imports(entries, top=2).splitlines()
+    assert summary[0] == "imports: 3.4 ms across 4 modules"
+    assert summary[1:4] == ["by package:", "       2.0 ms  fastapi", "       0.8 ms  sqlalchemy"]
+
+
+def test_phase_records_timings() -> None:
+    with phase("unit test"):
+        pass
+
+    assert timings["unit test"] >= 0
+    assert "unit test" in format_timings({"unit test": timings.pop("unit test")})
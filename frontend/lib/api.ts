@@ -104,9 +104,11 @@ export interface CreateInteractionPayload {
 
 export const api = {
   getHealth: () => apiClient.get('/health'),
-  getAccounts: () => apiClient.get<Account[]>('/accounts'),
+  getAccounts: (params?: { limit?: number; cursor?: string; industry?: string; status?: string }) =>
+    apiClient.get<Account[]>('/accounts', { params }),
   getAccount: (accountId: number) => apiClient.get<AccountWithInsights>(`/accounts/${accountId}`),
-  getDashboard: () => apiClient.get<DashboardAccount[]>('/dashboard/csm'),
+  getDashboard: (params: { limit?: number; cursor?: string; min_risk?: number } = { limit: 25 }) =>
+    apiClient.get<DashboardAccount[]>('/dashboard/csm', { params }),
   getRecentInsights: (limit = 6) => apiClient.get<Insight[]>(`/insights/recent`, { params: { limit } }),
   createInteraction: (payload: CreateInteractionPayload) => apiClient.post('/interactions', payload),
   getRagResponse: (accountId: number, query: string) =>
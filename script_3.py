@@ -3,6 +3,7 @@ import json
 import csv
 from datetime import datetime, timedelta
 import random
+from pathlib import Path
 
 # Sample data for Jobber-like small business scenarios
 sample_data = {
@@ -174,80 +175,134 @@ lisa@cityhvac.com
 ]
 
 # Generate CSV files for demo
-def create_demo_data():
+def create_demo_data(num_accounts=None, num_interactions=None, output_dir=".", seed=None):
+    """Write the demo CSVs; pass counts to scale the sample data up for benchmarks.
+
+    Without counts the five hand-written accounts and conversations are
+    written as before. With counts, accounts and contacts are cloned from the
+    samples and interactions are drawn from the sample conversations with a
+    short unique suffix, spread over the last two years.
+    """
+    rng = random.Random(seed)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    accounts = scaled_accounts(num_accounts)
+    contacts = scaled_contacts(len(accounts))
+    contacts_by_account = {}
+    for contact in contacts:
+        contacts_by_account.setdefault(contact['account_id'], []).append(contact['id'])
+
     # Accounts CSV
-    with open('demo_accounts.csv', 'w', newline='') as f:
+    with open(output_dir / 'demo_accounts.csv', 'w', newline='') as f:
         writer = csv.DictWriter(f, fieldnames=['id', 'name', 'industry', 'status', 'created_at'])
         writer.writeheader()
-        for account in sample_data['accounts']:
-            account['created_at'] = (datetime.now() - timedelta(days=random.randint(30, 365))).isoformat()
+        for account in accounts:
+            account['created_at'] = (datetime.now() - timedelta(days=rng.randint(30, 365))).isoformat()
             writer.writerow(account)
     
     # Contacts CSV  
-    with open('demo_contacts.csv', 'w', newline='') as f:
+    with open(output_dir / 'demo_contacts.csv', 'w', newline='') as f:
         writer = csv.DictWriter(f, fieldnames=['id', 'account_id', 'name', 'email', 'role', 'created_at'])
         writer.writeheader()
-        for contact in sample_data['contacts']:
-            contact['created_at'] = (datetime.now() - timedelta(days=random.randint(15, 200))).isoformat()
+        for contact in contacts:
+            contact['created_at'] = (datetime.now() - timedelta(days=rng.randint(15, 200))).isoformat()
             writer.writerow(contact)
     
-    # Interactions CSV
-    with open('demo_interactions.csv', 'w', newline='') as f:
+    # Interactions CSV and expected insights CSV (for evaluation), written row by row
+    with open(output_dir / 'demo_interactions.csv', 'w', newline='') as f, \
+            open(output_dir / 'demo_expected_insights.csv', 'w', newline='') as expected_file:
         writer = csv.DictWriter(f, fieldnames=['id', 'account_id', 'contact_id', 'channel', 'content', 'timestamp'])
         writer.writeheader()
-        for i, conv in enumerate(sample_conversations, 1):
-            interaction = {
+        expected_writer = csv.DictWriter(expected_file, fieldnames=['interaction_id', 'expected_intent', 'expected_sentiment', 'expected_risk_score'])
+        expected_writer.writeheader()
+        for i, (account_id, conv, content, age) in enumerate(scaled_conversations(len(accounts), num_interactions, rng), 1):
+            writer.writerow({
                 'id': i,
-                'account_id': conv['account_id'],
-                'contact_id': conv.get('contact_id'),
+                'account_id': account_id,
+                # Sample conversations keep their hand-assigned contact; only scaled ones draw one
+                'contact_id': conv['contact_id'] if num_interactions is None else rng.choice(contacts_by_account[account_id]),
                 'channel': conv['channel'],
-                'content': conv['content'].strip(),
-                'timestamp': (datetime.now() - timedelta(days=random.randint(1, 30))).isoformat()
-            }
-            writer.writerow(interaction)
-    
-    # Expected insights CSV (for evaluation)
-    with open('demo_expected_insights.csv', 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['interaction_id', 'expected_intent', 'expected_sentiment', 'expected_risk_score'])
-        writer.writeheader()
-        for i, conv in enumerate(sample_conversations, 1):
-            writer.writerow({
+                'content': content,
+                'timestamp': (datetime.now() - age).isoformat()
+            })
+            expected_writer.writerow({
                 'interaction_id': i,
                 'expected_intent': conv['intent'],
                 'expected_sentiment': conv['sentiment'],
                 'expected_risk_score': conv['risk_score']
             })
 
-create_demo_data()
-
-# Also create individual conversation files for upload testing
-for i, conv in enumerate(sample_conversations, 1):
-    filename = f"conversation_{i}_{conv['intent']}.txt"
-    with open(filename, 'w') as f:
-        f.write(f"Account: {conv['account_id']}\n")
-        f.write(f"Channel: {conv['channel']}\n")
-        f.write(f"Expected Intent: {conv['intent']}\n")
-        f.write(f"Expected Sentiment: {conv['sentiment']}\n")
-        f.write(f"Expected Risk Score: {conv['risk_score']}\n")
-        f.write("="*50 + "\n\n")
-        f.write(conv['content'])
-
-print("✅ Demo data generated successfully!")
-print("\nFiles created:")
-print("- demo_accounts.csv (5 sample service businesses)")
-print("- demo_contacts.csv (6 business contacts)")  
-print("- demo_interactions.csv (5 realistic conversations)")
-print("- demo_expected_insights.csv (evaluation ground truth)")
-print("- conversation_1_support_request.txt")
-print("- conversation_2_upgrade_inquiry.txt")
-print("- conversation_3_expansion_inquiry.txt")
-print("- conversation_4_churn_risk.txt")
-print("- conversation_5_feature_request.txt")
-
-print("\nDemo Scenarios Cover:")
-print("- 📞 Support requests with technical issues")
-print("- 💰 Upgrade and expansion inquiries")
-print("- ⚠️ Churn risk situations")
-print("- 💡 Feature requests and feedback")
-print("- 🎯 Different sentiment levels and risk scores")
-print("- 🏢 Various small business industries (landscaping, plumbing, cleaning, etc.)")
\ No newline at end of file
+
+def scaled_accounts(num_accounts=None):
+    templates = sample_data['accounts']
+    if num_accounts is None:
+        return [dict(account) for account in templates]
+    accounts = []
+    for account_id in range(1, num_accounts + 1):
+        template = templates[(account_id - 1) % len(templates)]
+        copy = (account_id - 1) // len(templates)
+        name = template['name'] if copy == 0 else f"{template['name']} #{copy + 1}"
+        accounts.append({'id': account_id, 'name': name, 'industry': template['industry'], 'status': template['status']})
+    return accounts
+
+
+def scaled_contacts(num_accounts):
+    templates = sample_data['contacts']
+    if num_accounts <= len(sample_data['accounts']):
+        return [dict(contact) for contact in templates if contact['account_id'] <= num_accounts]
+    contacts = []
+    for account_id in range(1, num_accounts + 1):
+        template_account = (account_id - 1) % len(sample_data['accounts']) + 1
+        for template in templates:
+            if template['account_id'] == template_account:
+                contacts.append({**template, 'id': len(contacts) + 1, 'account_id': account_id})
+    return contacts
+
+
+def scaled_conversations(num_accounts, num_interactions, rng):
+    """Yield (account_id, conversation, content, age) for every interaction."""
+    if num_interactions is None:
+        for conv in sample_conversations:
+            if conv['account_id'] <= num_accounts:
+                yield conv['account_id'], conv, conv['content'].strip(), timedelta(days=rng.randint(1, 30))
+        return
+    for i in range(1, num_interactions + 1):
+        conv = rng.choice(sample_conversations)
+        age = timedelta(days=rng.randint(1, 730), seconds=rng.randint(0, 86399))
+        yield rng.randint(1, num_accounts), conv, f"{conv['content'].strip()}\n\nRef #{i}", age
+
+
+if __name__ == "__main__":
+    create_demo_data()
+
+    # Also create individual conversation files for upload testing
+    for i, conv in enumerate(sample_conversations, 1):
+        filename = f"conversation_{i}_{conv['intent']}.txt"
+        with open(filename, 'w') as f:
+            f.write(f"Account: {conv['account_id']}\n")
+            f.write(f"Channel: {conv['channel']}\n")
+            f.write(f"Expected Intent: {conv['intent']}\n")
+            f.write(f"Expected Sentiment: {conv['sentiment']}\n")
+            f.write(f"Expected Risk Score: {conv['risk_score']}\n")
+            f.write("="*50 + "\n\n")
+            f.write(conv['content'])
+
+    print("✅ Demo data generated successfully!")
+    print("\nFiles created:")
+    print("- demo_accounts.csv (5 sample service businesses)")
+    print("- demo_contacts.csv (6 business contacts)")  
+    print("- demo_interactions.csv (5 realistic conversations)")
+    print("- demo_expected_insights.csv (evaluation ground truth)")
+    print("- conversation_1_support_request.txt")
+    print("- conversation_2_upgrade_inquiry.txt")
+    print("- conversation_3_expansion_inquiry.txt")
+    print("- conversation_4_churn_risk.txt")
+    print("- conversation_5_feature_request.txt")
+
+    print("\nDemo Scenarios Cover:")
+    print("- 📞 Support requests with technical issues")
+    print("- 💰 Upgrade and expansion inquiries")
+    print("- ⚠️ Churn risk situations")
+    print("- 💡 Feature requests and feedback")
+    print("- 🎯 Different sentiment levels and risk scores")
+    print("- 🏢 Various small business industries (landscaping, plumbing, cleaning, etc.)")